@@ -1,35 +1,106 @@
+import asyncio
 import os
-from motor.motor_asyncio import AsyncIOMotorClient
+from typing import Optional
+
+from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorDatabase
+
+from app.metrics import mongo_event_listeners
 
 MONGO_URL = os.getenv("MONGO_URL", "mongodb://localhost:27017")
 MASTER_DB_NAME = os.getenv("MASTER_DB_NAME", "master_db")
 
-client = AsyncIOMotorClient(MONGO_URL)
-master_db = client[MASTER_DB_NAME]
+# Connection pool settings (see pymongo MongoClient options). Compressors are
+# negotiated with the server, e.g. "zstd,snappy,zlib" (zstd/snappy need the
+# zstandard/python-snappy packages). MONGO_POOL_PREWARM connections are opened at
+# startup so the first requests after a deploy don't pay connection setup.
+MONGO_MAX_POOL_SIZE = int(os.getenv("MONGO_MAX_POOL_SIZE", "100"))
+MONGO_MIN_POOL_SIZE = int(os.getenv("MONGO_MIN_POOL_SIZE", "10"))
+MONGO_MAX_IDLE_TIME_MS = int(os.getenv("MONGO_MAX_IDLE_TIME_MS", "300000"))
+MONGO_SERVER_SELECTION_TIMEOUT_MS = int(os.getenv("MONGO_SERVER_SELECTION_TIMEOUT_MS", "5000"))
+MONGO_CONNECT_TIMEOUT_MS = int(os.getenv("MONGO_CONNECT_TIMEOUT_MS", "5000"))
+MONGO_COMPRESSORS = os.getenv("MONGO_COMPRESSORS", "")
+MONGO_POOL_PREWARM = int(os.getenv("MONGO_POOL_PREWARM", str(MONGO_MIN_POOL_SIZE)))
+
+client: Optional[AsyncIOMotorClient] = None
+master_db: Optional[AsyncIOMotorDatabase] = None
+
+
+def client_options() -> dict:
+    options = {
+        "maxPoolSize": MONGO_MAX_POOL_SIZE,
+        "minPoolSize": MONGO_MIN_POOL_SIZE,
+        "maxIdleTimeMS": MONGO_MAX_IDLE_TIME_MS,
+        "serverSelectionTimeoutMS": MONGO_SERVER_SELECTION_TIMEOUT_MS,
+        "connectTimeoutMS": MONGO_CONNECT_TIMEOUT_MS,
+        # per-command latency/error and pool checkout metrics (app/metrics.py)
+        "event_listeners": mongo_event_listeners(),
+    }
+    if MONGO_COMPRESSORS:
+        options["compressors"] = MONGO_COMPRESSORS
+    return options
+
+
+def connect() -> AsyncIOMotorClient:
+    """Create the shared client (called from the app lifespan; idempotent)."""
+    global client, master_db
+    if client is None:
+        client = AsyncIOMotorClient(MONGO_URL, **client_options())
+        master_db = client[MASTER_DB_NAME]
+    return client
+
+
+def close() -> None:
+    global client, master_db
+    if client is not None:
+        client.close()
+    client = None
+    master_db = None
+
+
+async def warm_pool(connections: int = MONGO_POOL_PREWARM) -> None:
+    """Open up to `connections` pooled connections by running that many pings concurrently."""
+    if connections <= 0:
+        return
+    db = get_master_db()
+    await asyncio.gather(*(db.command({"ping": 1}) for _ in range(connections)))
+
 
-# Utility getters for dependency injection
+# Utility getters for dependency injection. Outside the app (scripts, tests) the
+# client is created on first use.
 
 def get_master_db():
+    if master_db is None:
+        connect()
     return master_db
 
 def get_client():
+    if client is None:
+        connect()
     return client
 
 
+async def _create_index(collection, keys, **kwargs) -> None:
+    try:
+        await collection.create_index(keys, **kwargs)
+    except Exception:
+        pass
+
+
 async def ensure_indexes():
-    """Create essential indexes for master DB collections.
+    """Create essential indexes for master DB collections (concurrently).
 
     - organizations.organization_name unique
+    - organizations (created_at, _id) for keyset pagination by creation time
     - admins.email unique
+    - jobs (status, created_at) for claiming the oldest runnable job
+    - revoked_tokens.updated_at for incremental sync, expires_at as a TTL index
     """
-    # organizations
-    try:
-        await master_db.organizations.create_index("organization_name", unique=True)
-    except Exception:
-        pass
-
-    # admins
-    try:
-        await master_db.admins.create_index("email", unique=True)
-    except Exception:
-        pass
+    master_db = get_master_db()
+    await asyncio.gather(
+        _create_index(master_db.organizations, "organization_name", unique=True),
+        _create_index(master_db.organizations, [("created_at", 1), ("_id", 1)]),
+        _create_index(master_db.admins, "email", unique=True),
+        _create_index(master_db.jobs, [("status", 1), ("created_at", 1)]),
+        _create_index(master_db.revoked_tokens, "updated_at"),
+        _create_index(master_db.revoked_tokens, "expires_at", expireAfterSeconds=0),
+    )
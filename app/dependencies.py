@@ -0,0 +1,78 @@
+from typing import Optional
+
+from fastapi import Header, HTTPException, Request, status
+
+from app.database import get_master_db
+from app.errors import Forbidden
+from app.services.auth_service import AuthService
+from app.services.job_service import JobService
+from app.services.org_service import OrganizationService
+from app.services.revocation import RevocationService, revocation_list
+from app.utils.security import TokenClaims, decode_token_cached
+
+# Services are created once per application lifespan (see app.main.lifespan) and
+# handed to routes through these dependencies. They hold no per-request state.
+
+
+def init_services(app, db) -> None:
+    app.state.org_service = OrganizationService(db)
+    app.state.auth_service = AuthService(db)
+    app.state.job_service = JobService(db)
+    app.state.revocation_service = RevocationService(db)
+
+
+def _service(request: Request, name: str):
+    service = getattr(request.app.state, name, None)
+    if service is None:
+        # lifespan not run (e.g. an ASGI test client without lifespan support)
+        init_services(request.app, get_master_db())
+        service = getattr(request.app.state, name)
+    return service
+
+
+def get_org_service(request: Request) -> OrganizationService:
+    return _service(request, "org_service")
+
+
+def get_auth_service(request: Request) -> AuthService:
+    return _service(request, "auth_service")
+
+
+def get_job_service(request: Request) -> JobService:
+    return _service(request, "job_service")
+
+
+def get_revocation_service(request: Request) -> RevocationService:
+    return _service(request, "revocation_service")
+
+
+async def get_current_admin(authorization: Optional[str] = Header(None)) -> TokenClaims:
+    """Claims of the bearer token; verified tokens are cached until they expire and
+    checked against this replica's in-memory revocation list on every request."""
+    if not authorization:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="missing auth token")
+    try:
+        claims = decode_token_cached(authorization.split(" ")[-1])
+    except Exception:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="invalid token")
+    if revocation_list.is_revoked(claims):
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="token revoked")
+    return claims
+
+
+async def get_optional_admin(authorization: Optional[str] = Header(None)) -> Optional[TokenClaims]:
+    """Like get_current_admin, but None for anonymous requests (a bad token is still 401)."""
+    if not authorization:
+        return None
+    return await get_current_admin(authorization)
+
+
+def require_org_admin(admin: TokenClaims, organization_name: str, action: str = "manage") -> None:
+    """Authorize the admin for `organization_name` without a database read.
+
+    Tokens carrying `org_id` pass here; the service compares the id with the organization
+    it loads (see org_service._check_org_id), so they keep working after a rename. Older
+    tokens without it are authorized from their `organization_name` claim.
+    """
+    if admin.org_id is None and admin.organization_name != organization_name:
+        raise Forbidden(f"only the org admin can {action} the organization")
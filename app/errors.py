@@ -48,3 +48,32 @@ class Conflict(AppError):
 class InternalError(AppError):
     status_code = 500
     code = "internal_error"
+
+
+class ServiceUnavailable(AppError):
+    """Raised when the service sheds load; `retry_after` (seconds) is sent as a Retry-After header."""
+
+    status_code = 503
+    code = "service_unavailable"
+
+    def __init__(self, message: str, details: Optional[Any] = None, retry_after: Optional[int] = None):
+        super().__init__(message, details)
+        self.retry_after = retry_after
+
+
+class TooManyRequests(AppError):
+    """Raised when a caller exceeds its rate budget; `retry_after` (seconds) is sent as a Retry-After header."""
+
+    status_code = 429
+    code = "too_many_requests"
+
+    def __init__(self, message: str, details: Optional[Any] = None, retry_after: Optional[int] = None):
+        super().__init__(message, details)
+        self.retry_after = retry_after
+
+
+class DeadlineExceeded(AppError):
+    """Raised when a request's time budget runs out while waiting on the database."""
+
+    status_code = 504
+    code = "deadline_exceeded"
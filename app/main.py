@@ -1,49 +1,122 @@
 from fastapi import FastAPI, Request
-from fastapi.responses import JSONResponse
+from fastapi.responses import Response
 from fastapi.exceptions import RequestValidationError
 from app.routers.org_router import router as org_router
 from app.routers.auth_router import router as auth_router
-from app.database import ensure_indexes
+from app.routers.jobs_router import router as jobs_router
+from app.routers.profiles_router import router as profiles_router
+from app import database
+from app.database import ensure_indexes, get_master_db
+from app.dependencies import init_services
 from app.errors import AppError
-
-import importlib
-import types
+from app.responses import FastJSONResponse
+from app.metrics import METRICS_ENABLED, MetricsMiddleware, render_metrics, MetricsRoute
+from app.profiling import PROFILER_ENABLED, PROFILER_TOKEN, ProfilerMiddleware, get_profiler
+from app.utils.breached import BREACHED_PASSWORDS_BLOOM, get_breached_filter
+from app.utils.hashing import get_hashing_executor, shutdown_hashing_executor
+from app.utils.ratelimit import get_hash_admission
+from app.utils.resilience import REQUEST_DEADLINE_MS, DeadlineMiddleware, mongo_breaker
+from app.utils.security import SECRET_KEY, token_cache
+from app.services.org_service import org_cache, org_lookups
+from app.services.auth_service import org_id_lookups
+from app.services.cache_sync import CacheInvalidationWatcher, ORG_CACHE_SYNC
+from app.services.job_service import JobWorker, JOBS_ENABLED, org_job_handlers
+from app.services.revocation import RevocationSync
+from app.services.tenant_store import ensure_tenant_indexes
+
+from contextlib import asynccontextmanager
+import asyncio
 import os
 
 
-# Initialize the FastAPI application
-app = FastAPI(title="Org Management Service")
-
-
-@app.on_event("startup")
-async def on_startup():
-    # ensure DB indexes exist
-    try:
-        await ensure_indexes()
-    except Exception:
-        print("warning: failed to ensure indexes at startup")
-
-    # runtime shim: some bcrypt wheels (platform builds) don't expose the
-    # `__about__` attribute that passlib's bcrypt handler sometimes reads.
-    # This is harmless but noisy; if missing, add a minimal shim so passlib
-    # can probe the module without raising AttributeError during backend
-    # detection.
-    try:
-        bcrypt = importlib.import_module("bcrypt")
-        if not hasattr(bcrypt, "__about__"):
-            bcrypt.__about__ = types.SimpleNamespace(__version__=getattr(bcrypt, "__version__", None))
-    except Exception:
-        # don't fail startup on this; bcrypt may not be installed in some envs
-        pass
-
+async def _prepare(app: FastAPI, db) -> None:
+    """Create indexes, pre-warm the pool and load token revocations concurrently; GET /ready is 503 until this succeeds."""
+    delay = 0.5
+    while True:
+        try:
+            # the first revocation pull is part of readiness: until then revoked tokens would pass
+            await asyncio.gather(ensure_indexes(), ensure_tenant_indexes(db), database.warm_pool(),
+                                 app.state.revocation_service.refresh())
+            break
+        except Exception as e:
+            print(f"warning: startup preparation failed, retrying in {delay}s: {e}")
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, 10)
+    app.state.ready = True
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
     # Optionally enforce a non-default JWT secret. This is disabled by default
     # to avoid breaking local development. Set REQUIRE_JWT_SECRET=1 in your
     # production environment to fail startup when a weak/default secret is used.
-    from app.utils.security import SECRET_KEY
     if os.getenv("REQUIRE_JWT_SECRET", "0") == "1":
         if not SECRET_KEY or SECRET_KEY == "change-me-in-prod":
             raise RuntimeError("JWT_SECRET is not set or uses the default value. Set environment variable JWT_SECRET to a strong secret and restart (or unset REQUIRE_JWT_SECRET to disable this check).")
 
+    # open the breached-password filter up front: a missing or corrupt file would
+    # otherwise only surface as 500s on every password check while /ready says ready
+    if BREACHED_PASSWORDS_BLOOM:
+        try:
+            get_breached_filter()
+        except (OSError, ValueError) as e:
+            raise RuntimeError(f"BREACHED_PASSWORDS_BLOOM={BREACHED_PASSWORDS_BLOOM} can't be opened: {e}. Build it with scripts/build_breached_bloom.py (or unset BREACHED_PASSWORDS_BLOOM to disable the check).") from e
+
+    # profiles span every tenant's requests; only an operator token may trigger or read them
+    if PROFILER_ENABLED and not PROFILER_TOKEN:
+        raise RuntimeError("PROFILER_ENABLED=1 requires PROFILER_TOKEN (the operator credential for X-Profile and /admin/profiles).")
+
+    # one Motor client (and its connection pool) per process, configured from env
+    database.connect()
+    db = database.get_master_db()
+    init_services(app, db)
+
+    # index creation and pool warm-up run in the background so the process starts
+    # serving (and answering liveness checks) immediately; readiness waits for them
+    app.state.ready = False
+    app.state.startup_task = asyncio.create_task(_prepare(app, db))
+
+    # keep the org cache coherent with writes made by other replicas
+    app.state.cache_watcher = None
+    if ORG_CACHE_SYNC:
+        app.state.cache_watcher = CacheInvalidationWatcher(db, org_cache)
+        app.state.cache_watcher.start()
+
+    # pull token revocations made on other replicas (see app/services/revocation.py)
+    app.state.revocation_sync = RevocationSync(app.state.revocation_service)
+    app.state.revocation_sync.start()
+
+    # background workers for long-running renames/deletes (see app/services/job_service.py)
+    app.state.job_worker = None
+    if JOBS_ENABLED:
+        app.state.job_worker = JobWorker(app.state.job_service, org_job_handlers(db))
+        app.state.job_worker.start()
+
+    yield
+
+    app.state.startup_task.cancel()
+    await asyncio.gather(app.state.startup_task, return_exceptions=True)
+    if app.state.cache_watcher is not None:
+        await app.state.cache_watcher.stop()
+    if app.state.job_worker is not None:
+        await app.state.job_worker.stop()
+    await app.state.revocation_sync.stop()
+    shutdown_hashing_executor()
+    database.close()
+
+
+# Initialize the FastAPI application
+app = FastAPI(title="Org Management Service", lifespan=lifespan, default_response_class=FastJSONResponse)
+app.router.route_class = MetricsRoute
+# per-request time budget for database calls (see app/utils/resilience.py)
+if REQUEST_DEADLINE_MS > 0:
+    app.add_middleware(DeadlineMiddleware, budget_ms=REQUEST_DEADLINE_MS)
+if METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
+# opt-in per-request profiler (see app/profiling.py); not installed at all unless enabled
+if PROFILER_ENABLED:
+    app.add_middleware(ProfilerMiddleware, profiler=get_profiler())
+
 
 @app.exception_handler(AppError)
 async def app_error_handler(request: Request, exc: AppError):
@@ -56,13 +129,16 @@ async def app_error_handler(request: Request, exc: AppError):
     }
     if getattr(exc, "details", None) is not None:
         payload["error"]["details"] = exc.details
-    return JSONResponse(status_code=exc.status_code, content=payload)
+    headers = None
+    if getattr(exc, "retry_after", None) is not None:
+        headers = {"Retry-After": str(exc.retry_after)}
+    return FastJSONResponse(status_code=exc.status_code, content=payload, headers=headers)
 
 
 @app.exception_handler(Exception)
 async def generic_exception_handler(request: Request, exc: Exception):
     # Fallback: avoid leaking internals, return a generic 500 structure
-    return JSONResponse(status_code=500, content={"error": {"code": "internal_error", "message": "internal server error"}})
+    return FastJSONResponse(status_code=500, content={"error": {"code": "internal_error", "message": "internal server error"}})
 
 
 @app.exception_handler(RequestValidationError)
@@ -87,22 +163,59 @@ async def validation_exception_handler(request: Request, exc: RequestValidationE
             "details": details,
         }
     }
-    return JSONResponse(status_code=422, content=payload)
+    return FastJSONResponse(status_code=422, content=payload)
 
 
 
 @app.get("/health")
 async def health():
-    # check DB connectivity for readiness
-    from app.database import get_master_db
+    # check DB connectivity for readiness; the ping bypasses the circuit breaker, whose
+    # state is reported alongside ("degraded" while it is not closed)
     db = get_master_db()
+    breaker = mongo_breaker.stats()
     try:
         await db.command({"ping": 1})
-        return {"status": "ok", "db": "ok"}
     except Exception:
-        return JSONResponse(status_code=503, content={"status": "unavailable", "db": "unavailable"})
+        return FastJSONResponse(status_code=503, content={"status": "unavailable", "db": "unavailable", "breaker": breaker})
+    status = "ok" if breaker["state"] in ("closed", "disabled") else "degraded"
+    return {"status": status, "db": "ok", "breaker": breaker}
+
+
+@app.get("/ready")
+async def ready():
+    # readiness: startup preparation (indexes, pool warm-up) finished and the DB answers
+    if not getattr(app.state, "ready", False):
+        return FastJSONResponse(status_code=503, content={"status": "starting"})
+    return await health()
+
+
+@app.get("/stats")
+async def stats():
+    # in-process counters used to size pods: hashing pool, admission control and caches
+    return {
+        "hashing": get_hashing_executor().stats(),
+        "admission": get_hash_admission().stats(),
+        "org_cache": org_cache.stats(),
+        "org_lookups": org_lookups.stats(),
+        "org_id_lookups": org_id_lookups.stats(),
+        "password_rehash": app.state.auth_service.rehash_stats() if getattr(app.state, "auth_service", None) else {},
+        "token_cache": token_cache.stats(),
+        "revocations": app.state.revocation_sync.stats() if getattr(app.state, "revocation_sync", None) else {"mode": "disabled"},
+        "org_cache_sync": app.state.cache_watcher.stats() if getattr(app.state, "cache_watcher", None) else {"mode": "disabled"},
+        "jobs": app.state.job_worker.stats() if getattr(app.state, "job_worker", None) else {"workers": 0},
+    }
+
+
+@app.get("/metrics")
+async def metrics():
+    # Prometheus scrape endpoint (route latency, Mongo commands/pool, password hashing)
+    body, content_type = render_metrics()
+    return Response(content=body, media_type=content_type)
 
 
 # include modular routers
 app.include_router(org_router, prefix="/org")
 app.include_router(auth_router, prefix="/admin")
+app.include_router(jobs_router, prefix="/jobs")
+if PROFILER_ENABLED:
+    app.include_router(profiles_router, prefix="/admin/profiles")
@@ -0,0 +1,176 @@
+import os
+import time
+from typing import Optional
+
+from prometheus_client import CONTENT_TYPE_LATEST, Counter, Gauge, Histogram, generate_latest
+from pymongo import monitoring
+from fastapi.routing import APIRoute
+
+# Prometheus instrumentation exposed on GET /metrics. Route labels use the route
+# template (e.g. /jobs/{job_id}), never the raw path, so label cardinality is bounded
+# by the number of routes. Set METRICS_ENABLED=0 to skip the HTTP middleware and the
+# Mongo listeners entirely.
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "1") == "1"
+
+# requests that don't match any route share one label instead of one per scanned path
+UNMATCHED_ROUTE = "unmatched"
+
+HTTP_REQUEST_SECONDS = Histogram(
+    "http_request_duration_seconds", "HTTP request latency by route template",
+    ["method", "route", "status"],
+)
+HTTP_REQUESTS_IN_FLIGHT = Gauge(
+    "http_requests_in_flight", "HTTP requests currently being served",
+    ["method", "route"],
+)
+MONGO_COMMAND_SECONDS = Histogram(
+    "mongodb_command_duration_seconds", "MongoDB command latency as reported by the driver",
+    ["command"],
+    buckets=(.0005, .001, .0025, .005, .01, .025, .05, .1, .25, .5, 1, 2.5, 5, 10),
+)
+MONGO_COMMAND_ERRORS = Counter(
+    "mongodb_command_errors_total", "MongoDB commands that failed",
+    ["command", "code"],
+)
+MONGO_POOL_CHECKOUT_SECONDS = Histogram(
+    "mongodb_pool_checkout_duration_seconds", "Time spent waiting to check a connection out of the pool",
+    buckets=(.0001, .0005, .001, .0025, .005, .01, .025, .05, .1, .25, .5, 1, 2.5, 5),
+)
+MONGO_POOL_CHECKOUT_FAILURES = Counter(
+    "mongodb_pool_checkout_failures_total", "Connection checkouts that failed",
+    ["reason"],
+)
+MONGO_RETRIES = Counter(
+    "mongodb_retries_total", "Reads retried after a transient error (app/utils/resilience.py)",
+)
+MONGO_BREAKER_TRANSITIONS = Counter(
+    "circuit_breaker_transitions_total", "Circuit breaker state changes by the state entered",
+    ["breaker", "state"],
+)
+PASSWORD_HASH_SECONDS = Histogram(
+    "password_hash_duration_seconds", "Time spent hashing or verifying a password, including pool queueing",
+    ["operation"],
+    buckets=(.01, .025, .05, .1, .2, .3, .5, .75, 1, 2, 5),
+)
+
+
+class CommandMetricsListener(monitoring.CommandListener):
+    """Records per-command latency and failures (registered on the Motor client)."""
+
+    def started(self, event) -> None:
+        pass
+
+    def succeeded(self, event) -> None:
+        MONGO_COMMAND_SECONDS.labels(event.command_name).observe(event.duration_micros / 1e6)
+
+    def failed(self, event) -> None:
+        MONGO_COMMAND_SECONDS.labels(event.command_name).observe(event.duration_micros / 1e6)
+        code = event.failure.get("code") if isinstance(event.failure, dict) else None
+        MONGO_COMMAND_ERRORS.labels(event.command_name, str(code) if code is not None else "unknown").inc()
+
+
+class PoolMetricsListener(monitoring.ConnectionPoolListener):
+    """Records how long operations wait to check a connection out of the pool."""
+
+    def connection_checked_out(self, event) -> None:
+        MONGO_POOL_CHECKOUT_SECONDS.observe(event.duration)
+
+    def connection_check_out_failed(self, event) -> None:
+        MONGO_POOL_CHECKOUT_SECONDS.observe(event.duration)
+        MONGO_POOL_CHECKOUT_FAILURES.labels(str(event.reason)).inc()
+
+    # the remaining pool events are not measured
+    def pool_created(self, event) -> None:
+        pass
+
+    def pool_ready(self, event) -> None:
+        pass
+
+    def pool_cleared(self, event) -> None:
+        pass
+
+    def pool_closed(self, event) -> None:
+        pass
+
+    def connection_created(self, event) -> None:
+        pass
+
+    def connection_ready(self, event) -> None:
+        pass
+
+    def connection_closed(self, event) -> None:
+        pass
+
+    def connection_check_out_started(self, event) -> None:
+        pass
+
+    def connection_checked_in(self, event) -> None:
+        pass
+
+
+def mongo_event_listeners() -> list:
+    return [CommandMetricsListener(), PoolMetricsListener()] if METRICS_ENABLED else []
+
+
+def _route_template(scope) -> str:
+    """Path with matched path parameters put back as placeholders, e.g. /jobs/{job_id}."""
+    if scope.get("endpoint") is None:
+        return UNMATCHED_ROUTE
+    params = scope.get("path_params")
+    if not params:
+        return scope["path"]
+    names = {str(value): name for name, value in params.items()}
+    return "/".join("{%s}" % names[part] if part in names else part for part in scope["path"].split("/"))
+
+
+class MetricsMiddleware:
+    """ASGI middleware recording per-route request latency."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        status: Optional[int] = None
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            HTTP_REQUEST_SECONDS.labels(scope["method"], _route_template(scope), str(status or 500)).observe(
+                time.perf_counter() - started)
+
+
+class MetricsRoute(APIRoute):
+    """Route class counting requests in flight per route (the route is only known after routing).
+
+    Used as `APIRouter(route_class=MetricsRoute)`; a plain APIRoute when metrics are disabled.
+    """
+
+    def get_route_handler(self):
+        handler = super().get_route_handler()
+        if not METRICS_ENABLED:
+            return handler
+
+        async def instrumented(request):
+            gauge = HTTP_REQUESTS_IN_FLIGHT.labels(request.method, _route_template(request.scope))
+            gauge.inc()
+            try:
+                return await handler(request)
+            finally:
+                gauge.dec()
+
+        return instrumented
+
+
+def render_metrics():
+    """Body and content type for the /metrics endpoint."""
+    return generate_latest(), CONTENT_TYPE_LATEST
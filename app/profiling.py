@@ -0,0 +1,215 @@
+import hmac
+import itertools
+import os
+import random
+import sys
+import threading
+import time
+from collections import Counter, deque
+from typing import List, Optional
+
+# Opt-in per-request sampling profiler. When PROFILER_ENABLED=1, a request is
+# profiled if it carries the PROFILE_HEADER header or is picked at random with
+# probability PROFILE_SAMPLE_RATE. A sampler thread then records the request's
+# stack every PROFILE_INTERVAL seconds: the running stack while the request is on
+# the CPU, and the chain of awaited coroutines (marked "[await]") while it waits,
+# e.g. for the hashing pool or a Mongo reply. The last PROFILE_RING_SIZE profiles
+# are kept in memory as collapsed stacks (flamegraph.pl / speedscope input).
+# Disabled, neither the middleware nor the thread exists.
+# Profiles hold process-wide stacks (every tenant's requests), so triggering one by
+# header and reading them take the operator's PROFILER_TOKEN, not an org-admin token:
+# `X-Profile: <token>` and `Authorization: Bearer <token>` on /admin/profiles.
+PROFILER_ENABLED = os.getenv("PROFILER_ENABLED", "0") == "1"
+PROFILER_TOKEN = os.getenv("PROFILER_TOKEN", "")
+PROFILE_SAMPLE_RATE = float(os.getenv("PROFILE_SAMPLE_RATE", "0"))
+PROFILE_HEADER = os.getenv("PROFILE_HEADER", "x-profile").lower()
+PROFILE_INTERVAL = float(os.getenv("PROFILE_INTERVAL", "0.005"))
+PROFILE_RING_SIZE = int(os.getenv("PROFILE_RING_SIZE", "20"))
+# requests profiled at the same time; further triggers are served unprofiled
+PROFILE_MAX_CONCURRENT = int(os.getenv("PROFILE_MAX_CONCURRENT", "2"))
+
+# frames deeper than this are cut to keep sampling cheap on pathological stacks
+_MAX_DEPTH = 128
+
+
+def operator_token_valid(value: Optional[str]) -> bool:
+    """True when `value` is the configured PROFILER_TOKEN (never when none is set)."""
+    if not PROFILER_TOKEN or value is None:
+        return False
+    return hmac.compare_digest(value.encode(), PROFILER_TOKEN.encode())
+
+
+def _label(code) -> str:
+    return f"{code.co_filename.rsplit('/', 1)[-1]}:{code.co_qualname}"
+
+
+class RequestProfile:
+    _ids = itertools.count(1)
+
+    def __init__(self, method: str, path: str, coro, thread_id: int):
+        self.id = next(self._ids)
+        self.method = method
+        self.path = path
+        self.coro = coro
+        self.thread_id = thread_id
+        self.started_at = time.time()
+        self.duration_ms: Optional[float] = None
+        self.status: Optional[int] = None
+        self.samples = 0
+        self.stacks: Counter = Counter()
+
+    def sample(self, running_frame) -> None:
+        """Record one sample; `running_frame` is the top frame of the event loop thread."""
+        coro = self.coro
+        anchor = getattr(coro, "cr_frame", None)
+        if anchor is None:
+            return
+        frames = []
+        frame = running_frame
+        while frame is not None and frame is not anchor and len(frames) < _MAX_DEPTH:
+            frames.append(frame)
+            frame = frame.f_back
+        if frame is anchor:
+            # on CPU: the request's own frames, outermost first
+            frames.append(anchor)
+            stack = [_label(f.f_code) for f in reversed(frames)]
+        else:
+            # suspended: follow what each coroutine is awaiting
+            stack = []
+            awaitable = coro
+            while awaitable is not None and len(stack) < _MAX_DEPTH:
+                code = getattr(awaitable, "cr_code", None) or getattr(awaitable, "gi_code", None)
+                if code is None:
+                    # a Future (e.g. a hashing pool call or a driver reply) or another awaitable
+                    kind = "future" if "Future" in type(awaitable).__name__ else type(awaitable).__name__
+                    stack.append(f"[await {kind}]")
+                    break
+                stack.append(_label(code))
+                awaitable = getattr(awaitable, "cr_await", None) or getattr(awaitable, "gi_yieldfrom", None)
+            else:
+                stack.append("[await]")
+        self.samples += 1
+        self.stacks[";".join(stack)] += 1
+
+    def summary(self) -> dict:
+        return {
+            "id": self.id,
+            "method": self.method,
+            "path": self.path,
+            "status": self.status,
+            "started_at": self.started_at,
+            "duration_ms": self.duration_ms,
+            "samples": self.samples,
+            "interval_ms": PROFILE_INTERVAL * 1000,
+        }
+
+    def collapsed(self) -> str:
+        return "\n".join(f"{stack} {count}" for stack, count in self.stacks.most_common()) + "\n"
+
+
+class Profiler:
+    """Sampler thread plus the ring of finished profiles."""
+
+    def __init__(self, interval: float = PROFILE_INTERVAL, ring_size: int = PROFILE_RING_SIZE,
+                 max_concurrent: int = PROFILE_MAX_CONCURRENT):
+        self.interval = interval
+        self.max_concurrent = max_concurrent
+        self.ring: deque = deque(maxlen=ring_size)
+        self._active: List[RequestProfile] = []
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def begin(self, method: str, path: str, coro) -> Optional[RequestProfile]:
+        with self._lock:
+            if len(self._active) >= self.max_concurrent:
+                return None
+            profile = RequestProfile(method, path, coro, threading.get_ident())
+            self._active.append(profile)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="request-profiler", daemon=True)
+                self._thread.start()
+        self._wake.set()
+        return profile
+
+    def end(self, profile: RequestProfile) -> None:
+        with self._lock:
+            self._active.remove(profile)
+            self.ring.append(profile)
+        profile.coro = None
+
+    def _run(self) -> None:
+        while True:
+            with self._lock:
+                active = list(self._active)
+                if not active:
+                    self._wake.clear()
+            if not active:
+                self._wake.wait()
+                continue
+            frames = sys._current_frames()
+            for profile in active:
+                frame = frames.get(profile.thread_id)
+                if frame is not None:
+                    profile.sample(frame)
+            del frames
+            time.sleep(self.interval)
+
+    def get(self, profile_id: int) -> Optional[RequestProfile]:
+        for profile in self.ring:
+            if profile.id == profile_id:
+                return profile
+        return None
+
+    def summaries(self) -> List[dict]:
+        return [p.summary() for p in reversed(self.ring)]
+
+
+class ProfilerMiddleware:
+    """ASGI middleware that profiles selected requests and returns an X-Profile-Id header."""
+
+    def __init__(self, app, profiler: "Profiler"):
+        self.app = app
+        self.profiler = profiler
+
+    def _wanted(self, scope) -> bool:
+        if PROFILE_SAMPLE_RATE and random.random() < PROFILE_SAMPLE_RATE:
+            return True
+        header = PROFILE_HEADER.encode()
+        return any(name == header and operator_token_valid(value.decode("latin-1"))
+                   for name, value in scope.get("headers", ()))
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not self._wanted(scope):
+            await self.app(scope, receive, send)
+            return
+
+        profile: Optional[RequestProfile] = None
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start" and profile is not None:
+                profile.status = message["status"]
+                headers = list(message.get("headers", []))
+                headers.append((b"x-profile-id", str(profile.id).encode()))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        coro = self.app(scope, receive, send_wrapper)
+        profile = self.profiler.begin(scope["method"], scope["path"], coro)
+        started = time.perf_counter()
+        try:
+            await coro
+        finally:
+            if profile is not None:
+                profile.duration_ms = round((time.perf_counter() - started) * 1000, 3)
+                self.profiler.end(profile)
+
+
+_profiler: Optional[Profiler] = None
+
+
+def get_profiler() -> Profiler:
+    global _profiler
+    if _profiler is None:
+        _profiler = Profiler()
+    return _profiler
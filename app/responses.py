@@ -0,0 +1,38 @@
+from typing import Any, Type
+
+import orjson
+from bson import ObjectId
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+# orjson serializes dicts, lists, datetimes and UUIDs natively (several times faster
+# than the stdlib encoder); the default hook covers the few other types services return.
+_OPTIONS = orjson.OPT_NON_STR_KEYS
+
+
+def _default(value: Any) -> Any:
+    if isinstance(value, ObjectId):
+        return str(value)
+    if isinstance(value, BaseModel):
+        return value.model_dump()
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+def dumps(content: Any) -> bytes:
+    return orjson.dumps(content, default=_default, option=_OPTIONS)
+
+
+class FastJSONResponse(JSONResponse):
+    """Default response class: JSON rendered with orjson."""
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+def model_response(model: Type[BaseModel], data: Any, status_code: int = 200) -> FastJSONResponse:
+    """Validate `data` against `model` once and render it.
+
+    Returning a Response skips FastAPI's second validation/serialization pass for the
+    route's `response_model`, which stays declared for the OpenAPI schema.
+    """
+    return FastJSONResponse(model.model_validate(data).model_dump(), status_code=status_code)
@@ -1,4 +1,6 @@
 from .org_router import router as org_router
 from .auth_router import router as auth_router
+from .jobs_router import router as jobs_router
+from .profiles_router import router as profiles_router
 
-__all__ = ["org_router", "auth_router"]
+__all__ = ["org_router", "auth_router", "jobs_router", "profiles_router"]
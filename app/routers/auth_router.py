@@ -1,15 +1,40 @@
-from fastapi import APIRouter, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from app.dependencies import get_auth_service, get_current_admin, get_revocation_service
+from app.errors import BadRequest
 from app.models.schemas import AdminLogin, Token
+from app.responses import model_response
 from app.services.auth_service import AuthService
+from app.services.revocation import RevocationService
+from app.utils.ratelimit import client_ip, get_hash_admission
+from app.utils.security import TokenClaims
+from app.metrics import MetricsRoute
 
-router = APIRouter()
+router = APIRouter(route_class=MetricsRoute)
 
 
 @router.post("/login", response_model=Token)
-async def admin_login(payload: AdminLogin):
-    auth = AuthService()
-    admin_info = await auth.authenticate_admin(payload.email, payload.password)
+async def admin_login(payload: AdminLogin, request: Request, auth: AuthService = Depends(get_auth_service)):
+    async with get_hash_admission().guard(client_ip(request), payload.email):
+        admin_info = await auth.authenticate_admin(payload.email, payload.password)
     if not admin_info:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="invalid credentials")
     token = auth.create_token(admin_info)
-    return {"access_token": token, "token_type": "bearer"}
+    return model_response(Token, {"access_token": token, "token_type": "bearer"})
+
+
+@router.post("/logout")
+async def admin_logout(admin: TokenClaims = Depends(get_current_admin),
+                       revocations: RevocationService = Depends(get_revocation_service)):
+    """Revoke the presented token."""
+    await revocations.revoke_token(admin)
+    return {"revoked": True}
+
+
+@router.post("/revoke_all")
+async def admin_revoke_all(admin: TokenClaims = Depends(get_current_admin),
+                           revocations: RevocationService = Depends(get_revocation_service)):
+    """Revoke every token issued to this admin so far, including the presented one."""
+    if not admin.admin_id:
+        raise BadRequest("token has no subject")
+    revoked_before = await revocations.revoke_admin(admin.admin_id)
+    return {"revoked": True, "revoked_before": revoked_before}
@@ -0,0 +1,20 @@
+from fastapi import APIRouter, Depends
+from app.dependencies import get_current_admin, get_job_service
+from app.errors import NotFound
+from app.responses import FastJSONResponse
+from app.services.job_service import JobService
+from app.utils.security import TokenClaims
+from app.metrics import MetricsRoute
+
+router = APIRouter(route_class=MetricsRoute)
+
+
+@router.get("/{job_id}")
+async def get_job(job_id: str, admin: TokenClaims = Depends(get_current_admin),
+                  jobs: JobService = Depends(get_job_service)):
+    job = await jobs.get(job_id)
+    # jobs are only visible to admins of the organization they act on; anyone else gets
+    # the same 404 as for a missing id, so ids can't be probed
+    if not job or admin.org_id is None or job.get("org_id") != admin.org_id:
+        raise NotFound("job not found")
+    return FastJSONResponse(job)
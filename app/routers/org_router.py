@@ -1,45 +1,180 @@
-from fastapi import APIRouter, HTTPException, Header, status
+import orjson
+import os
+import time
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from fastapi.responses import StreamingResponse
+from pydantic import ValidationError
+from app.dependencies import get_current_admin, get_job_service, get_optional_admin, get_org_service, require_org_admin
+from app.errors import BadRequest, Unauthorized
 from app.models.schemas import OrgCreate, OrgResponse, OrgUpdate
-from app.services.org_service import OrganizationService
+from app.responses import FastJSONResponse, dumps, model_response
+from app.services.org_service import OrganizationService, ORG_RESPONSE_FIELDS
+from app.services.job_service import JobService
 from typing import Optional
-from app.utils.security import decode_token
+from contextlib import nullcontext
+from app.utils.security import TokenClaims
+from app.utils.ratelimit import client_ip, get_hash_admission
+from app.metrics import MetricsRoute
 
-router = APIRouter()
+router = APIRouter(route_class=MetricsRoute)
+
+BULK_CREATE_MAX_ITEMS = int(os.getenv("BULK_CREATE_MAX_ITEMS", "1000"))
+
+# /org/list is public, but an admin email is only listed to that organization's own admins
+PUBLIC_LIST_FIELDS = [f for f in ORG_RESPONSE_FIELDS if f != "admin_email"]
 
 
 @router.post("/create", response_model=OrgResponse)
-async def create_org(payload: OrgCreate):
-    svc = OrganizationService()
-    result = await svc.create_organization(payload.organization_name, payload.email, payload.password)
-    return result
+async def create_org(payload: OrgCreate, request: Request, svc: OrganizationService = Depends(get_org_service)):
+    async with get_hash_admission().guard(client_ip(request), payload.email):
+        result = await svc.create_organization(payload.organization_name, payload.email, payload.password)
+    return model_response(OrgResponse, result)
+
+
+@router.post("/bulk_create")
+async def bulk_create_orgs(request: Request, svc: OrganizationService = Depends(get_org_service)):
+    """Create many organizations from a JSON array or an NDJSON body (one OrgCreate per line)."""
+    body = await request.body()
+    if request.headers.get("content-type", "").startswith("application/x-ndjson"):
+        lines = [line for line in body.splitlines() if line.strip()]
+        raw_items = []
+        for line in lines:
+            try:
+                raw_items.append(orjson.loads(line))
+            except orjson.JSONDecodeError:
+                raw_items.append(None)
+    else:
+        try:
+            raw_items = orjson.loads(body)
+        except orjson.JSONDecodeError:
+            raise BadRequest("request body must be a JSON array or NDJSON")
+        if not isinstance(raw_items, list):
+            raise BadRequest("request body must be a JSON array or NDJSON")
+    if len(raw_items) > BULK_CREATE_MAX_ITEMS:
+        raise BadRequest(f"too many items (max {BULK_CREATE_MAX_ITEMS} per request)")
+
+    # validate every record up front; invalid ones are reported per item and skipped
+    results = [None] * len(raw_items)
+    valid, valid_idx = [], []
+    for i, raw in enumerate(raw_items):
+        try:
+            valid.append(OrgCreate.model_validate(raw))
+            valid_idx.append(i)
+        except ValidationError as e:
+            details = [{"loc": err.get("loc"), "msg": err.get("msg"), "type": err.get("type")} for err in e.errors()]
+            name = raw.get("organization_name") if isinstance(raw, dict) else None
+            results[i] = {"index": i, "organization_name": name, "status": "error",
+                          "error": {"code": "validation_error", "message": "invalid record", "details": details}}
+
+    started = time.perf_counter()
+    # every valid item costs a bcrypt hash, so the client's IP bucket is charged per item
+    async with get_hash_admission().guard(client_ip(request), cost=len(valid)):
+        created = await svc.bulk_create_organizations(valid)
+    elapsed = time.perf_counter() - started
+    for i, result in zip(valid_idx, created):
+        result["index"] = i
+        results[i] = result
+
+    created_count = sum(1 for r in results if r["status"] == "created")
+    return FastJSONResponse({
+        "created": created_count,
+        "failed": len(results) - created_count,
+        "elapsed_seconds": round(elapsed, 3),
+        "orgs_per_sec": round(created_count / elapsed, 2) if elapsed > 0 else None,
+        "results": results,
+    })
 
 
 @router.get("/get", response_model=OrgResponse)
-async def get_org(organization_name: str):
-    svc = OrganizationService()
+async def get_org(organization_name: str, svc: OrganizationService = Depends(get_org_service)):
     org = await svc.get_organization(organization_name)
     if not org:
         raise HTTPException(status_code=404, detail="organization not found")
-    return org
+    return model_response(OrgResponse, org)
+
+
+@router.get("/list")
+async def list_orgs(
+    request: Request,
+    sort: str = "organization_name",
+    after: Optional[str] = None,
+    limit: Optional[int] = Query(None, ge=1),
+    fields: Optional[str] = None,
+    stream: bool = False,
+    admin: Optional[TokenClaims] = Depends(get_optional_admin),
+    svc: OrganizationService = Depends(get_org_service),
+):
+    """List organizations with keyset pagination.
+
+    Pass `next_cursor` from a page as `after` to get the next one. With `stream=true`
+    (or `Accept: application/x-ndjson`) documents are streamed as NDJSON straight
+    from the database cursor instead of being paged. `admin_email` is only included
+    on the row of the caller's own organization; anonymous callers can't ask for it.
+    """
+    field_list = [f.strip() for f in fields.split(",") if f.strip()] if fields else None
+    if admin is None:
+        if field_list and "admin_email" in field_list:
+            raise Unauthorized("listing admin_email requires an admin token")
+        field_list = field_list or PUBLIC_LIST_FIELDS
+    # "" (a token without org_id) matches no organization
+    email_for = (admin.org_id if admin is not None else None) or ""
+    if stream or request.headers.get("accept", "").startswith("application/x-ndjson"):
+        cursor = svc.iter_organizations(sort, after, field_list, limit)
+        wanted = field_list or list(ORG_RESPONSE_FIELDS)
+
+        async def lines():
+            async for doc in cursor:
+                yield dumps(svc.list_item(doc, wanted, email_for)) + b"\n"
+
+        return StreamingResponse(lines(), media_type="application/x-ndjson")
+    return FastJSONResponse(await svc.list_organizations(sort, after, field_list, limit or 100, email_for))
+
+
+def _wants_async(request: Request) -> bool:
+    # RFC 7240: clients opt into background processing with `Prefer: respond-async`
+    return "respond-async" in request.headers.get("prefer", "").lower()
+
+
+def _accepted(job_id: str) -> FastJSONResponse:
+    return FastJSONResponse(status_code=status.HTTP_202_ACCEPTED,
+                        content={"job_id": job_id, "status_url": f"/jobs/{job_id}"},
+                        headers={"Location": f"/jobs/{job_id}"})
 
 
 @router.put("/update", response_model=OrgResponse)
-async def update_org(payload: OrgUpdate):
-    svc = OrganizationService()
-    updated = await svc.update_organization(payload.organization_name, payload.new_organization_name, payload.email, payload.password)
-    return updated
+async def update_org(payload: OrgUpdate, request: Request, admin: TokenClaims = Depends(get_current_admin),
+                     svc: OrganizationService = Depends(get_org_service),
+                     jobs: JobService = Depends(get_job_service)):
+    require_org_admin(admin, payload.organization_name, "update")
+    # only password changes spend bcrypt work; charge them against the organization as the subject
+    guard = get_hash_admission().guard(client_ip(request), f"org:{payload.organization_name}") if payload.password else nullcontext()
+    if payload.new_organization_name and _wants_async(request):
+        # admin changes are applied inline; the tenant collection move runs as a background job
+        org_id = await svc.check_rename(payload.organization_name, payload.new_organization_name, admin.org_id)
+        if payload.email or payload.password:
+            async with guard:
+                await svc.update_organization(payload.organization_name, None, payload.email, payload.password,
+                                              admin.org_id)
+        job_id = await jobs.enqueue("rename_org", {
+            "organization_name": payload.organization_name,
+            "new_organization_name": payload.new_organization_name,
+            "org_id": org_id,
+        }, org_id)
+        return _accepted(job_id)
+    async with guard:
+        updated = await svc.update_organization(payload.organization_name, payload.new_organization_name, payload.email, payload.password,
+                                                admin.org_id)
+    return model_response(OrgResponse, updated)
 
 
 @router.delete("/delete")
-async def delete_org(organization_name: str, authorization: Optional[str] = Header(None)):
-    if not authorization:
-        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="missing auth token")
-    token = authorization.split(" ")[-1]
-    try:
-        payload = decode_token(token)
-    except Exception:
-        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="invalid token")
-    requesting_email = payload.get("email")
-    svc = OrganizationService()
-    res = await svc.delete_organization(organization_name, requesting_email)
+async def delete_org(organization_name: str, request: Request, admin: TokenClaims = Depends(get_current_admin),
+                     svc: OrganizationService = Depends(get_org_service),
+                     jobs: JobService = Depends(get_job_service)):
+    require_org_admin(admin, organization_name, "delete")
+    if _wants_async(request):
+        org_id = await svc.check_exists(organization_name, admin.org_id)
+        job_id = await jobs.enqueue("delete_org", {"organization_name": organization_name, "org_id": org_id}, org_id)
+        return _accepted(job_id)
+    res = await svc.delete_organization(organization_name, admin.org_id)
     return res
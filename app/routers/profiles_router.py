@@ -0,0 +1,31 @@
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Header
+from fastapi.responses import PlainTextResponse
+from app.errors import NotFound, Unauthorized
+from app.metrics import MetricsRoute
+from app.profiling import get_profiler, operator_token_valid
+
+
+async def require_profiler_token(authorization: Optional[str] = Header(None)) -> None:
+    """Profiles span every tenant, so an org-admin token is not enough: require PROFILER_TOKEN."""
+    if not authorization or not operator_token_valid(authorization.split(" ")[-1]):
+        raise Unauthorized("profiler token required")
+
+
+router = APIRouter(route_class=MetricsRoute, dependencies=[Depends(require_profiler_token)])
+
+
+@router.get("")
+async def list_profiles():
+    """Most recent request profiles first."""
+    return {"profiles": get_profiler().summaries()}
+
+
+@router.get("/{profile_id}", response_class=PlainTextResponse)
+async def get_profile(profile_id: int):
+    """Collapsed stacks (`frame;frame;frame count` per line) for flamegraph tools."""
+    profile = get_profiler().get(profile_id)
+    if profile is None:
+        raise NotFound("profile not found")
+    return PlainTextResponse(profile.collapsed())
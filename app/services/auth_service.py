@@ -1,26 +1,78 @@
-from typing import Optional
+import asyncio
+import logging
+from typing import Optional, Set
 from app.database import get_master_db
-from app.utils.security import verify_password, create_access_token
+from app.utils.hashing import get_hashing_executor
+from app.utils.security import verify_password_async, create_access_token, hash_password_async, needs_rehash
+from app.utils.resilience import guarded, set_deadline
+from app.utils.singleflight import SingleFlight
+
+logger = logging.getLogger(__name__)
+
+# concurrent logins for admins of the same organization share one org id lookup
+org_id_lookups = SingleFlight()
 
 
 class AuthService:
     def __init__(self, db=None):
-        self.db = db or get_master_db()
-        self.admins = self.db.admins
+        self.db = db if db is not None else get_master_db()
+        self.admins = guarded(self.db.admins)
+        self.orgs = guarded(self.db.organizations)
+        # background upgrades of hashes below BCRYPT_ROUNDS (see _schedule_rehash)
+        self._rehashing: Set = set()
+        self._rehash_tasks: Set[asyncio.Task] = set()
+        self.rehashed = 0
+        self.rehash_skipped = 0
+        self.rehash_failed = 0
 
     async def authenticate_admin(self, email: str, password: str) -> Optional[dict]:
         admin = await self.admins.find_one({"email": email})
         if not admin:
             return None
-        if not verify_password(password, admin.get("password")):
+        if not await verify_password_async(password, admin.get("password")):
             return None
+        if needs_rehash(admin.get("password")):
+            self._schedule_rehash(admin.get("_id"), password, admin.get("password"))
         org_name = admin.get("organization_name")
         # Try to include the organization's id (org_id) in returned info so tokens
         # can carry both admin_id and org_id for evaluator requirements.
-        org = await self.db.organizations.find_one({"organization_name": org_name})
-        org_id = str(org.get("_id")) if org else None
+        org_id = await org_id_lookups.do(org_name, lambda: self._lookup_org_id(org_name))
         return {"admin_id": str(admin.get("_id")), "email": admin.get("email"), "organization_name": org_name, "org_id": org_id}
 
+    def _schedule_rehash(self, admin_id, password: str, old_hash: str) -> None:
+        """Upgrade a hash in the background; the login response never waits for it.
+
+        Only runs when a hashing worker is idle, so it can't delay other logins; a
+        skipped upgrade happens on a later login instead.
+        """
+        executor = get_hashing_executor()
+        if admin_id in self._rehashing or executor.stats()["pending"] >= executor.max_workers:
+            self.rehash_skipped += 1
+            return
+        self._rehashing.add(admin_id)
+        task = asyncio.create_task(self._rehash(admin_id, password, old_hash))
+        self._rehash_tasks.add(task)
+        task.add_done_callback(self._rehash_tasks.discard)
+
+    async def _rehash(self, admin_id, password: str, old_hash: str) -> None:
+        # not bound by the login request's deadline budget
+        set_deadline(None)
+        try:
+            new_hash = await hash_password_async(password)
+            # only replace the hash we verified: a password changed meanwhile wins
+            res = await self.admins.update_one({"_id": admin_id, "password": old_hash}, {"$set": {"password": new_hash}})
+            if res.modified_count:
+                self.rehashed += 1
+        except Exception as e:
+            self.rehash_failed += 1
+            logger.warning("password rehash failed: %s", e)
+        finally:
+            self._rehashing.discard(admin_id)
+
+    async def _lookup_org_id(self, org_name: str) -> Optional[str]:
+        org = await self.orgs.find_one({"organization_name": org_name}, {"_id": 1})
+        return str(org.get("_id")) if org else None
+
     def create_token(self, admin_info: dict) -> str:
         data = {
             "sub": admin_info.get("admin_id"),
@@ -29,3 +81,7 @@ class AuthService:
             "org_id": admin_info.get("org_id"),
         }
         return create_access_token(data)
+
+    def rehash_stats(self) -> dict:
+        return {"in_flight": len(self._rehashing), "rehashed": self.rehashed,
+                "skipped": self.rehash_skipped, "failed": self.rehash_failed}
@@ -0,0 +1,119 @@
+import asyncio
+import logging
+import os
+import socket
+import time
+from typing import Optional
+
+from pymongo.errors import OperationFailure
+
+from app.utils.cache import TTLCache
+
+logger = logging.getLogger(__name__)
+
+# Cross-replica invalidation: every replica tails the master_db change stream for
+# organizations and admins and drops local cache entries tagged with the changed
+# document's _id. Set ORG_CACHE_SYNC=0 to disable.
+ORG_CACHE_SYNC = os.getenv("ORG_CACHE_SYNC", "1") == "1"
+# TTL used instead of ORG_CACHE_TTL when change streams are unavailable (standalone mongod)
+ORG_CACHE_FALLBACK_TTL = float(os.getenv("ORG_CACHE_FALLBACK_TTL", "5"))
+# resume tokens are persisted per replica, at most once per interval
+REPLICA_ID = os.getenv("REPLICA_ID", socket.gethostname())
+RESUME_TOKEN_PERSIST_INTERVAL = float(os.getenv("RESUME_TOKEN_PERSIST_INTERVAL", "5"))
+
+WATCHED_COLLECTIONS = ("organizations", "admins")
+# server error codes: change streams need a replica set / the resume point fell off the oplog
+_NOT_REPLICA_SET_CODES = {40573}
+_RESUME_FAILED_CODES = {260, 280, 286}
+
+
+class CacheInvalidationWatcher:
+    """Background task that keeps a local TTLCache coherent across replicas."""
+
+    def __init__(self, db, cache: TTLCache, replica_id: str = REPLICA_ID,
+                 fallback_ttl: float = ORG_CACHE_FALLBACK_TTL):
+        self.db = db
+        self.cache = cache
+        self.state = db.cache_sync_state
+        self.replica_id = replica_id
+        self.state_id = f"org_cache:{replica_id}"
+        self.fallback_ttl = fallback_ttl
+        self.mode = "stopped"
+        self.events = 0
+        self._task: Optional[asyncio.Task] = None
+        self._last_persist = 0.0
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run(), name="org-cache-sync")
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        self.mode = "stopped"
+
+    async def _load_token(self):
+        doc = await self.state.find_one({"_id": self.state_id})
+        return doc.get("resume_token") if doc else None
+
+    async def _persist_token(self, token) -> None:
+        now = time.monotonic()
+        if token is None or now - self._last_persist < RESUME_TOKEN_PERSIST_INTERVAL:
+            return
+        self._last_persist = now
+        await self.state.update_one({"_id": self.state_id}, {"$set": {"resume_token": token}}, upsert=True)
+
+    def _apply(self, change: dict) -> None:
+        self.events += 1
+        op = change.get("operationType")
+        if op in ("update", "replace", "delete"):
+            self.cache.invalidate_tag(str(change["documentKey"]["_id"]))
+        elif op in ("drop", "rename", "dropDatabase", "invalidate"):
+            self.cache.clear()
+
+    async def _run(self) -> None:
+        pipeline = [{"$match": {"ns.coll": {"$in": list(WATCHED_COLLECTIONS)}}}]
+        backoff = 1.0
+        while True:
+            try:
+                token = await self._load_token()
+                if token is None and self.mode == "reconnecting":
+                    # nothing to resume from, so events missed while disconnected are lost
+                    self.cache.clear()
+                async with self.db.watch(pipeline, resume_after=token, max_await_time_ms=1000) as stream:
+                    self.mode = "change_stream"
+                    backoff = 1.0
+                    while stream.alive:
+                        change = await stream.try_next()
+                        if change is not None:
+                            self._apply(change)
+                        await self._persist_token(stream.resume_token)
+            except OperationFailure as e:
+                if e.code in _NOT_REPLICA_SET_CODES:
+                    # standalone mongod: no change streams, bound staleness with a short TTL instead
+                    logger.warning("change streams unavailable; using %ss org cache TTL", self.fallback_ttl)
+                    self.cache.ttl = min(self.cache.ttl, self.fallback_ttl)
+                    self.cache.clear()
+                    self.mode = "ttl_fallback"
+                    return
+                if e.code in _RESUME_FAILED_CODES:
+                    # the resume point fell off the oplog: anything may have changed, start over
+                    logger.warning("cache sync resume token rejected (%s); clearing cache", e.code)
+                    self.cache.clear()
+                    await self.state.delete_one({"_id": self.state_id})
+                    continue
+                logger.warning("cache sync stream failed: %s", e)
+            except Exception as e:
+                # network errors, elections, etc.: reconnect with backoff and resume
+                logger.warning("cache sync stream failed: %s", e)
+            self.mode = "reconnecting"
+            await asyncio.sleep(backoff)
+            backoff = min(backoff * 2, 30.0)
+
+    def stats(self) -> dict:
+        return {"mode": self.mode, "events": self.events, "replica_id": self.replica_id}
@@ -0,0 +1,96 @@
+import asyncio
+import os
+from typing import Awaitable, Callable, List, Optional
+
+from bson.codec_options import CodecOptions
+from bson.raw_bson import RawBSONDocument
+from pymongo import IndexModel
+from pymongo.errors import BulkWriteError
+
+# Streaming collection copy used when a tenant collection can't be renamed in place.
+# Documents are read as RawBSONDocument (no decode/encode round trip) in batches of at
+# most COPY_BATCH_SIZE documents or COPY_BATCH_BYTES bytes, with at most
+# COPY_MAX_INFLIGHT insert batches outstanding, so memory stays bounded by
+# roughly (COPY_MAX_INFLIGHT + 1) batches regardless of collection size.
+COPY_BATCH_SIZE = int(os.getenv("COPY_BATCH_SIZE", "1000"))
+COPY_BATCH_BYTES = int(os.getenv("COPY_BATCH_BYTES", str(8 * 1024 * 1024)))
+COPY_MAX_INFLIGHT = int(os.getenv("COPY_MAX_INFLIGHT", "4"))
+
+_RAW = CodecOptions(document_class=RawBSONDocument)
+# duplicate key: the document was already copied by an earlier, interrupted attempt
+_DUPLICATE_KEY = 11000
+
+ProgressCallback = Callable[[int], Awaitable[None]]
+
+
+async def copy_collection(db, source: str, target: str, on_progress: Optional[ProgressCallback] = None,
+                          batch_size: int = COPY_BATCH_SIZE, batch_bytes: int = COPY_BATCH_BYTES,
+                          max_inflight: int = COPY_MAX_INFLIGHT) -> int:
+    """Copy every document and secondary index from `source` to `target`.
+
+    Returns the number of documents copied. `on_progress` is awaited with the running
+    total after each batch is written. Re-running after a partial copy is safe:
+    documents already present in `target` are skipped.
+    """
+    src = db[source].with_options(codec_options=_RAW)
+    dst = db[target].with_options(codec_options=_RAW)
+    slots = asyncio.Semaphore(max_inflight)
+    tasks: List[asyncio.Task] = []
+    copied = 0
+
+    async def write(batch: List[RawBSONDocument]) -> None:
+        nonlocal copied
+        try:
+            await dst.insert_many(batch, ordered=False)
+        except BulkWriteError as e:
+            errors = e.details.get("writeErrors", [])
+            if any(err.get("code") != _DUPLICATE_KEY for err in errors) or e.details.get("writeConcernErrors"):
+                raise
+        finally:
+            slots.release()
+        copied += len(batch)
+        if on_progress is not None:
+            await on_progress(copied)
+
+    async def flush(batch: List[RawBSONDocument]) -> None:
+        await slots.acquire()
+        tasks.append(asyncio.create_task(write(batch)))
+        # surface failures early instead of streaming the rest of the collection
+        for task in [t for t in tasks if t.done()]:
+            tasks.remove(task)
+            task.result()
+
+    try:
+        batch: List[RawBSONDocument] = []
+        size = 0
+        async for doc in src.find({}, batch_size=batch_size):
+            batch.append(doc)
+            size += len(doc.raw)
+            if len(batch) >= batch_size or size >= batch_bytes:
+                await flush(batch)
+                batch, size = [], 0
+        if batch:
+            await flush(batch)
+        await asyncio.gather(*tasks)
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        raise
+
+    await copy_indexes(db, source, target)
+    return copied
+
+
+async def copy_indexes(db, source: str, target: str) -> None:
+    """Recreate the secondary indexes of `source` on `target` (names and options preserved)."""
+    models = []
+    async for index in db[source].list_indexes():
+        spec = dict(index)
+        if spec.get("name") == "_id_":
+            continue
+        keys = list(spec.pop("key").items())
+        spec.pop("v", None)
+        spec.pop("ns", None)
+        models.append(IndexModel(keys, **spec))
+    if models:
+        await db[target].create_indexes(models)
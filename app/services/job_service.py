@@ -0,0 +1,242 @@
+import asyncio
+import logging
+import os
+import socket
+from datetime import datetime, timedelta
+from typing import Awaitable, Callable, Dict, List, Optional
+
+from bson import ObjectId
+from bson.errors import InvalidId
+from pymongo import ReturnDocument
+from pymongo.errors import ConnectionFailure
+
+from app.database import get_master_db
+from app.errors import AppError, DeadlineExceeded, ServiceUnavailable
+from app.services.org_service import OrganizationService
+
+logger = logging.getLogger(__name__)
+
+# Long-running org renames/deletes run as jobs persisted in master_db.jobs. Any replica's
+# workers may claim a queued job; a claim is a lease that the worker keeps renewing while
+# it runs, so a job whose worker died becomes claimable again once the lease expires.
+JOBS_ENABLED = os.getenv("JOBS_ENABLED", "1") == "1"
+JOB_WORKERS = int(os.getenv("JOB_WORKERS", "1"))
+JOB_LEASE_SECONDS = float(os.getenv("JOB_LEASE_SECONDS", "30"))
+JOB_POLL_INTERVAL = float(os.getenv("JOB_POLL_INTERVAL", "1"))
+JOB_MAX_ATTEMPTS = int(os.getenv("JOB_MAX_ATTEMPTS", "3"))
+# a job that fails with a transient error (database unavailable) is queued again after
+# JOB_RETRY_BACKOFF_SECONDS * 2^(attempt-1) while attempts remain; other errors fail it
+JOB_RETRY_BACKOFF_SECONDS = float(os.getenv("JOB_RETRY_BACKOFF_SECONDS", "5"))
+WORKER_ID = os.getenv("REPLICA_ID", socket.gethostname())
+
+JobHandler = Callable[[dict, Callable[[dict], Awaitable[None]]], Awaitable[dict]]
+
+_RETRYABLE_ERRORS = (ServiceUnavailable, DeadlineExceeded, ConnectionFailure)
+
+
+class JobService:
+    def __init__(self, db=None):
+        self.db = db if db is not None else get_master_db()
+        self.jobs = self.db.jobs
+
+    async def enqueue(self, kind: str, params: dict, org_id: Optional[str] = None) -> str:
+        """Queue a job; `org_id` is the organization it acts on, the only one whose admins may read it."""
+        now = datetime.utcnow()
+        res = await self.jobs.insert_one({
+            "kind": kind,
+            "org_id": org_id,
+            "params": params,
+            "status": "queued",
+            "progress": {},
+            "attempts": 0,
+            "created_at": now,
+            "updated_at": now,
+        })
+        return str(res.inserted_id)
+
+    async def get(self, job_id: str) -> Optional[dict]:
+        try:
+            oid = ObjectId(job_id)
+        except (InvalidId, TypeError):
+            return None
+        job = await self.jobs.find_one({"_id": oid}, {"lease_owner": 0, "lease_expires_at": 0})
+        if not job:
+            return None
+        job["id"] = str(job.pop("_id"))
+        return job
+
+    async def claim(self, owner: str) -> Optional[dict]:
+        now = datetime.utcnow()
+        return await self.jobs.find_one_and_update(
+            {
+                "$or": [
+                    # retried jobs wait out their backoff; jobs without retry_at are due now
+                    {"status": "queued", "retry_at": {"$not": {"$gt": now}}},
+                    {"status": "running", "lease_expires_at": {"$lt": now}},
+                ],
+                "attempts": {"$lt": JOB_MAX_ATTEMPTS},
+            },
+            {
+                "$set": {
+                    "status": "running",
+                    "lease_owner": owner,
+                    "lease_expires_at": now + timedelta(seconds=JOB_LEASE_SECONDS),
+                    "updated_at": now,
+                },
+                "$inc": {"attempts": 1},
+            },
+            sort=[("created_at", 1)],
+            return_document=ReturnDocument.AFTER,
+        )
+
+    async def renew(self, job_id, owner: str, progress: Optional[dict] = None) -> bool:
+        """Extend the lease (and record progress); False means another worker took the job over."""
+        now = datetime.utcnow()
+        fields = {"lease_expires_at": now + timedelta(seconds=JOB_LEASE_SECONDS), "updated_at": now}
+        if progress is not None:
+            fields["progress"] = progress
+        res = await self.jobs.update_one({"_id": job_id, "lease_owner": owner, "status": "running"}, {"$set": fields})
+        return res.matched_count == 1
+
+    async def finish(self, job_id, owner: str, status: str, result: Optional[dict] = None,
+                     error: Optional[dict] = None) -> None:
+        await self.jobs.update_one(
+            {"_id": job_id, "lease_owner": owner},
+            {"$set": {"status": status, "result": result, "error": error, "updated_at": datetime.utcnow()},
+             "$unset": {"lease_owner": "", "lease_expires_at": ""}},
+        )
+
+    async def retry_later(self, job_id, owner: str, delay: float, error: dict) -> None:
+        """Give the job back to the queue, claimable again after `delay` seconds."""
+        now = datetime.utcnow()
+        await self.jobs.update_one(
+            {"_id": job_id, "lease_owner": owner},
+            {"$set": {"status": "queued", "retry_at": now + timedelta(seconds=delay), "error": error,
+                      "updated_at": now},
+             "$unset": {"lease_owner": "", "lease_expires_at": ""}},
+        )
+
+    async def fail_abandoned(self) -> None:
+        """Mark jobs whose lease expired on their last allowed attempt as failed."""
+        now = datetime.utcnow()
+        await self.jobs.update_many(
+            {"status": "running", "lease_expires_at": {"$lt": now}, "attempts": {"$gte": JOB_MAX_ATTEMPTS}},
+            {"$set": {"status": "failed", "updated_at": now,
+                      "error": {"code": "abandoned", "message": "job lease expired too many times"}},
+             "$unset": {"lease_owner": "", "lease_expires_at": ""}},
+        )
+
+
+class JobWorker:
+    """Polls for jobs and runs them with the registered handlers."""
+
+    def __init__(self, service: JobService, handlers: Dict[str, JobHandler], concurrency: int = JOB_WORKERS):
+        self.service = service
+        self.handlers = handlers
+        self.concurrency = concurrency
+        self._tasks: List[asyncio.Task] = []
+        self.processed = 0
+        self.failed = 0
+        self.retried = 0
+
+    def start(self) -> None:
+        for n in range(self.concurrency):
+            owner = f"{WORKER_ID}:{os.getpid()}:{n}"
+            self._tasks.append(asyncio.create_task(self._loop(owner), name=f"job-worker-{n}"))
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    async def _loop(self, owner: str) -> None:
+        while True:
+            try:
+                await self.service.fail_abandoned()
+                job = await self.service.claim(owner)
+            except Exception as e:
+                logger.warning("job claim failed: %s", e)
+                job = None
+            if job is None:
+                await asyncio.sleep(JOB_POLL_INTERVAL)
+                continue
+            await self._run(job, owner)
+
+    async def _run(self, job: dict, owner: str) -> None:
+        job_id = job["_id"]
+        handler = self.handlers.get(job["kind"])
+        if handler is None:
+            await self.service.finish(job_id, owner, "failed", error={"code": "unknown_job", "message": f"no handler for {job['kind']}"})
+            return
+
+        progress: dict = {}
+
+        async def report(update: dict) -> None:
+            progress.update(update)
+
+        work = asyncio.create_task(handler(job.get("params") or {}, report))
+        lost = False
+
+        async def keep_lease() -> None:
+            nonlocal lost
+            while True:
+                await asyncio.sleep(JOB_LEASE_SECONDS / 3)
+                if not await self.service.renew(job_id, owner, dict(progress)):
+                    # another worker has taken the job over; stop writing alongside it
+                    logger.warning("lost lease on job %s; cancelling it", job_id)
+                    lost = True
+                    work.cancel()
+                    return
+
+        lease = asyncio.create_task(keep_lease())
+        try:
+            result = await work
+        except asyncio.CancelledError:
+            if not lost:
+                raise
+        except _RETRYABLE_ERRORS as e:
+            error = {"code": getattr(e, "code", "service_unavailable"), "message": getattr(e, "message", str(e))}
+            attempts = job.get("attempts", 1)
+            if attempts < JOB_MAX_ATTEMPTS:
+                self.retried += 1
+                delay = JOB_RETRY_BACKOFF_SECONDS * 2 ** (attempts - 1)
+                logger.warning("job %s hit a transient error, retrying in %ss: %s", job_id, delay, e)
+                await self.service.retry_later(job_id, owner, delay, error)
+            else:
+                self.failed += 1
+                await self.service.finish(job_id, owner, "failed", error=error)
+        except AppError as e:
+            self.failed += 1
+            await self.service.finish(job_id, owner, "failed", error={"code": e.code, "message": e.message})
+        except Exception as e:
+            self.failed += 1
+            logger.exception("job %s failed", job_id)
+            await self.service.finish(job_id, owner, "failed", error={"code": "internal_error", "message": str(e)})
+        else:
+            self.processed += 1
+            await self.service.renew(job_id, owner, dict(progress))
+            await self.service.finish(job_id, owner, "succeeded", result=result)
+        finally:
+            lease.cancel()
+
+    def stats(self) -> dict:
+        return {"workers": len(self._tasks), "processed": self.processed, "failed": self.failed,
+                "retried": self.retried}
+
+
+def org_job_handlers(db=None) -> Dict[str, JobHandler]:
+    """Handlers for the organization jobs queued by the org router."""
+
+    async def rename_org(params: dict, report) -> dict:
+        async def copied(n: int) -> None:
+            await report({"documents_copied": n})
+        svc = OrganizationService(db)
+        return await svc.rename_organization(params["organization_name"], params["new_organization_name"], copied,
+                                             params.get("org_id"))
+
+    async def delete_org(params: dict, report) -> dict:
+        svc = OrganizationService(db)
+        return await svc.purge_organization(params["organization_name"], params.get("org_id"))
+
+    return {"rename_org": rename_org, "delete_org": delete_org}
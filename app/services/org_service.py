@@ -1,43 +1,138 @@
-from typing import Optional
+import asyncio
+import base64
+import os
+from typing import List, Optional
 from app.database import get_master_db
-from app.utils.security import hash_password, ensure_bcrypt_compatible_password
-from app.utils.validators import validate_password_strength
-from app.errors import BadRequest, NotFound, Conflict, Forbidden, InternalError
+from app.models.schemas import OrgCreate
+from app.utils.hashing import get_hashing_executor
+from app.utils.security import hash_password_async, ensure_bcrypt_compatible_password
+from app.utils.validators import is_breached_password, validate_password_strength
+from app.errors import AppError, BadRequest, NotFound, Conflict, Forbidden, InternalError
 from datetime import datetime
-from pymongo.errors import DuplicateKeyError, OperationFailure
-from motor.motor_asyncio import AsyncIOMotorCollection
+from pymongo.errors import BulkWriteError, DuplicateKeyError
+from bson import ObjectId, json_util
+from bson.errors import InvalidId
+from app.services.collection_copy import ProgressCallback
+from app.services.revocation import RevocationService
+from app.services.tenant_store import tenant_store, tenant_store_for
+from app.utils.cache import TTLCache
+from app.utils.resilience import guarded, guarded_call
+from app.utils.singleflight import SingleFlight
+
+# Only the fields needed to build an OrgResponse. `admin_email` is denormalized onto
+# the organization document so a read is a single round trip; `admin_id` is kept for
+# documents written before that field existed.
+ORG_RESPONSE_PROJECTION = {
+    "organization_name": 1,
+    "collection_name": 1,
+    "admin_email": 1,
+    "admin_id": 1,
+    "created_at": 1,
+}
+
+# Read-through cache for get_organization keyed by organization_name. Values are
+# tuples in ORG_RESPONSE_FIELDS order. Writes in this process invalidate entries
+# synchronously; ORG_CACHE_TTL bounds staleness from writes made elsewhere.
+ORG_CACHE_MAX_ENTRIES = int(os.getenv("ORG_CACHE_MAX_ENTRIES", "10000"))
+ORG_CACHE_TTL = float(os.getenv("ORG_CACHE_TTL", "30"))
+ORG_RESPONSE_FIELDS = ("organization_name", "collection_name", "admin_email", "created_at")
+
+org_cache = TTLCache(ORG_CACHE_MAX_ENTRIES, ORG_CACHE_TTL)
+org_lookups = SingleFlight()
+
+
+# "checked" (default) pre-checks uniqueness and compensates by hand on failure;
+# "transactional" relies on the unique indexes and a multi-document transaction.
+ORG_PROVISIONING = os.getenv("ORG_PROVISIONING", "checked")
+
+# max concurrent create_collection calls issued by bulk provisioning
+BULK_COLLECTION_CONCURRENCY = int(os.getenv("BULK_COLLECTION_CONCURRENCY", "16"))
+
+
+def _conflict_for_duplicate(e: DuplicateKeyError) -> Conflict:
+    key_pattern = (e.details or {}).get("keyPattern") or {}
+    if "email" in key_pattern:
+        return Conflict("admin email already in use")
+    return Conflict("organization already exists")
+
+
+def _check_org_id(org: dict, org_id: Optional[str]) -> None:
+    # tokens also carry the organization's id, so a name reused by a newer organization doesn't match
+    if org_id is not None and str(org.get("_id")) != org_id:
+        raise Forbidden("token was issued for a different organization")
+
+
+def _job_filter(organization_name: str, org_id: Optional[str]) -> dict:
+    # jobs carry the id checked when they were queued, so they act on that organization
+    # even if it is renamed or its name is reused meanwhile (older jobs only have the name)
+    if org_id is None:
+        return {"organization_name": organization_name}
+    try:
+        return {"_id": ObjectId(org_id)}
+    except (InvalidId, TypeError):
+        raise NotFound("organization does not exist")
+
+
+def invalidate_organization(*names: Optional[str]) -> None:
+    """Drop cached entries and detach pending lookups so later reads see the write."""
+    org_cache.invalidate(*names)
+    for name in names:
+        org_lookups.forget(name)
+
+# Keyset pagination for list_organizations: each sort is backed by an index
+# (organization_name unique, created_at + _id compound) so deep pages cost the same
+# as the first one. The cursor is the last row's sort key, base64-encoded.
+LIST_SORTS = {
+    "organization_name": [("organization_name", 1)],
+    "created_at": [("created_at", 1), ("_id", 1)],
+}
+LIST_MAX_LIMIT = 1000
+
+
+def _encode_cursor(sort: str, doc: dict) -> str:
+    key = {field: doc.get(field) for field, _ in LIST_SORTS[sort]}
+    return base64.urlsafe_b64encode(json_util.dumps(key).encode("utf-8")).decode("ascii")
+
+
+def _cursor_filter(sort: str, cursor: Optional[str]) -> dict:
+    if not cursor:
+        return {}
+    try:
+        key = json_util.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+        if sort == "organization_name":
+            return {"organization_name": {"$gt": key["organization_name"]}}
+        return {"$or": [
+            {"created_at": {"$gt": key["created_at"]}},
+            {"created_at": key["created_at"], "_id": {"$gt": key["_id"]}},
+        ]}
+    except (ValueError, KeyError, TypeError):
+        raise BadRequest("invalid pagination cursor")
 
 
 class OrganizationService:
     def __init__(self, db=None):
-        self.db = db or get_master_db()
-        self.orgs = self.db.organizations
-        self.admins = self.db.admins
+        self.db = db if db is not None else get_master_db()
+        # request-path operations run under the deadline/retry/breaker policy (app/utils/resilience.py)
+        self.orgs = guarded(self.db.organizations)
+        self.admins = guarded(self.db.admins)
+        # layout used for new organizations; existing ones use tenant_store_for(org)
+        self.tenants = tenant_store(self.db)
+        self.revocations = RevocationService(self.db)
 
     async def create_organization(self, organization_name: str, email: str, password: str) -> dict:
+        if ORG_PROVISIONING == "transactional":
+            return await self._create_organization_transactional(organization_name, email, password)
+
         # ensure unique organization_name and admin email
         if await self.orgs.find_one({"organization_name": organization_name}):
             raise Conflict("organization already exists")
         if await self.admins.find_one({"email": email}):
             raise Conflict("admin email already in use")
 
-        collection_name = f"org_{organization_name}"
-        # create empty collection if not exists
-        existing_collections = await self.db.list_collection_names()
-        if collection_name not in existing_collections:
-            try:
-                await self.db.create_collection(collection_name)
-            except Exception:
-                pass
+        collection_name = self.tenants.collection_name(organization_name)
+        await self.tenants.provision(organization_name)
 
-        if not validate_password_strength(password):
-            raise BadRequest("password does not meet strength requirements")
-        # ensure bcrypt length limits are enforced with a clear error
-        try:
-            ensure_bcrypt_compatible_password(password)
-        except ValueError as e:
-            raise BadRequest(str(e))
-        hashed = hash_password(password)
+        hashed = await self._hash_new_password(password)
         admin_doc = {
             "email": email,
             "password": hashed,
@@ -54,6 +149,7 @@ class OrganizationService:
             "organization_name": organization_name,
             "collection_name": collection_name,
             "admin_id": admin_id,
+            "admin_email": email,
             "created_at": datetime.utcnow()
         }
         try:
@@ -70,63 +166,263 @@ class OrganizationService:
             "created_at": org_doc["created_at"]
         }
 
+    async def _create_organization_transactional(self, organization_name: str, email: str, password: str) -> dict:
+        # No pre-check reads: the unique indexes from ensure_indexes reject duplicate names
+        # and emails, and the transaction commits both inserts or neither. Requires a
+        # replica set (see docker-compose.replset.yml).
+        hashed = await self._hash_new_password(password)
+        collection_name = self.tenants.collection_name(organization_name)
+        now = datetime.utcnow()
+        admin_doc = {
+            "email": email,
+            "password": hashed,
+            "organization_name": organization_name,
+            "created_at": now
+        }
+        org_doc = {
+            "organization_name": organization_name,
+            "collection_name": collection_name,
+            "admin_email": email,
+            "created_at": now
+        }
+
+        # The callback uses the raw collections: with_transaction retries on the driver's
+        # TransientTransactionError/UnknownTransactionCommitResult labels, which the guarded
+        # wrappers would turn into 503s. The deadline and breaker cover the whole transaction.
+        async def provision(session):
+            res = await self.db.admins.insert_one(admin_doc, session=session)
+            org_doc["admin_id"] = res.inserted_id
+            await self.db.organizations.insert_one(org_doc, session=session)
+
+        async def transaction():
+            async with await self.db.client.start_session() as session:
+                await session.with_transaction(provision)
+
+        try:
+            await guarded_call(transaction)
+        except DuplicateKeyError as e:
+            raise _conflict_for_duplicate(e)
+
+        # provisioned after commit so a retried or aborted transaction never leaves it behind
+        await self.tenants.provision(organization_name)
+
+        return {
+            "organization_name": organization_name,
+            "collection_name": collection_name,
+            "admin_email": email,
+            "created_at": now
+        }
+
+    async def _hash_new_password(self, password: str) -> str:
+        if not validate_password_strength(password):
+            raise BadRequest("password does not meet strength requirements")
+        if is_breached_password(password):
+            raise BadRequest("password appears in a known data breach; choose a different one")
+        # ensure bcrypt length limits are enforced with a clear error
+        try:
+            ensure_bcrypt_compatible_password(password)
+        except ValueError as e:
+            raise BadRequest(str(e))
+        return await hash_password_async(password)
+
+    async def bulk_create_organizations(self, items: List[OrgCreate]) -> List[dict]:
+        """Provision many organizations at once; returns one result per item, in order.
+
+        Passwords are hashed in parallel on the hashing executor, admins and orgs are
+        written with unordered insert_many (duplicates are reported by the unique
+        indexes instead of pre-check reads) and tenant collections are created
+        concurrently with a bounded semaphore.
+        """
+        results: List[Optional[dict]] = [None] * len(items)
+
+        def fail(i: int, err: AppError) -> None:
+            results[i] = {"index": i, "organization_name": items[i].organization_name, "status": "error",
+                          "error": {"code": err.code, "message": err.message}}
+
+        # duplicates inside the batch would only surface as index errors halfway through
+        seen_names, seen_emails = set(), set()
+        pending = []
+        for i, item in enumerate(items):
+            if item.organization_name in seen_names:
+                fail(i, Conflict("organization already exists"))
+            elif item.email in seen_emails:
+                fail(i, Conflict("admin email already in use"))
+            else:
+                pending.append(i)
+            seen_names.add(item.organization_name)
+            seen_emails.add(item.email)
+
+        hash_slots = asyncio.Semaphore(get_hashing_executor().max_workers)
+
+        async def hash_one(i: int) -> Optional[str]:
+            async with hash_slots:
+                try:
+                    return await self._hash_new_password(items[i].password)
+                except AppError as err:
+                    fail(i, err)
+                    return None
+
+        hashes = await asyncio.gather(*(hash_one(i) for i in pending))
+        now = datetime.utcnow()
+        admin_docs, admin_idx = [], []
+        for i, hashed in zip(pending, hashes):
+            if hashed is None:
+                continue
+            admin_docs.append({"email": items[i].email, "password": hashed,
+                               "organization_name": items[i].organization_name, "created_at": now})
+            admin_idx.append(i)
+
+        inserted_admins = await self._insert_unordered(self.admins, admin_docs, admin_idx, fail)
+        org_docs, org_idx = [], []
+        for i, doc in inserted_admins:
+            org_docs.append({"organization_name": items[i].organization_name,
+                             "collection_name": self.tenants.collection_name(items[i].organization_name),
+                             "admin_id": doc["_id"], "admin_email": items[i].email, "created_at": now})
+            org_idx.append(i)
+        inserted_orgs = await self._insert_unordered(self.orgs, org_docs, org_idx, fail)
+
+        # compensate: drop admins whose organization could not be inserted
+        created = {i for i, _ in inserted_orgs}
+        orphaned = [doc["_id"] for i, doc in inserted_admins if i not in created]
+        if orphaned:
+            await self.admins.delete_many({"_id": {"$in": orphaned}})
+
+        collection_slots = asyncio.Semaphore(BULK_COLLECTION_CONCURRENCY)
+
+        async def provision(name: str) -> None:
+            async with collection_slots:
+                await self.tenants.provision(name)
+
+        await asyncio.gather(*(provision(doc["organization_name"]) for _, doc in inserted_orgs))
+        for i, doc in inserted_orgs:
+            results[i] = {"index": i, "organization_name": doc["organization_name"], "status": "created",
+                          "collection_name": doc["collection_name"], "admin_email": doc["admin_email"],
+                          "created_at": doc["created_at"]}
+        return results
+
+    async def _insert_unordered(self, collection, docs: List[dict], indexes: List[int], fail) -> List[tuple]:
+        """insert_many(ordered=False); reports duplicate-key failures through `fail` and
+        returns (item index, document) pairs for the documents that were written."""
+        if not docs:
+            return []
+        failed = set()
+        try:
+            await collection.insert_many(docs, ordered=False)
+        except BulkWriteError as e:
+            for err in e.details.get("writeErrors", []):
+                pos = err["index"]
+                failed.add(pos)
+                if err.get("code") == 11000:
+                    fail(indexes[pos], _conflict_for_duplicate(DuplicateKeyError(err.get("errmsg", ""), 11000, err)))
+                else:
+                    fail(indexes[pos], InternalError("failed to write organization"))
+        return [(indexes[pos], doc) for pos, doc in enumerate(docs) if pos not in failed]
+
     async def get_organization(self, organization_name: str) -> Optional[dict]:
-        org = await self.orgs.find_one({"organization_name": organization_name})
+        cached = org_cache.get(organization_name)
+        if cached is None:
+            # concurrent misses for the same name share one Mongo round trip
+            cached = await org_lookups.do(organization_name, lambda: self._load_organization(organization_name))
+        if cached is None:
+            return None
+        return dict(zip(ORG_RESPONSE_FIELDS, cached))
+
+    async def _load_organization(self, organization_name: str) -> Optional[tuple]:
+        generation = org_cache.generation
+        org = await self.orgs.find_one({"organization_name": organization_name}, ORG_RESPONSE_PROJECTION)
         if not org:
             return None
-        admin = await self.admins.find_one({"_id": org.get("admin_id")})
+        response = await self._to_response(org)
+        row = tuple(response[f] for f in ORG_RESPONSE_FIELDS)
+        # tag with the org and admin ids so change events can invalidate by documentKey;
+        # skip the store if anything was invalidated while this read was in flight
+        tags = (str(org.get("_id")), str(org.get("admin_id")))
+        org_cache.set(organization_name, row, tags, generation=generation)
+        return row
+
+    async def _to_response(self, org: dict) -> dict:
+        admin_email = org.get("admin_email")
+        if admin_email is None:
+            # legacy document without the denormalized email: look it up once and backfill
+            admin = await self.admins.find_one({"_id": org.get("admin_id")}, {"email": 1})
+            admin_email = admin.get("email") if admin else None
+            if admin_email is not None:
+                await self.orgs.update_one({"_id": org.get("_id")}, {"$set": {"admin_email": admin_email}})
         return {
             "organization_name": org.get("organization_name"),
             "collection_name": org.get("collection_name"),
-            "admin_email": admin.get("email") if admin else None,
+            "admin_email": admin_email,
             "created_at": org.get("created_at")
         }
 
+    def iter_organizations(self, sort: str = "organization_name", after: Optional[str] = None,
+                           fields: Optional[List[str]] = None, limit: Optional[int] = None):
+        """Return a Motor cursor over organizations in keyset order, starting after `after`.
+
+        Documents carry the requested `fields` plus the sort key(s) needed to build
+        the next cursor (see `organization_cursor`).
+        """
+        if sort not in LIST_SORTS:
+            raise BadRequest(f"sort must be one of: {', '.join(LIST_SORTS)}")
+        fields = fields or list(ORG_RESPONSE_FIELDS)
+        unknown = [f for f in fields if f not in ORG_RESPONSE_FIELDS]
+        if unknown:
+            raise BadRequest(f"unknown fields: {', '.join(unknown)}")
+        projection = {f: 1 for f in fields}
+        projection.update({f: 1 for f, _ in LIST_SORTS[sort]})
+        # list_item needs the id to tell whose admin_email may be shown
+        projection.setdefault("_id", 1 if "admin_email" in fields else 0)
+        cursor = self.orgs.find(_cursor_filter(sort, after), projection).sort(LIST_SORTS[sort])
+        if limit:
+            cursor = cursor.limit(limit)
+        return cursor
+
+    @staticmethod
+    def organization_cursor(sort: str, doc: dict) -> str:
+        return _encode_cursor(sort, doc)
+
+    @staticmethod
+    def list_item(doc: dict, fields: List[str], admin_email_for: Optional[str] = None) -> dict:
+        """One listed organization; with `admin_email_for` (an org id), only that organization's row has admin_email."""
+        if admin_email_for is not None and str(doc.get("_id")) != admin_email_for:
+            return {f: doc.get(f) for f in fields if f != "admin_email"}
+        return {f: doc.get(f) for f in fields}
+
+    async def list_organizations(self, sort: str = "organization_name", after: Optional[str] = None,
+                                 fields: Optional[List[str]] = None, limit: int = 100,
+                                 admin_email_for: Optional[str] = None) -> dict:
+        limit = max(1, min(limit, LIST_MAX_LIMIT))
+        # fetch one extra row to know whether another page exists
+        docs = await guarded_call(lambda: self.iter_organizations(sort, after, fields, limit + 1).to_list(length=limit + 1),
+                                  retry=True)
+        next_cursor = _encode_cursor(sort, docs[limit - 1]) if len(docs) > limit else None
+        wanted = fields or list(ORG_RESPONSE_FIELDS)
+        items = [self.list_item(d, wanted, admin_email_for) for d in docs[:limit]]
+        return {"items": items, "next_cursor": next_cursor}
+
     async def update_organization(self, organization_name: str, new_organization_name: Optional[str] = None,
-                                  email: Optional[str] = None, password: Optional[str] = None) -> dict:
+                                  email: Optional[str] = None, password: Optional[str] = None,
+                                  org_id: Optional[str] = None) -> dict:
+        """Apply an update; `org_id` (from the caller's token) must match the organization if given."""
+        try:
+            return await self._update_organization(organization_name, new_organization_name, email, password, org_id)
+        finally:
+            # drop both names even when the update failed partway through
+            invalidate_organization(organization_name, new_organization_name)
+
+    async def _update_organization(self, organization_name: str, new_organization_name: Optional[str],
+                                   email: Optional[str], password: Optional[str], org_id: Optional[str]) -> dict:
         org = await self.orgs.find_one({"organization_name": organization_name})
         if not org:
             raise NotFound("organization does not exist")
+        _check_org_id(org, org_id)
 
         updates = {}
         if new_organization_name:
             # ensure new name not used
             if await self.orgs.find_one({"organization_name": new_organization_name}):
                 raise Conflict("new organization name already exists")
-
-            old_collection = org.get("collection_name")
-            new_collection = f"org_{new_organization_name}"
-
-            # Prefer a rename which preserves _id and indexes. If rename is not possible, fall back to copy.
-            try:
-                # ensure old collection exists
-                existing = await self.db.list_collection_names()
-                if old_collection not in existing:
-                    await self.db.create_collection(new_collection)
-                else:
-                    col: AsyncIOMotorCollection = self.db[old_collection]
-                    await col.rename(new_collection)
-            except OperationFailure:
-                old_col = self.db[old_collection]
-                new_col = self.db[new_collection]
-                cursor = old_col.find({})
-                docs = []
-                async for d in cursor:
-                    docs.append(d)
-                if docs:
-                    try:
-                        await new_col.insert_many(docs)
-                    except DuplicateKeyError:
-                        for d in docs:
-                            d.pop("_id", None)
-                        await new_col.insert_many(docs)
-                await old_col.drop()
-
-            updates["collection_name"] = new_collection
-            updates["organization_name"] = new_organization_name
-
-            # update admin reference(s)
-            await self.admins.update_many({"organization_name": organization_name}, {"$set": {"organization_name": new_organization_name}})
+            updates.update(await self._move_tenant(org, new_organization_name))
 
         if email or password:
             admin_id = org.get("admin_id")
@@ -134,15 +430,15 @@ class OrganizationService:
             if email:
                 set_fields["email"] = email
             if password:
-                if not validate_password_strength(password):
-                    raise BadRequest("password does not meet strength requirements")
-                try:
-                    ensure_bcrypt_compatible_password(password)
-                except ValueError as e:
-                    raise BadRequest(str(e))
-                set_fields["password"] = hash_password(password)
+                set_fields["password"] = await self._hash_new_password(password)
             if set_fields:
                 await self.admins.update_one({"_id": admin_id}, {"$set": set_fields})
+            if password:
+                # tokens issued under the old password stop working on every replica
+                await self.revocations.revoke_admin(str(admin_id))
+            if email:
+                # keep the denormalized copy on the organization in sync
+                updates["admin_email"] = email
 
         if updates:
             try:
@@ -150,24 +446,81 @@ class OrganizationService:
             except Exception:
                 raise InternalError("failed to update organization metadata")
 
-        new_name = new_organization_name or organization_name
-        return await self.get_organization(new_name)
+        # build the response from the document already in hand instead of reading it back
+        org.update(updates)
+        return await self._to_response(org)
+
+    async def _move_tenant(self, org: dict, new_organization_name: str,
+                           on_progress: Optional[ProgressCallback] = None) -> dict:
+        """Move the tenant's data and admin references to the new name; returns the org fields to $set."""
+        organization_name = org.get("organization_name")
+        new_collection = await tenant_store_for(self.db, org).rename(org, new_organization_name, on_progress)
+
+        # update admin reference(s)
+        await self.admins.update_many({"organization_name": organization_name}, {"$set": {"organization_name": new_organization_name}})
+        return {"collection_name": new_collection, "organization_name": new_organization_name}
+
+    async def check_rename(self, organization_name: str, new_organization_name: str,
+                           org_id: Optional[str] = None) -> str:
+        """Validate a rename up front so a background job is only queued when it can succeed; returns the org id."""
+        checked_id = await self.check_exists(organization_name, org_id)
+        if await self.orgs.find_one({"organization_name": new_organization_name}, {"_id": 1}):
+            raise Conflict("new organization name already exists")
+        return checked_id
 
-    async def delete_organization(self, organization_name: str, requesting_admin_email: str):
+    async def rename_organization(self, organization_name: str, new_organization_name: str,
+                                  on_progress: Optional[ProgressCallback] = None,
+                                  org_id: Optional[str] = None) -> dict:
+        """Rename an organization and its tenant collection (the body of a rename job)."""
+        try:
+            org = await self.orgs.find_one(_job_filter(organization_name, org_id))
+            if not org:
+                raise NotFound("organization does not exist")
+            if org.get("organization_name") == new_organization_name:
+                # an earlier attempt of this job already finished the rename
+                return await self._to_response(org)
+            if await self.orgs.find_one({"organization_name": new_organization_name}, {"_id": 1}):
+                raise Conflict("new organization name already exists")
+            organization_name = org.get("organization_name")
+            updates = await self._move_tenant(org, new_organization_name, on_progress)
+            try:
+                await self.orgs.update_one({"_id": org.get("_id")}, {"$set": updates})
+            except DuplicateKeyError:
+                raise Conflict("new organization name already exists")
+            org.update(updates)
+            return await self._to_response(org)
+        finally:
+            invalidate_organization(organization_name, new_organization_name)
+
+    async def check_exists(self, organization_name: str, org_id: Optional[str] = None) -> str:
+        """Raise NotFound (or Forbidden for a mismatched `org_id`) before queuing a job; returns the org id."""
+        org = await self.orgs.find_one({"organization_name": organization_name}, {"_id": 1})
+        if not org:
+            raise NotFound("organization does not exist")
+        _check_org_id(org, org_id)
+        return str(org["_id"])
+
+    async def delete_organization(self, organization_name: str, org_id: Optional[str] = None):
+        """Delete an organization; callers authorize the admin (see app.dependencies.require_org_admin)."""
         org = await self.orgs.find_one({"organization_name": organization_name})
         if not org:
             raise NotFound("organization does not exist")
-        admin = await self.admins.find_one({"_id": org.get("admin_id")})
-        if not admin or admin.get("email") != requesting_admin_email:
-            raise Forbidden("only the org admin can delete the organization")
+        _check_org_id(org, org_id)
+        return await self._delete(org)
 
-        collection_name = org.get("collection_name")
-        try:
-            await self.db[collection_name].drop()
-        except Exception:
-            pass
+    async def purge_organization(self, organization_name: str, org_id: Optional[str] = None) -> dict:
+        """Delete an already-authorized organization (the body of a delete job)."""
+        org = await self.orgs.find_one(_job_filter(organization_name, org_id))
+        if not org:
+            raise NotFound("organization does not exist")
+        return await self._delete(org)
+
+    async def _delete(self, org: dict) -> dict:
+        organization_name = org.get("organization_name")
+        await tenant_store_for(self.db, org).drop(org)
 
         await self.admins.delete_many({"organization_name": organization_name})
         await self.orgs.delete_one({"_id": org.get("_id")})
+        invalidate_organization(organization_name)
 
         return {"deleted": True, "organization_name": organization_name}
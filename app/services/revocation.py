@@ -0,0 +1,218 @@
+import asyncio
+import logging
+import os
+import time
+from datetime import datetime, timedelta
+from typing import Dict, Optional, Tuple
+
+from app.database import get_master_db
+from app.errors import BadRequest
+from app.utils.bloom import BloomFilter
+from app.utils.resilience import guarded
+from app.utils.security import ACCESS_TOKEN_EXPIRE_MINUTES, TokenClaims, token_cache
+
+logger = logging.getLogger(__name__)
+
+# Token revocation. master_db.revoked_tokens holds one document per logged-out token
+# (_id = jti) and one per admin whose tokens were all revoked (_id = "admin:<id>";
+# tokens issued before `revoked_before` are rejected). Every replica mirrors it in
+# memory, so checking a token never costs a round trip: revoked jtis sit in an exact
+# set behind a Bloom filter, admins in a dict of cutoffs. A background task pulls
+# documents changed since its last pull every REVOCATION_SYNC_INTERVAL seconds; a TTL
+# index removes documents once every token they cover has expired anyway.
+REVOCATION_SYNC_INTERVAL = float(os.getenv("REVOCATION_SYNC_INTERVAL", "2"))
+REVOCATION_BLOOM_CAPACITY = int(os.getenv("REVOCATION_BLOOM_CAPACITY", "100000"))
+REVOCATION_BLOOM_FP_RATE = float(os.getenv("REVOCATION_BLOOM_FP_RATE", "0.001"))
+
+# each pull re-reads this much before the previous high-water mark, covering writes
+# that became visible out of timestamp order
+_SYNC_OVERLAP = timedelta(seconds=5)
+_PRUNE_INTERVAL = 60.0
+TOKEN_LIFETIME_SECONDS = ACCESS_TOKEN_EXPIRE_MINUTES * 60
+
+
+class RevocationList:
+    """In-memory mirror of revoked_tokens (event loop only)."""
+
+    def __init__(self, capacity: int = REVOCATION_BLOOM_CAPACITY, fp_rate: float = REVOCATION_BLOOM_FP_RATE):
+        self.capacity = capacity
+        self.fp_rate = fp_rate
+        self._tokens: Dict[str, float] = {}  # jti -> token expiry (epoch seconds)
+        self._admins: Dict[str, Tuple[float, float]] = {}  # admin id -> (revoked_before, expiry)
+        self._bloom_capacity = capacity
+        self._bloom = BloomFilter.for_capacity(capacity, fp_rate)
+        self._next_prune = time.time() + _PRUNE_INTERVAL
+        self.checks = 0
+        self.rejected = 0
+        self.false_positives = 0
+
+    def add_token(self, jti: str, expires_at: float) -> None:
+        if jti in self._tokens:
+            return
+        self._tokens[jti] = expires_at
+        if len(self._tokens) > self._bloom_capacity:
+            self._rebuild()
+        else:
+            self._bloom.add(jti)
+
+    def add_admin(self, admin_id: str, revoked_before: float, expires_at: float) -> None:
+        current = self._admins.get(admin_id)
+        if current is None or revoked_before > current[0]:
+            self._admins[admin_id] = (revoked_before, expires_at)
+
+    def is_revoked(self, claims: TokenClaims) -> bool:
+        self.checks += 1
+        cutoff = self._admins.get(claims.admin_id) if self._admins else None
+        # tokens issued before jti/iat existed have no iat: any cutoff revokes them
+        if cutoff is not None and (claims.iat or 0) < cutoff[0]:
+            self.rejected += 1
+            return True
+        jti = claims.jti
+        if jti and self._tokens and jti in self._bloom:
+            if jti in self._tokens:
+                self.rejected += 1
+                return True
+            self.false_positives += 1
+        return False
+
+    def prune(self, now: Optional[float] = None) -> None:
+        """Forget entries whose tokens have expired and rebuild the filter without them."""
+        now = time.time() if now is None else now
+        if now < self._next_prune:
+            return
+        self._next_prune = now + _PRUNE_INTERVAL
+        expired = [jti for jti, exp in self._tokens.items() if exp <= now]
+        for jti in expired:
+            del self._tokens[jti]
+        for admin_id in [a for a, (_, exp) in self._admins.items() if exp <= now]:
+            del self._admins[admin_id]
+        if expired:
+            self._rebuild()
+
+    def _rebuild(self) -> None:
+        # Bloom filters can't delete; size the new one with headroom for growth
+        self._bloom_capacity = max(self.capacity, 2 * len(self._tokens))
+        self._bloom = BloomFilter.for_capacity(self._bloom_capacity, self.fp_rate)
+        for jti in self._tokens:
+            self._bloom.add(jti)
+
+    def clear(self) -> None:
+        self._tokens.clear()
+        self._admins.clear()
+        self._rebuild()
+
+    def stats(self) -> dict:
+        return {
+            "tokens": len(self._tokens),
+            "admins": len(self._admins),
+            "bloom_bytes": self._bloom.size_bytes,
+            "bloom_hashes": self._bloom.num_hashes,
+            "checks": self.checks,
+            "rejected": self.rejected,
+            "bloom_false_positives": self.false_positives,
+        }
+
+
+revocation_list = RevocationList()
+
+
+def _epoch(value: datetime) -> float:
+    return (value - datetime(1970, 1, 1)).total_seconds()
+
+
+class RevocationService:
+    """Writes revocations to master_db and applies them to this replica's RevocationList."""
+
+    def __init__(self, db=None, revocations: RevocationList = revocation_list):
+        self.db = db if db is not None else get_master_db()
+        self.collection = guarded(self.db.revoked_tokens)
+        self.revocations = revocations
+        self._synced_until: Optional[datetime] = None
+
+    async def revoke_token(self, claims: TokenClaims) -> None:
+        if not claims.jti:
+            raise BadRequest("token has no id; use /admin/revoke_all to revoke it")
+        expires_at = float(claims.exp) if claims.exp is not None else time.time() + TOKEN_LIFETIME_SECONDS
+        await self.collection.update_one(
+            {"_id": claims.jti},
+            {"$set": {"kind": "token", "admin_id": claims.admin_id, "expires_at": datetime.utcfromtimestamp(expires_at)},
+             "$currentDate": {"updated_at": True}},
+            upsert=True,
+        )
+        self.revocations.add_token(claims.jti, expires_at)
+
+    async def revoke_admin(self, admin_id: str, before: Optional[float] = None) -> float:
+        """Revoke every token of `admin_id` issued before `before` (default: now); returns the cutoff."""
+        before = time.time() if before is None else before
+        expires_at = before + TOKEN_LIFETIME_SECONDS
+        await self.collection.update_one(
+            {"_id": f"admin:{admin_id}"},
+            {"$set": {"kind": "admin", "admin_id": admin_id},
+             "$max": {"revoked_before": before, "expires_at": datetime.utcfromtimestamp(expires_at)},
+             "$currentDate": {"updated_at": True}},
+            upsert=True,
+        )
+        self.revocations.add_admin(admin_id, before, expires_at)
+        token_cache.invalidate_tag(admin_id)
+        return before
+
+    def _apply(self, doc: dict) -> None:
+        expires_at = _epoch(doc["expires_at"])
+        if doc.get("kind") == "admin":
+            self.revocations.add_admin(doc["admin_id"], doc["revoked_before"], expires_at)
+        else:
+            self.revocations.add_token(doc["_id"], expires_at)
+
+    async def refresh(self) -> int:
+        """Pull documents changed since the previous pull (everything unexpired on the first); returns the count."""
+        if self._synced_until is None:
+            query = {"expires_at": {"$gt": datetime.utcnow()}}
+        else:
+            query = {"updated_at": {"$gte": self._synced_until - _SYNC_OVERLAP}}
+        newest = self._synced_until
+        count = 0
+        async for doc in self.db.revoked_tokens.find(query):
+            self._apply(doc)
+            count += 1
+            updated_at = doc.get("updated_at")
+            if updated_at is not None and (newest is None or updated_at > newest):
+                newest = updated_at
+        self._synced_until = newest or datetime.utcnow()
+        self.revocations.prune()
+        return count
+
+
+class RevocationSync:
+    """Background task refreshing the local RevocationList from master_db (the first,
+    full load is done by the app's startup preparation)."""
+
+    def __init__(self, service: RevocationService, interval: float = REVOCATION_SYNC_INTERVAL):
+        self.service = service
+        self.interval = interval
+        self.pulls = 0
+        self.last_pull: Optional[float] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run(), name="revocation-sync")
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.service.refresh()
+                self.pulls += 1
+                self.last_pull = time.time()
+            except Exception as e:
+                logger.warning("revocation sync failed: %s", e)
+
+    def stats(self) -> dict:
+        return {"interval_seconds": self.interval, "pulls": self.pulls, "last_pull": self.last_pull,
+                **self.service.revocations.stats()}
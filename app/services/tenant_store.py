@@ -0,0 +1,234 @@
+import os
+from abc import ABC, abstractmethod
+from typing import Optional
+
+from bson.codec_options import CodecOptions
+from bson.raw_bson import RawBSONDocument
+from motor.motor_asyncio import AsyncIOMotorCollection
+from pymongo.errors import BulkWriteError, CollectionInvalid, OperationFailure
+
+from app.services.collection_copy import COPY_BATCH_SIZE, ProgressCallback, copy_collection
+
+# Tenancy layout for new organizations:
+#   "collection" (default): one `org_<name>` collection per organization
+#   "shared": every organization's documents live in TENANT_SHARED_COLLECTION,
+#             partitioned by a `tenant_id` field (the organization's _id)
+# Existing organizations keep the layout recorded in their `collection_name`, so both
+# layouts can coexist while scripts/migrate_tenancy.py moves tenants between them.
+TENANCY_MODE = os.getenv("TENANCY_MODE", "collection")
+TENANT_SHARED_COLLECTION = os.getenv("TENANT_SHARED_COLLECTION", "tenant_data")
+
+# server error code returned when renaming a collection that does not exist
+NAMESPACE_NOT_FOUND = 26
+
+
+class TenantCollection:
+    """A view of one tenant's documents; every operation is scoped to that tenant."""
+
+    def __init__(self, collection: AsyncIOMotorCollection, tenant_filter: dict):
+        self.collection = collection
+        self.tenant_filter = tenant_filter
+
+    def _scope(self, filter: Optional[dict]) -> dict:
+        return {**(filter or {}), **self.tenant_filter}
+
+    def find(self, filter: Optional[dict] = None, *args, **kwargs):
+        return self.collection.find(self._scope(filter), *args, **kwargs)
+
+    async def find_one(self, filter: Optional[dict] = None, *args, **kwargs):
+        return await self.collection.find_one(self._scope(filter), *args, **kwargs)
+
+    async def insert_one(self, doc: dict, **kwargs):
+        return await self.collection.insert_one({**doc, **self.tenant_filter}, **kwargs)
+
+    async def insert_many(self, docs, **kwargs):
+        return await self.collection.insert_many([{**d, **self.tenant_filter} for d in docs], **kwargs)
+
+    async def update_many(self, filter: dict, update: dict, **kwargs):
+        return await self.collection.update_many(self._scope(filter), update, **kwargs)
+
+    async def delete_many(self, filter: Optional[dict] = None, **kwargs):
+        return await self.collection.delete_many(self._scope(filter), **kwargs)
+
+    async def count_documents(self, filter: Optional[dict] = None, **kwargs) -> int:
+        return await self.collection.count_documents(self._scope(filter), **kwargs)
+
+
+class TenantStore(ABC):
+    """Where and how an organization's documents are stored."""
+
+    mode = ""
+
+    def __init__(self, db):
+        self.db = db
+
+    @abstractmethod
+    def collection_name(self, organization_name: str) -> str:
+        ...
+
+    @abstractmethod
+    def data(self, org: dict) -> TenantCollection:
+        ...
+
+    async def provision(self, organization_name: str) -> None:
+        """Prepare storage for a new organization (best effort)."""
+
+    @abstractmethod
+    async def rename(self, org: dict, new_organization_name: str,
+                     on_progress: Optional[ProgressCallback] = None) -> str:
+        """Move a tenant's data for a rename; returns the new collection_name."""
+
+    @abstractmethod
+    async def drop(self, org: dict) -> None:
+        ...
+
+
+class CollectionPerTenantStore(TenantStore):
+    mode = "collection"
+
+    def collection_name(self, organization_name: str) -> str:
+        return f"org_{organization_name}"
+
+    def data(self, org: dict) -> TenantCollection:
+        return TenantCollection(self.db[org["collection_name"]], {})
+
+    async def provision(self, organization_name: str) -> None:
+        # create the empty collection directly instead of listing every collection first;
+        # CollectionInvalid (NamespaceExists) means a leftover collection is reused, and
+        # any other failure is non-fatal because MongoDB creates it on first write
+        try:
+            await self.db.create_collection(self.collection_name(organization_name))
+        except Exception:
+            pass
+
+    async def rename(self, org: dict, new_organization_name: str,
+                     on_progress: Optional[ProgressCallback] = None) -> str:
+        old_collection = org.get("collection_name")
+        new_collection = self.collection_name(new_organization_name)
+        # Prefer a rename which preserves _id and indexes. If rename is not possible, fall back to copy.
+        # The server reports a missing source collection itself, so no collection listing is needed.
+        try:
+            col: AsyncIOMotorCollection = self.db[old_collection]
+            await col.rename(new_collection)
+        except OperationFailure as e:
+            if e.code == NAMESPACE_NOT_FOUND:
+                try:
+                    await self.db.create_collection(new_collection)
+                except CollectionInvalid:
+                    pass
+            else:
+                # streamed in bounded raw-BSON batches so large tenants don't have to fit in memory
+                await copy_collection(self.db, old_collection, new_collection, on_progress)
+                await self.db[old_collection].drop()
+        return new_collection
+
+    async def drop(self, org: dict) -> None:
+        try:
+            await self.db[org.get("collection_name")].drop()
+        except Exception:
+            pass
+
+
+class SharedCollectionStore(TenantStore):
+    mode = "shared"
+
+    def collection_name(self, organization_name: str) -> str:
+        return TENANT_SHARED_COLLECTION
+
+    def data(self, org: dict) -> TenantCollection:
+        return TenantCollection(self.db[TENANT_SHARED_COLLECTION], {"tenant_id": org["_id"]})
+
+    async def rename(self, org: dict, new_organization_name: str,
+                     on_progress: Optional[ProgressCallback] = None) -> str:
+        # tenant_id is the organization's _id, so a rename is metadata only
+        return TENANT_SHARED_COLLECTION
+
+    async def drop(self, org: dict) -> None:
+        await self.data(org).delete_many({})
+
+
+async def ensure_tenant_indexes(db, mode: str = TENANCY_MODE) -> None:
+    """Compound indexes for the shared layout: every tenant query leads with tenant_id.
+
+    Nothing to do in collection mode; tenants moved to the shared layout get the
+    index from scripts/migrate_tenancy.py.
+    """
+    if mode != "shared":
+        return
+    await db[TENANT_SHARED_COLLECTION].create_index([("tenant_id", 1), ("_id", 1)])
+
+
+def tenant_store(db, mode: str = TENANCY_MODE) -> TenantStore:
+    """Store used for new organizations."""
+    if mode == "shared":
+        return SharedCollectionStore(db)
+    if mode == "collection":
+        return CollectionPerTenantStore(db)
+    raise ValueError(f"unknown TENANCY_MODE {mode!r} (expected 'collection' or 'shared')")
+
+
+def tenant_store_for(db, org: dict) -> TenantStore:
+    """Store that currently holds an existing organization's data."""
+    if org.get("collection_name") == TENANT_SHARED_COLLECTION:
+        return SharedCollectionStore(db)
+    return CollectionPerTenantStore(db)
+
+
+async def migrate_tenant(db, org: dict, target: TenantStore, batch_size: int = COPY_BATCH_SIZE,
+                         on_progress: Optional[ProgressCallback] = None) -> int:
+    """Move one organization's documents into the `target` layout; returns documents moved.
+
+    Documents are copied in batches (keeping their _id), the organization's
+    collection_name is switched, and only then is the old data removed, so an
+    interrupted run can simply be repeated. Writes to the tenant should be paused
+    while it is migrated.
+    """
+    source = tenant_store_for(db, org)
+    if source.mode == target.mode:
+        return 0
+    src = source.data(org)
+    dst = target.data({**org, "collection_name": target.collection_name(org["organization_name"])})
+    raw = CodecOptions(document_class=RawBSONDocument)
+    moved = 0
+    batch = []
+
+    async def flush() -> None:
+        nonlocal moved, batch
+        docs = [_retenant(d, dst.tenant_filter) for d in batch]
+        try:
+            await dst.collection.insert_many(docs, ordered=False)
+        except BulkWriteError as e:
+            # documents already copied by an earlier, interrupted run
+            if any(err.get("code") != 11000 for err in e.details.get("writeErrors", [])):
+                raise
+        moved += len(batch)
+        batch = []
+        if on_progress is not None:
+            await on_progress(moved)
+
+    if target.mode == "collection":
+        await target.provision(org["organization_name"])
+    async for doc in src.collection.with_options(codec_options=raw).find(src.tenant_filter, batch_size=batch_size):
+        batch.append(doc)
+        if len(batch) >= batch_size:
+            await flush()
+    if batch:
+        await flush()
+
+    # duplicates are skipped above, so make sure they really were this tenant's documents
+    # (e.g. not a foreign _id collision in the shared collection) before switching over
+    expected = await src.count_documents({})
+    copied = await dst.count_documents({})
+    if copied != expected:
+        raise RuntimeError(f"migration of {org['organization_name']!r} copied {copied} of {expected} documents; source left in place")
+
+    await db.organizations.update_one({"_id": org["_id"]}, {"$set": {"collection_name": dst.collection.name}})
+    await source.drop(org)
+    return moved
+
+
+def _retenant(raw_doc: RawBSONDocument, tenant_filter: dict) -> dict:
+    doc = dict(raw_doc)
+    doc.pop("tenant_id", None)
+    doc.update(tenant_filter)
+    return doc
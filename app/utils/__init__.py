@@ -1,4 +1,4 @@
-from .security import hash_password, verify_password, create_access_token, decode_token
-from .validators import validate_password_strength
+from .security import hash_password, verify_password, hash_password_async, verify_password_async, create_access_token, decode_token
+from .validators import validate_password_strength, is_breached_password
 
-__all__ = ["hash_password", "verify_password", "create_access_token", "decode_token", "validate_password_strength"]
+__all__ = ["hash_password", "verify_password", "hash_password_async", "verify_password_async", "create_access_token", "decode_token", "validate_password_strength", "is_breached_password"]
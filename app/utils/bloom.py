@@ -0,0 +1,51 @@
+import hashlib
+import math
+from typing import Optional, Union
+
+
+def _as_bytes(item: Union[str, bytes]) -> bytes:
+    return item.encode("utf-8") if isinstance(item, str) else item
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter: no false negatives, false positives at a configurable rate.
+
+    The k bit positions come from one blake2b digest split into two 64-bit halves
+    (double hashing), so a lookup costs one hash regardless of k. `bits` can be any
+    writable buffer of `ceil(num_bits / 8)` bytes (a bytearray by default).
+    """
+
+    def __init__(self, num_bits: int, num_hashes: int, bits: Optional[bytearray] = None):
+        self.num_bits = max(8, num_bits)
+        self.num_hashes = max(1, num_hashes)
+        self.bits = bits if bits is not None else bytearray((self.num_bits + 7) // 8)
+        self.count = 0
+
+    @classmethod
+    def for_capacity(cls, capacity: int, fp_rate: float) -> "BloomFilter":
+        """Size the filter for `capacity` items at false positive rate `fp_rate`."""
+        capacity = max(1, capacity)
+        num_bits = math.ceil(-capacity * math.log(fp_rate) / math.log(2) ** 2)
+        num_hashes = round(num_bits / capacity * math.log(2))
+        return cls(num_bits, num_hashes)
+
+    def _positions(self, item: Union[str, bytes]):
+        digest = hashlib.blake2b(_as_bytes(item), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        m = self.num_bits
+        return [(h1 + i * h2) % m for i in range(self.num_hashes)]
+
+    def add(self, item: Union[str, bytes]) -> None:
+        bits = self.bits
+        for pos in self._positions(item):
+            bits[pos >> 3] |= 1 << (pos & 7)
+        self.count += 1
+
+    def __contains__(self, item: Union[str, bytes]) -> bool:
+        bits = self.bits
+        return all(bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(item))
+
+    @property
+    def size_bytes(self) -> int:
+        return len(self.bits)
@@ -0,0 +1,95 @@
+import hashlib
+import mmap
+import os
+import struct
+import threading
+from typing import Optional
+
+from app.utils.bloom import BloomFilter
+
+# Known-breached passwords, as a prebuilt Bloom filter file (scripts/build_breached_bloom.py).
+# The file is memory-mapped read-only when the app starts (app.main), so every worker
+# process on a host shares one page-cache copy and only the pages a lookup touches are
+# ever read. Keys are SHA-1 digests of the UTF-8 password, so the filter can be built
+# straight from hash lists (e.g. Have I Been Pwned's SHA-1 dump) as well as from plain
+# passwords.
+# Unset (default) disables the check.
+BREACHED_PASSWORDS_BLOOM = os.getenv("BREACHED_PASSWORDS_BLOOM", "")
+
+# file layout: header, then the filter's bit array
+MAGIC = b"ORGBLOOM"
+_HEADER = struct.Struct("<8sQIQ")  # magic, num_bits, num_hashes, items added
+HEADER_SIZE = _HEADER.size
+
+
+def password_key(password: str) -> bytes:
+    return hashlib.sha1(password.encode("utf-8")).digest()
+
+
+def _bits_size(num_bits: int) -> int:
+    return (num_bits + 7) // 8
+
+
+class BreachedPasswordFilter:
+    """Read-only, memory-mapped view of a breached-password Bloom filter file."""
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(self._mmap) < HEADER_SIZE:
+            self._mmap.close()
+            raise ValueError(f"{path} is not a breached-password filter file")
+        magic, num_bits, num_hashes, count = _HEADER.unpack_from(self._mmap, 0)
+        if magic != MAGIC or len(self._mmap) < HEADER_SIZE + _bits_size(num_bits):
+            self._mmap.close()
+            raise ValueError(f"{path} is not a breached-password filter file")
+        self._bloom = BloomFilter(num_bits, num_hashes, memoryview(self._mmap)[HEADER_SIZE:])
+        self._bloom.count = count
+
+    def __contains__(self, password: str) -> bool:
+        return password_key(password) in self._bloom
+
+    def contains_key(self, key: bytes) -> bool:
+        return key in self._bloom
+
+    def stats(self) -> dict:
+        return {"path": self.path, "items": self._bloom.count, "size_bytes": self._bloom.size_bytes,
+                "hashes": self._bloom.num_hashes}
+
+
+def create_filter_file(path: str, capacity: int, fp_rate: float):
+    """Create a zero-filled filter file sized for `capacity` items; returns (BloomFilter, mmap).
+
+    The filter writes straight into the mapped file, so building one larger than RAM
+    only costs page cache. Call `finish_filter_file` when done.
+    """
+    sized = BloomFilter.for_capacity(capacity, fp_rate)
+    num_bits, num_hashes = sized.num_bits, sized.num_hashes
+    del sized
+    with open(path, "wb+") as f:
+        f.truncate(HEADER_SIZE + _bits_size(num_bits))
+        mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_WRITE)
+    _HEADER.pack_into(mm, 0, MAGIC, num_bits, num_hashes, 0)
+    return BloomFilter(num_bits, num_hashes, memoryview(mm)[HEADER_SIZE:]), mm
+
+
+def finish_filter_file(bloom: BloomFilter, mm: mmap.mmap) -> None:
+    _HEADER.pack_into(mm, 0, MAGIC, bloom.num_bits, bloom.num_hashes, bloom.count)
+    bloom.bits.release()
+    mm.flush()
+    mm.close()
+
+
+_filter: Optional[BreachedPasswordFilter] = None
+_lock = threading.Lock()
+
+
+def get_breached_filter() -> Optional[BreachedPasswordFilter]:
+    """The configured filter, opened on first use; None when BREACHED_PASSWORDS_BLOOM is unset."""
+    global _filter
+    if _filter is None and BREACHED_PASSWORDS_BLOOM:
+        with _lock:
+            if _filter is None:
+                _filter = BreachedPasswordFilter(BREACHED_PASSWORDS_BLOOM)
+    return _filter
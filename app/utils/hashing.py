@@ -0,0 +1,109 @@
+import asyncio
+import multiprocessing
+import os
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Optional
+
+from app.errors import ServiceUnavailable
+
+# bcrypt is CPU bound and releases the GIL, so a thread pool is enough for most
+# deployments. A process pool isolates the work completely at the cost of
+# pickling each call; pick it with HASH_EXECUTOR=process.
+HASH_EXECUTOR = os.getenv("HASH_EXECUTOR", "thread")
+HASH_POOL_WORKERS = int(os.getenv("HASH_POOL_WORKERS", str(min(4, os.cpu_count() or 1))))
+# maximum number of calls waiting for or running on the pool before new calls are shed
+HASH_POOL_MAX_QUEUE = int(os.getenv("HASH_POOL_MAX_QUEUE", "64"))
+
+
+class HashingExecutor:
+    """Bounded pool that runs password hashing off the event loop.
+
+    Calls beyond `max_queue` pending items are rejected immediately with
+    ServiceUnavailable instead of piling up behind the pool.
+    """
+
+    def __init__(self, kind: str = "thread", max_workers: int = 4, max_queue: int = 64):
+        if kind not in ("thread", "process"):
+            raise ValueError(f"unknown hash executor kind: {kind!r} (expected 'thread' or 'process')")
+        self.kind = kind
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self._pool: Optional[Executor] = None
+        self._pending = 0
+        self._calls = 0
+        self._rejected = 0
+        self._total_seconds = 0.0
+        self._max_seconds = 0.0
+        self._last_seconds = 0.0
+
+    def _get_pool(self) -> Executor:
+        if self._pool is None:
+            if self.kind == "process":
+                # spawn avoids forking a process that already runs an event loop and driver threads
+                ctx = multiprocessing.get_context("spawn")
+                self._pool = ProcessPoolExecutor(max_workers=self.max_workers, mp_context=ctx)
+            else:
+                self._pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="hashing")
+        return self._pool
+
+    async def run(self, fn: Callable[..., Any], *args: Any) -> Any:
+        if self._pending >= self.max_queue:
+            self._rejected += 1
+            raise ServiceUnavailable("password hashing capacity exhausted, retry shortly", retry_after=1)
+        loop = asyncio.get_running_loop()
+        started = time.perf_counter()
+        future = self._get_pool().submit(fn, *args)
+        self._pending += 1
+        # a cancelled caller doesn't stop a hash that is already running, so the slot is
+        # freed when the work finishes (or is cancelled before starting), not when the caller leaves
+        def done(_):
+            if not loop.is_closed():
+                loop.call_soon_threadsafe(self._finished, started)
+
+        future.add_done_callback(done)
+        return await asyncio.wrap_future(future)
+
+    def _finished(self, started: float) -> None:
+        elapsed = time.perf_counter() - started
+        self._pending -= 1
+        self._calls += 1
+        self._total_seconds += elapsed
+        self._last_seconds = elapsed
+        if elapsed > self._max_seconds:
+            self._max_seconds = elapsed
+
+    def stats(self) -> dict:
+        return {
+            "kind": self.kind,
+            "max_workers": self.max_workers,
+            "max_queue": self.max_queue,
+            "pending": self._pending,
+            "calls": self._calls,
+            "rejected": self._rejected,
+            "avg_seconds": (self._total_seconds / self._calls) if self._calls else 0.0,
+            "max_seconds": self._max_seconds,
+            "last_seconds": self._last_seconds,
+        }
+
+    def shutdown(self, wait: bool = True) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=wait)
+            self._pool = None
+
+
+_executor: Optional[HashingExecutor] = None
+
+
+def get_hashing_executor() -> HashingExecutor:
+    global _executor
+    if _executor is None:
+        _executor = HashingExecutor(HASH_EXECUTOR, HASH_POOL_WORKERS, HASH_POOL_MAX_QUEUE)
+    return _executor
+
+
+def shutdown_hashing_executor() -> None:
+    global _executor
+    if _executor is not None:
+        _executor.shutdown()
+        _executor = None
@@ -0,0 +1,195 @@
+import asyncio
+import ipaddress
+import math
+import os
+import time
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, List, Optional, Union
+
+from fastapi import Request
+
+from app.errors import TooManyRequests
+
+# Admission control for bcrypt-bound routes (login, create, update with a password).
+# Concurrency: at most HASH_ADMISSION_MAX_CONCURRENT requests hash at once and at most
+# HASH_ADMISSION_MAX_WAITING wait for a slot; anything beyond that is rejected immediately.
+HASH_ADMISSION_MAX_CONCURRENT = int(os.getenv("HASH_ADMISSION_MAX_CONCURRENT", "8"))
+HASH_ADMISSION_MAX_WAITING = int(os.getenv("HASH_ADMISSION_MAX_WAITING", "16"))
+# Token buckets: sustained rate (tokens per second) and burst size, per client IP and per email.
+HASH_IP_RATE = float(os.getenv("HASH_IP_RATE", "5"))
+HASH_IP_BURST = float(os.getenv("HASH_IP_BURST", "10"))
+HASH_EMAIL_RATE = float(os.getenv("HASH_EMAIL_RATE", "0.2"))
+HASH_EMAIL_BURST = float(os.getenv("HASH_EMAIL_BURST", "5"))
+# upper bound on tracked keys per bucket set; least recently seen keys are dropped first
+HASH_RATE_MAX_KEYS = int(os.getenv("HASH_RATE_MAX_KEYS", "10000"))
+# Reverse proxies (comma-separated addresses or CIDRs) whose X-Forwarded-For is believed
+# when keying the per-IP buckets. Unset (default) trusts no header: the socket peer is the
+# client. Not needed when uvicorn already rewrites the peer (--proxy-headers --forwarded-allow-ips).
+TRUSTED_PROXIES = os.getenv("TRUSTED_PROXIES", "")
+
+
+def _parse_networks(value: str) -> List[Union[ipaddress.IPv4Network, ipaddress.IPv6Network]]:
+    return [ipaddress.ip_network(part.strip(), strict=False) for part in value.split(",") if part.strip()]
+
+
+_trusted_networks = _parse_networks(TRUSTED_PROXIES)
+
+
+def _is_trusted_proxy(address: str) -> bool:
+    try:
+        ip = ipaddress.ip_address(address)
+    except ValueError:
+        return False
+    return any(ip in network for network in _trusted_networks)
+
+
+def client_ip(request: Request) -> Optional[str]:
+    """The address to rate-limit `request` by.
+
+    When the peer is a trusted proxy, X-Forwarded-For is walked from the right and the
+    first hop that isn't a trusted proxy wins; hops further left are client-supplied.
+    """
+    peer = request.client.host if request.client else None
+    if not peer or not _trusted_networks or not _is_trusted_proxy(peer):
+        return peer
+    hops = [hop.strip() for header in request.headers.getlist("x-forwarded-for")
+            for hop in header.split(",") if hop.strip()]
+    for hop in reversed(hops):
+        if not _is_trusted_proxy(hop):
+            return hop
+    return hops[0] if hops else peer
+
+
+class TokenBucket:
+    __slots__ = ("rate", "capacity", "tokens", "updated")
+
+    def __init__(self, rate: float, capacity: float, now: float):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = now
+
+    def take(self, now: float, cost: float = 1) -> float:
+        """Consume `cost` tokens. Returns 0 on success, else seconds until they are available.
+
+        A cost above the burst size is admitted from a full bucket and leaves it in debt,
+        so a large batch is paid for by the requests that follow it.
+        """
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        needed = min(cost, self.capacity)
+        if self.tokens >= needed:
+            self.tokens -= cost
+            return 0.0
+        if self.rate <= 0:
+            return math.inf
+        return (needed - self.tokens) / self.rate
+
+
+class KeyedTokenBuckets:
+    """One token bucket per key, bounded to `max_keys` with LRU eviction."""
+
+    def __init__(self, rate: float, burst: float, max_keys: int = 10000):
+        self.rate = rate
+        self.burst = burst
+        self.max_keys = max_keys
+        self._buckets: "OrderedDict[str, TokenBucket]" = OrderedDict()
+        self.rejected = 0
+
+    def take(self, key: str, now: Optional[float] = None, cost: float = 1) -> float:
+        now = time.monotonic() if now is None else now
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = TokenBucket(self.rate, self.burst, now)
+            self._buckets[key] = bucket
+            if len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+        else:
+            self._buckets.move_to_end(key)
+        wait = bucket.take(now, cost)
+        if wait:
+            self.rejected += 1
+        return wait
+
+    def stats(self) -> dict:
+        return {"rate": self.rate, "burst": self.burst, "keys": len(self._buckets), "rejected": self.rejected}
+
+
+class HashAdmission:
+    """Admission control for requests that spend bcrypt work.
+
+    Requests are first charged against the per-IP and per-subject (email) buckets,
+    then take one of `max_concurrent` slots. Both checks fail fast with
+    TooManyRequests (429 + Retry-After) rather than queueing unboundedly.
+    """
+
+    def __init__(self, max_concurrent: int, max_waiting: int, ip_buckets: KeyedTokenBuckets,
+                 subject_buckets: KeyedTokenBuckets):
+        self.max_concurrent = max_concurrent
+        self.max_waiting = max_waiting
+        self.ip_buckets = ip_buckets
+        self.subject_buckets = subject_buckets
+        self._slots = asyncio.Semaphore(max_concurrent)
+        self._active = 0
+        self._waiting = 0
+        self._admitted = 0
+        self._rejected_concurrency = 0
+
+    def _check_buckets(self, ip: Optional[str], subject: Optional[str], cost: int) -> None:
+        now = time.monotonic()
+        if ip:
+            wait = self.ip_buckets.take(ip, now, cost)
+            if wait:
+                raise TooManyRequests("too many password attempts from this client", retry_after=math.ceil(wait))
+        if subject:
+            wait = self.subject_buckets.take(subject.lower(), now)
+            if wait:
+                raise TooManyRequests("too many password attempts for this account", retry_after=math.ceil(wait))
+
+    @asynccontextmanager
+    async def guard(self, ip: Optional[str], subject: Optional[str] = None, cost: int = 1) -> AsyncIterator[None]:
+        """Admit one request; `cost` is the number of passwords it hashes (charged to the IP bucket)."""
+        self._check_buckets(ip, subject, cost)
+        if self._slots.locked() and self._waiting >= self.max_waiting:
+            self._rejected_concurrency += 1
+            raise TooManyRequests("server is busy hashing passwords, retry shortly", retry_after=1)
+        self._waiting += 1
+        try:
+            await self._slots.acquire()
+        finally:
+            self._waiting -= 1
+        self._active += 1
+        self._admitted += 1
+        try:
+            yield
+        finally:
+            self._active -= 1
+            self._slots.release()
+
+    def stats(self) -> dict:
+        return {
+            "max_concurrent": self.max_concurrent,
+            "max_waiting": self.max_waiting,
+            "active": self._active,
+            "waiting": self._waiting,
+            "admitted": self._admitted,
+            "rejected_concurrency": self._rejected_concurrency,
+            "per_ip": self.ip_buckets.stats(),
+            "per_email": self.subject_buckets.stats(),
+        }
+
+
+_admission: Optional[HashAdmission] = None
+
+
+def get_hash_admission() -> HashAdmission:
+    global _admission
+    if _admission is None:
+        _admission = HashAdmission(
+            HASH_ADMISSION_MAX_CONCURRENT,
+            HASH_ADMISSION_MAX_WAITING,
+            KeyedTokenBuckets(HASH_IP_RATE, HASH_IP_BURST, HASH_RATE_MAX_KEYS),
+            KeyedTokenBuckets(HASH_EMAIL_RATE, HASH_EMAIL_BURST, HASH_RATE_MAX_KEYS),
+        )
+    return _admission
@@ -0,0 +1,273 @@
+import asyncio
+import contextvars
+import logging
+import math
+import os
+import random
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Optional, Tuple
+
+import pymongo
+from pymongo.errors import (ConnectionFailure, ExecutionTimeout, OperationFailure, PyMongoError,
+                            ServerSelectionTimeoutError)
+
+from app.errors import DeadlineExceeded, ServiceUnavailable
+from app.metrics import MONGO_BREAKER_TRANSITIONS, MONGO_RETRIES
+
+logger = logging.getLogger(__name__)
+
+# Guarded access to Mongo for the request path (OrganizationService, AuthService).
+# - Deadline: every HTTP request gets REQUEST_DEADLINE_MS; each database call runs
+#   under pymongo.timeout(<remaining budget>), so the driver bounds server selection,
+#   pool checkout and socket waits by it and sends maxTimeMS derived from it. A call
+#   made with the budget spent fails with 504 instead of queueing. 0 disables it.
+# - Retries: reads that fail with a transient error (reconnect, primary step-down,
+#   shutdown in progress) are retried up to MONGO_RETRY_ATTEMPTS more times with
+#   jittered exponential backoff while the budget allows. Writes are not retried
+#   here; the driver already retries them once when that is safe (retryWrites).
+# - Circuit breaker: MONGO_BREAKER_FAILURES consecutive unavailability errors open
+#   the circuit and further calls fail fast with 503 for MONGO_BREAKER_RESET_SECONDS;
+#   then a single probe call is let through (half-open) and closes it on success.
+#   A timeout only counts when the call had at least half the request budget or
+#   never found a server; one that merely ran out of what its request had left
+#   (e.g. after queueing behind a login burst) fails with 504 without counting.
+#   0 disables it. State and recent transitions are reported by GET /health.
+REQUEST_DEADLINE_MS = int(os.getenv("REQUEST_DEADLINE_MS", "10000"))
+MONGO_RETRY_ATTEMPTS = int(os.getenv("MONGO_RETRY_ATTEMPTS", "2"))
+MONGO_RETRY_BACKOFF_MS = float(os.getenv("MONGO_RETRY_BACKOFF_MS", "50"))
+MONGO_BREAKER_FAILURES = int(os.getenv("MONGO_BREAKER_FAILURES", "5"))
+MONGO_BREAKER_RESET_SECONDS = float(os.getenv("MONGO_BREAKER_RESET_SECONDS", "10"))
+
+# server error codes that mean "not available right now" (step-down, shutdown, network)
+_TRANSIENT_CODES = {6, 7, 89, 91, 189, 262, 9001, 10107, 11600, 11602, 13435, 13436}
+
+# (absolute time.monotonic() deadline, full budget in seconds) of the current request, if any
+_deadline: contextvars.ContextVar[Optional[Tuple[float, float]]] = contextvars.ContextVar(
+    "request_deadline", default=None)
+
+
+def remaining_budget() -> Optional[float]:
+    """Seconds left in the current request's budget, or None when it has none."""
+    deadline = _deadline.get()
+    return None if deadline is None else deadline[0] - time.monotonic()
+
+
+def set_deadline(seconds: Optional[float]) -> contextvars.Token:
+    return _deadline.set(None if seconds is None else (time.monotonic() + seconds, seconds))
+
+
+def reset_deadline(token: contextvars.Token) -> None:
+    _deadline.reset(token)
+
+
+class DeadlineMiddleware:
+    """ASGI middleware giving each HTTP request a budget of `budget_ms` for database calls."""
+
+    def __init__(self, app, budget_ms: int = REQUEST_DEADLINE_MS):
+        self.app = app
+        self.budget = budget_ms / 1000
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        token = set_deadline(self.budget)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            reset_deadline(token)
+
+
+def _is_unavailable(e: BaseException) -> bool:
+    """True for errors that say the database can't serve us (as opposed to rejecting the operation)."""
+    if isinstance(e, (ConnectionFailure, ExecutionTimeout)):
+        return True
+    if isinstance(e, OperationFailure) and e.code in _TRANSIENT_CODES:
+        return True
+    return isinstance(e, PyMongoError) and (e.timeout or e.has_error_label("RetryableWriteError"))
+
+
+def _is_budget_timeout(e: PyMongoError, remaining: Optional[float]) -> bool:
+    """True when a timeout says the request ran out of budget rather than the database being slow."""
+    deadline = _deadline.get()
+    if not e.timeout or remaining is None or deadline is None:
+        return False
+    if isinstance(e, ServerSelectionTimeoutError):
+        return False
+    return remaining < deadline[1] / 2
+
+
+class CircuitBreaker:
+    """Consecutive-failure circuit breaker (closed -> open -> half-open -> closed).
+
+    Not thread-safe; used from the event loop only.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, name: str, failure_threshold: int, reset_timeout: float, history: int = 20):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self.rejected = 0
+        self.transitions: deque = deque(maxlen=history)
+        self._probing = False
+
+    @property
+    def enabled(self) -> bool:
+        return self.failure_threshold > 0
+
+    def _transition(self, state: str) -> None:
+        previous, self.state = self.state, state
+        self.transitions.append({"from": previous, "to": state, "at": time.time(), "failures": self.failures})
+        MONGO_BREAKER_TRANSITIONS.labels(self.name, state).inc()
+        logger.warning("%s circuit breaker %s -> %s", self.name, previous, state)
+
+    def retry_after(self) -> float:
+        if self.state != self.OPEN or self.opened_at is None:
+            return 0.0
+        return max(0.0, self.opened_at + self.reset_timeout - time.monotonic())
+
+    def before_call(self) -> bool:
+        """Admit a call or raise ServiceUnavailable; returns True when the call is the half-open probe."""
+        if not self.enabled:
+            return False
+        if self.state == self.OPEN:
+            if self.retry_after() > 0:
+                self._reject()
+            self._transition(self.HALF_OPEN)
+        if self.state == self.HALF_OPEN:
+            if self._probing:
+                self._reject()
+            self._probing = True
+            return True
+        return False
+
+    def _reject(self) -> None:
+        self.rejected += 1
+        raise ServiceUnavailable("database unavailable", retry_after=max(1, math.ceil(self.retry_after())))
+
+    def record_success(self, probe: bool = False) -> None:
+        self.failures = 0
+        if probe:
+            self._probing = False
+            if self.state == self.HALF_OPEN:
+                self._transition(self.CLOSED)
+
+    def record_failure(self, probe: bool = False) -> None:
+        if not self.enabled:
+            return
+        self.failures += 1
+        if probe:
+            self._probing = False
+        if (probe and self.state == self.HALF_OPEN) or (self.state == self.CLOSED and self.failures >= self.failure_threshold):
+            self.opened_at = time.monotonic()
+            self._transition(self.OPEN)
+
+    def release(self, probe: bool) -> None:
+        """Let another probe through if this one ended without a verdict (e.g. cancelled)."""
+        if probe:
+            self._probing = False
+
+    def stats(self) -> dict:
+        return {
+            "state": self.state if self.enabled else "disabled",
+            "consecutive_failures": self.failures,
+            "failure_threshold": self.failure_threshold,
+            "reset_timeout_seconds": self.reset_timeout,
+            "retry_after_seconds": round(self.retry_after(), 3),
+            "rejected": self.rejected,
+            "transitions": list(self.transitions),
+        }
+
+
+mongo_breaker = CircuitBreaker("mongodb", MONGO_BREAKER_FAILURES, MONGO_BREAKER_RESET_SECONDS)
+
+
+async def guarded_call(fn: Callable[[], Awaitable[Any]], retry: bool = False,
+                       breaker: CircuitBreaker = mongo_breaker) -> Any:
+    """Run one database operation under the request deadline, the breaker and (if `retry`) retries.
+
+    `fn` must start a fresh operation each time it is called.
+    """
+    attempt = 0
+    while True:
+        remaining = remaining_budget()
+        if remaining is not None and remaining <= 0:
+            raise DeadlineExceeded("request deadline exceeded")
+        probe = breaker.before_call()
+        try:
+            if remaining is None:
+                result = await fn()
+            else:
+                with pymongo.timeout(remaining):
+                    result = await fn()
+        except PyMongoError as e:
+            if not _is_unavailable(e):
+                # the server answered (duplicate key, validation, ...): it is up
+                breaker.record_success(probe)
+                raise
+            if _is_budget_timeout(e, remaining):
+                # not the database's fault: no verdict for the breaker (finally frees a probe)
+                raise DeadlineExceeded("request deadline exceeded") from e
+            breaker.record_failure(probe)
+            if e.timeout:
+                if _deadline.get() is not None:
+                    raise DeadlineExceeded("request deadline exceeded") from e
+                raise ServiceUnavailable("database unavailable", retry_after=1) from e
+            if not retry or attempt >= MONGO_RETRY_ATTEMPTS or breaker.state == breaker.OPEN:
+                raise ServiceUnavailable("database unavailable", retry_after=1) from e
+            delay = random.uniform(0, MONGO_RETRY_BACKOFF_MS / 1000 * 2 ** attempt)
+            remaining = remaining_budget()
+            if remaining is not None and delay >= remaining:
+                raise DeadlineExceeded("request deadline exceeded") from e
+            attempt += 1
+            MONGO_RETRIES.inc()
+            await asyncio.sleep(delay)
+            continue
+        finally:
+            breaker.release(probe)
+        breaker.record_success(probe)
+        return result
+
+
+# collection methods routed through guarded_call; everything else (find, name, ...) passes through
+_GUARDED_READS = frozenset({"find_one", "count_documents", "estimated_document_count", "distinct"})
+_GUARDED_WRITES = frozenset({
+    "insert_one", "insert_many", "replace_one", "update_one", "update_many", "delete_one", "delete_many",
+    "find_one_and_update", "find_one_and_replace", "find_one_and_delete", "bulk_write",
+})
+
+
+class GuardedCollection:
+    """Motor collection proxy whose single-round-trip operations go through `guarded_call`.
+
+    Reads are retried on transient errors; writes are not. Cursors (`find`, `aggregate`)
+    are returned as-is; wrap their consumption (e.g. `to_list`) with `guarded_call`.
+    """
+
+    def __init__(self, collection, breaker: CircuitBreaker = mongo_breaker):
+        self._collection = collection
+        self._breaker = breaker
+
+    def __getattr__(self, name: str):
+        attr = getattr(self._collection, name)
+        if name not in _GUARDED_READS and name not in _GUARDED_WRITES:
+            return attr
+        retry = name in _GUARDED_READS
+        breaker = self._breaker
+
+        async def call(*args, **kwargs):
+            return await guarded_call(lambda: attr(*args, **kwargs), retry=retry, breaker=breaker)
+
+        return call
+
+
+def guarded(collection) -> GuardedCollection:
+    return GuardedCollection(collection)
@@ -1,12 +1,19 @@
 import os
+import time
+import uuid
 from datetime import datetime, timedelta
 from jose import jwt
-from typing import Final
+from typing import Final, NamedTuple, Optional
+
+from app.metrics import PASSWORD_HASH_SECONDS
+from app.utils.cache import TTLCache
+from app.utils.hashing import get_hashing_executor
 
 # Prefer direct use of the `bcrypt` library to avoid passlib's backend
 # detection logic (which in some platform wheel combinations can raise
 # confusing AttributeError/ValueError traces at import time). If the
-# bcrypt package isn't available, fall back to passlib's CryptContext.
+# bcrypt package isn't available, fall back to passlib's CryptContext,
+# which is only imported when first needed.
 try:
     import bcrypt as _bcrypt_lib
     _HAS_BCRYPT = True
@@ -14,9 +21,31 @@ except Exception:
     _bcrypt_lib = None
     _HAS_BCRYPT = False
 
-from passlib.context import CryptContext
-# keep passlib as a fallback
-pwd_context = CryptContext(schemes=["bcrypt"], default="bcrypt", deprecated="auto")
+# bcrypt work factor for new hashes (each +1 doubles the cost); pick it with
+# scripts/calibrate_bcrypt.py. Hashes below it are upgraded on the next login.
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", "12"))
+if not 4 <= BCRYPT_ROUNDS <= 31:
+    raise ValueError(f"BCRYPT_ROUNDS must be between 4 and 31, got {BCRYPT_ROUNDS}")
+
+_pwd_context = None
+
+
+def _passlib_context():
+    global _pwd_context
+    if _pwd_context is None:
+        from passlib.context import CryptContext
+        _pwd_context = CryptContext(schemes=["bcrypt"], default="bcrypt", deprecated="auto",
+                                    bcrypt__rounds=BCRYPT_ROUNDS)
+    return _pwd_context
+
+
+def __getattr__(name: str):
+    # `pwd_context` used to be built at import; it is now created on first access so
+    # importing this module doesn't pay for passlib
+    if name == "pwd_context":
+        return _passlib_context()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 # bcrypt has a well-known limitation: it only considers the first 72 bytes of the password.
 # Enforce a clear check so callers can fail fast with a helpful message instead of a lower-level
@@ -45,11 +74,11 @@ def hash_password(password: str) -> str:
     ensure_bcrypt_compatible_password(password)
     if _HAS_BCRYPT:
         # bcrypt.hashpw works on bytes and returns bytes
-        hashed = _bcrypt_lib.hashpw(password.encode("utf-8"), _bcrypt_lib.gensalt())
+        hashed = _bcrypt_lib.hashpw(password.encode("utf-8"), _bcrypt_lib.gensalt(rounds=BCRYPT_ROUNDS))
         # store as str for JSON/DB convenience
         return hashed.decode("utf-8")
     # fallback to passlib
-    return pwd_context.hash(password)
+    return _passlib_context().hash(password)
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
@@ -59,15 +88,76 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
         else:
             hashed_bytes = hashed_password
         return _bcrypt_lib.checkpw(plain_password.encode("utf-8"), hashed_bytes)
-    return pwd_context.verify(plain_password, hashed_password)
+    return _passlib_context().verify(plain_password, hashed_password)
+
+
+def bcrypt_rounds(hashed_password: str) -> Optional[int]:
+    """Work factor of a modular-crypt bcrypt hash (`$2b$12$...`), or None if it isn't one."""
+    parts = hashed_password.split("$") if isinstance(hashed_password, str) else []
+    if len(parts) < 4 or not parts[1].startswith("2") or not parts[2].isdigit():
+        return None
+    return int(parts[2])
+
+
+def needs_rehash(hashed_password: str) -> bool:
+    """True if the hash was made with a lower work factor than BCRYPT_ROUNDS."""
+    rounds = bcrypt_rounds(hashed_password)
+    return rounds is not None and rounds < BCRYPT_ROUNDS
 
 
 def create_access_token(data: dict, expires_delta: timedelta | None = None) -> str:
     to_encode = data.copy()
     expire = datetime.utcnow() + (expires_delta or timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES))
-    to_encode.update({"exp": expire})
+    # jti identifies the token for logout; a fractional iat orders it against "revoke all before" cutoffs
+    to_encode.update({"exp": expire, "iat": time.time(), "jti": uuid.uuid4().hex})
     return jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
 
 
 def decode_token(token: str) -> dict:
     return jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+
+
+# Verified tokens, keyed by the raw token string, so repeat requests skip the HMAC
+# check and JSON parsing. An entry never outlives the token's `exp`. Tagged with the
+# admin id (`sub`) so all of an admin's tokens can be dropped at once.
+TOKEN_CACHE_MAX_ENTRIES = int(os.getenv("TOKEN_CACHE_MAX_ENTRIES", "10000"))
+TOKEN_CACHE_TTL = float(os.getenv("TOKEN_CACHE_TTL", "300"))
+
+token_cache = TTLCache(TOKEN_CACHE_MAX_ENTRIES, TOKEN_CACHE_TTL)
+
+
+class TokenClaims(NamedTuple):
+    """The claims issued by AuthService.create_token."""
+
+    admin_id: Optional[str]
+    email: Optional[str]
+    organization_name: Optional[str]
+    org_id: Optional[str]
+    exp: Optional[int]
+    jti: Optional[str] = None
+    iat: Optional[float] = None
+
+
+def decode_token_cached(token: str) -> TokenClaims:
+    """decode_token through `token_cache`; raises the same errors for invalid or expired tokens."""
+    claims = token_cache.get(token)
+    if claims is None:
+        payload = decode_token(token)
+        claims = TokenClaims(payload.get("sub"), payload.get("email"), payload.get("organization_name"),
+                             payload.get("org_id"), payload.get("exp"), payload.get("jti"), payload.get("iat"))
+        ttl = claims.exp - time.time() if isinstance(claims.exp, (int, float)) else None
+        token_cache.set(token, claims, tags=(claims.admin_id,), ttl=ttl)
+    return claims
+
+
+async def hash_password_async(password: str) -> str:
+    """Hash on the bounded hashing executor so bcrypt never blocks the event loop."""
+    # fail fast on invalid input without occupying a pool slot
+    ensure_bcrypt_compatible_password(password)
+    with PASSWORD_HASH_SECONDS.labels("hash").time():
+        return await get_hashing_executor().run(hash_password, password)
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    with PASSWORD_HASH_SECONDS.labels("verify").time():
+        return await get_hashing_executor().run(verify_password, plain_password, hashed_password)
@@ -0,0 +1,41 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Hashable
+
+
+class SingleFlight:
+    """Coalesce concurrent calls for the same key into one in-flight awaitable.
+
+    The first caller for a key starts `fn()`; callers arriving while it is still
+    pending await the same result (or exception). The shared task is shielded,
+    so one caller being cancelled does not cancel the work for the others.
+    """
+
+    def __init__(self):
+        self._calls: dict = {}
+        self.executed = 0
+        self.coalesced = 0
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        task = self._calls.get(key)
+        if task is not None:
+            self.coalesced += 1
+            return await asyncio.shield(task)
+        task = asyncio.ensure_future(fn())
+        self._calls[key] = task
+        self.executed += 1
+        task.add_done_callback(lambda t: self._done(key, t))
+        return await asyncio.shield(task)
+
+    def _done(self, key: Hashable, task: asyncio.Future) -> None:
+        if self._calls.get(key) is task:
+            del self._calls[key]
+        # mark the exception retrieved in case every waiter was cancelled
+        if not task.cancelled():
+            task.exception()
+
+    def forget(self, key: Hashable) -> None:
+        """Make the next caller for `key` start a fresh call instead of joining the pending one."""
+        self._calls.pop(key, None)
+
+    def stats(self) -> dict:
+        return {"in_flight": len(self._calls), "executed": self.executed, "coalesced": self.coalesced}
@@ -1,3 +1,6 @@
+from app.utils.breached import get_breached_filter
+
+
 def validate_password_strength(password: str) -> bool:
     """Basic password strength checks: min length and at least one digit and one letter."""
     if not password or len(password) < 6:
@@ -5,3 +8,13 @@ def validate_password_strength(password: str) -> bool:
     has_digit = any(c.isdigit() for c in password)
     has_letter = any(c.isalpha() for c in password)
     return has_digit and has_letter
+
+
+def is_breached_password(password: str) -> bool:
+    """True if the password is in the breached-password filter (BREACHED_PASSWORDS_BLOOM).
+
+    Bloom filters have no false negatives; a small configured fraction of other
+    passwords is rejected too.
+    """
+    breached = get_breached_filter()
+    return breached is not None and password in breached
@@ -0,0 +1,109 @@
+"""Measure the cost of the breached-password filter: startup, memory and lookups.
+
+Each variant runs in a fresh interpreter that imports the app (app.main), then runs
+password validation `--lookups` times with random passwords:
+
+- `disabled`: BREACHED_PASSWORDS_BLOOM unset
+- `enabled`: BREACHED_PASSWORDS_BLOOM pointing at `--filter`
+
+For both it reports import time, plus RSS and anonymous memory after import and
+after the lookups. The filter is memory-mapped, so only the pages lookups touch
+count towards RSS. They are file-backed page cache that every worker process on the
+host shares, not anonymous (per-process) memory. Lookup latency is the mean per call.
+
+Usage:
+    $ python scripts/build_breached_bloom.py --input list.txt --output /tmp/breached.bloom
+    $ python scripts/bench_breached.py --filter /tmp/breached.bloom --samples 5
+
+Without `--filter`, a filter with `--entries` synthetic entries is built in a temp dir.
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+# runs in the child interpreter; prints one JSON line
+CHILD = r"""
+import json, os, random, string, sys, time
+started = time.perf_counter()
+import app.main
+from app.utils.validators import is_breached_password
+imported = time.perf_counter()
+
+def memory():
+    fields = {}
+    with open("/proc/self/smaps_rollup") as f:
+        for line in f:
+            name, _, rest = line.partition(":")
+            if rest.strip().endswith("kB"):
+                fields[name] = int(rest.split()[0])
+    return fields.get("Rss", 0) / 1024, fields.get("Anonymous", 0) / 1024
+
+rss_import, anon_import = memory()
+n = int(sys.argv[1])
+passwords = ["".join(random.choices(string.ascii_letters + string.digits, k=12)) for _ in range(n)]
+t = time.perf_counter()
+for p in passwords:
+    is_breached_password(p)
+lookup_us = (time.perf_counter() - t) / n * 1e6
+rss_lookups, anon_lookups = memory()
+print(json.dumps({
+    "import_ms": (imported - started) * 1000,
+    "rss_mb_after_import": rss_import,
+    "rss_mb_after_lookups": rss_lookups,
+    "anon_mb_after_import": anon_import,
+    "anon_mb_after_lookups": anon_lookups,
+    "lookup_us": lookup_us,
+}))
+"""
+
+
+def run_child(env: dict, lookups: int) -> dict:
+    out = subprocess.run([sys.executable, "-c", CHILD, str(lookups)], cwd=ROOT, env=env,
+                         capture_output=True, text=True, check=True)
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def summarize(samples):
+    return {key: round(statistics.median(s[key] for s in samples), 3) for key in samples[0]}
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--filter", help="existing filter file (default: build a synthetic one)")
+    parser.add_argument("--entries", type=int, default=1_000_000, help="synthetic filter size")
+    parser.add_argument("--samples", type=int, default=5, help="interpreters per variant")
+    parser.add_argument("--lookups", type=int, default=10_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = args.filter
+        if path is None:
+            path = os.path.join(tmp, "breached.bloom")
+            subprocess.run([sys.executable, os.path.join(ROOT, "scripts", "build_breached_bloom.py"),
+                            "--input", "-", "--capacity", str(args.entries), "--output", path],
+                           input=b"".join(b"synthetic-%d\n" % i for i in range(args.entries)),
+                           check=True, capture_output=True)
+
+        base = {k: v for k, v in os.environ.items() if k != "BREACHED_PASSWORDS_BLOOM"}
+        base["PYTHONPATH"] = ROOT
+        results = {}
+        for name, env in (("disabled", base), ("enabled", {**base, "BREACHED_PASSWORDS_BLOOM": path})):
+            results[name] = summarize([run_child(env, args.lookups) for _ in range(args.samples)])
+
+        print(json.dumps({
+            "filter": {"path": args.filter or "(synthetic)", "size_bytes": os.path.getsize(path)},
+            "samples": args.samples,
+            "lookups": args.lookups,
+            **results,
+        }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
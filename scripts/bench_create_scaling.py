@@ -0,0 +1,101 @@
+"""Benchmark organization create latency as the number of tenants grows.
+
+Before each measurement the database is padded with empty tenant collections up
+to the next tier (100, 1k, 10k, 100k by default), then a batch of organizations is
+created through OrganizationService and latency percentiles are recorded. With
+existence checks done by create_collection/rename error codes instead of listing
+every collection, create latency should stay flat across tiers.
+
+bcrypt is excluded (a precomputed hash is used) so the numbers isolate the Mongo
+round trips.
+
+Usage:
+    $ python scripts/bench_create_scaling.py --tiers 100,1000,10000,100000 --samples 50
+
+Set MONGO_URL to point at a disposable MongoDB. The benchmark uses its own
+database (default: bench_create_scaling) and drops it when finished.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from motor.motor_asyncio import AsyncIOMotorClient  # noqa: E402
+
+from app.services import org_service  # noqa: E402
+from app.services.org_service import OrganizationService  # noqa: E402
+from app.utils.security import hash_password  # noqa: E402
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    idx = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[idx]
+
+
+async def pad_collections(db, start: int, stop: int, concurrency: int = 64):
+    sem = asyncio.Semaphore(concurrency)
+
+    async def create(i):
+        async with sem:
+            try:
+                await db.create_collection(f"pad_{i}")
+            except Exception:
+                pass
+
+    await asyncio.gather(*(create(i) for i in range(start, stop)))
+
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--tiers", default="100,1000,10000,100000")
+    parser.add_argument("--samples", type=int, default=50)
+    parser.add_argument("--db", default="bench_create_scaling")
+    args = parser.parse_args()
+
+    client = AsyncIOMotorClient(os.getenv("MONGO_URL", "mongodb://localhost:27017"))
+    db = client[args.db]
+    await client.drop_database(args.db)
+    await db.organizations.create_index("organization_name", unique=True)
+    await db.admins.create_index("email", unique=True)
+
+    precomputed = hash_password("Bench1234")
+
+    async def fixed_hash(password):
+        return precomputed
+
+    org_service.hash_password_async = fixed_hash
+    svc = OrganizationService(db)
+
+    results = []
+    padded = 0
+    for tier in [int(t) for t in args.tiers.split(",")]:
+        await pad_collections(db, padded, tier)
+        padded = tier
+        latencies = []
+        for i in range(args.samples):
+            name = f"bench_{tier}_{i}"
+            started = time.perf_counter()
+            await svc.create_organization(name, f"admin+{name}@example.com", "Bench1234")
+            latencies.append((time.perf_counter() - started) * 1000)
+        results.append({
+            "tenants": tier,
+            "samples": len(latencies),
+            "p50_ms": round(statistics.median(latencies), 3),
+            "p99_ms": round(percentile(latencies, 99), 3),
+            "mean_ms": round(statistics.fmean(latencies), 3),
+        })
+        print(json.dumps(results[-1]), flush=True)
+
+    await client.drop_database(args.db)
+    print(json.dumps({"results": results}, indent=2))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,97 @@
+"""Measure the request-time overhead of the Prometheus instrumentation.
+
+The app is driven in-process (httpx ASGI transport, real MongoDB) once with
+METRICS_ENABLED=1 and once with METRICS_ENABLED=0, each in its own subprocess so the
+middleware and Mongo listeners are really absent in the baseline. Runs alternate
+for `--rounds` rounds and the median per-request time of each side is compared.
+
+Two scenarios are measured: `GET /org/get` served from the org cache (the cheapest
+route, so the worst case for relative overhead) and with the cache disabled (one
+Mongo round trip per request).
+
+Usage:
+    $ python scripts/bench_metrics_overhead.py --requests 2000 --rounds 5 --max-overhead 2
+
+Set MONGO_URL to a disposable MongoDB. Exits non-zero when the overhead of any
+scenario exceeds --max-overhead percent.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, ROOT)
+
+SCENARIOS = {"cached": {"ORG_CACHE_TTL": "30"}, "uncached": {"ORG_CACHE_TTL": "0"}}
+
+
+async def worker(requests: int) -> float:
+    """Mean seconds per request for this process's configuration."""
+    import httpx
+    from app.main import app
+
+    async with app.router.lifespan_context(app):
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench") as c:
+            await c.post("/org/create", json={"organization_name": "bench_metrics", "email": "bench-metrics@example.com",
+                                              "password": "Bench1234"})
+            params = {"organization_name": "bench_metrics"}
+            for _ in range(min(200, requests)):
+                await c.get("/org/get", params=params)
+            started = time.perf_counter()
+            for _ in range(requests):
+                await c.get("/org/get", params=params)
+            return (time.perf_counter() - started) / requests
+
+
+def run_once(metrics: bool, scenario: str, args) -> float:
+    env = {**os.environ, **SCENARIOS[scenario], "METRICS_ENABLED": "1" if metrics else "0",
+           "MASTER_DB_NAME": args.db, "ORG_CACHE_SYNC": "0", "JOBS_ENABLED": "0"}
+    out = subprocess.run([sys.executable, __file__, "--worker", "--requests", str(args.requests)],
+                         env=env, check=True, capture_output=True, text=True, cwd=ROOT)
+    return float(out.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--max-overhead", type=float, default=2.0, help="percent")
+    parser.add_argument("--db", default="bench_metrics_overhead")
+    parser.add_argument("--worker", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        print(asyncio.run(worker(args.requests)))
+        return
+
+    results = []
+    for scenario in SCENARIOS:
+        on, off = [], []
+        for _ in range(args.rounds):
+            off.append(run_once(False, scenario, args))
+            on.append(run_once(True, scenario, args))
+        base, instrumented = statistics.median(off), statistics.median(on)
+        results.append({
+            "scenario": scenario,
+            "baseline_us": round(base * 1e6, 1),
+            "instrumented_us": round(instrumented * 1e6, 1),
+            "overhead_pct": round((instrumented - base) / base * 100, 2),
+        })
+        print(json.dumps(results[-1]), flush=True)
+
+    from pymongo import MongoClient
+    MongoClient(os.getenv("MONGO_URL", "mongodb://localhost:27017")).drop_database(args.db)
+
+    print(json.dumps({"results": results, "max_overhead_pct": args.max_overhead}, indent=2))
+    if any(r["overhead_pct"] > args.max_overhead for r in results):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+"""Compare response throughput of the stdlib JSON path and the orjson path.
+
+Two minimal FastAPI apps serve the same payloads:
+
+- before: routes return dicts, FastAPI validates them against `response_model`
+  and renders them with the stdlib-based JSONResponse
+- after: `default_response_class=FastJSONResponse`; routes return
+  `model_response(...)` (validated once) or a FastJSONResponse directly, so
+  FastAPI's jsonable_encoder pass is skipped and orjson renders the body
+
+Endpoints: a single OrgResponse (like GET /org/get) and a 100-item list page
+(like GET /org/list). Requests are fed straight into the ASGI app (no HTTP client
+or database), so the numbers isolate routing, validation and serialization.
+
+Usage:
+    $ python scripts/bench_responses.py --requests 5000
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from fastapi import FastAPI  # noqa: E402
+
+from app.models.schemas import OrgResponse  # noqa: E402
+from app.responses import FastJSONResponse, model_response  # noqa: E402
+
+ORG = {
+    "organization_name": "acme-corp",
+    "collection_name": "org_acme-corp",
+    "admin_email": "admin@acme.example.com",
+    "created_at": datetime(2024, 5, 17, 9, 30, 12, 345000),
+}
+PAGE = {
+    "items": [{**ORG, "organization_name": f"acme-{i:03d}", "collection_name": f"org_acme-{i:03d}"} for i in range(100)],
+    "next_cursor": "eyJrIjogImFjbWUtMDk5In0=",
+}
+
+
+def before_app() -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/org", response_model=OrgResponse)
+    async def org():
+        return dict(ORG)
+
+    @app.get("/list")
+    async def page():
+        return PAGE
+
+    return app
+
+
+def after_app() -> FastAPI:
+    app = FastAPI(default_response_class=FastJSONResponse)
+
+    @app.get("/org", response_model=OrgResponse)
+    async def org():
+        return model_response(OrgResponse, ORG)
+
+    @app.get("/list")
+    async def page():
+        return FastJSONResponse(PAGE)
+
+    return app
+
+
+async def call(app: FastAPI, path: str) -> int:
+    """Drive one GET through the ASGI app directly (no HTTP client overhead)."""
+    scope = {"type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "GET",
+             "scheme": "http", "path": path, "raw_path": path.encode(), "root_path": "", "query_string": b"",
+             "headers": [(b"host", b"bench")], "client": ("127.0.0.1", 1234), "server": ("bench", 80)}
+    status = 0
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        nonlocal status
+        if message["type"] == "http.response.start":
+            status = message["status"]
+
+    await app(scope, receive, send)
+    return status
+
+
+async def measure(app: FastAPI, path: str, requests: int) -> float:
+    assert await call(app, path) == 200
+    for _ in range(min(200, requests)):
+        await call(app, path)
+    started = time.perf_counter()
+    for _ in range(requests):
+        await call(app, path)
+    return requests / (time.perf_counter() - started)
+
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=5000)
+    args = parser.parse_args()
+
+    results = []
+    for path in ("/org", "/list"):
+        before = await measure(before_app(), path, args.requests)
+        after = await measure(after_app(), path, args.requests)
+        results.append({
+            "endpoint": path,
+            "before_rps": round(before, 1),
+            "after_rps": round(after, 1),
+            "speedup": round(after / before, 3),
+        })
+        print(json.dumps(results[-1]), flush=True)
+    print(json.dumps({"requests": args.requests, "results": results}, indent=2))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
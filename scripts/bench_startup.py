@@ -0,0 +1,122 @@
+"""Measure cold-start cost: import time of the app and time until it is ready.
+
+Each sample is a fresh interpreter:
+
+- `python -X importtime -c "import app.main"` is parsed for the cumulative
+  import time of app.main and the slowest imported modules
+- a worker process imports the app, enters its lifespan and waits until startup
+  preparation (indexes, pool warm-up) marks it ready, i.e. until GET /ready
+  would return 200; wall-clock time is measured from process launch
+
+Usage:
+    $ python scripts/bench_startup.py --samples 10 --top 15
+    $ python scripts/bench_startup.py --mongo local   # real mongod at MONGO_URL
+
+With `--mongo memory` (default) the database is an in-memory Motor stand-in, so
+the numbers isolate the Python side of startup.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, ROOT)
+
+
+def import_profile() -> dict:
+    """One `-X importtime` run: {module: (self_us, cumulative_us)}."""
+    out = subprocess.run([sys.executable, "-X", "importtime", "-c", "import app.main"],
+                         cwd=ROOT, capture_output=True, text=True, check=True, env=_env())
+    modules = {}
+    for line in out.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        parts = line[len("import time:"):].split("|")
+        try:
+            self_us, cumulative_us = int(parts[0]), int(parts[1])
+        except ValueError:
+            continue  # header line
+        modules[parts[2].strip()] = (self_us, cumulative_us)
+    return modules
+
+
+def _env() -> dict:
+    return {**os.environ, "JOBS_ENABLED": "0", "ORG_CACHE_SYNC": "0"}
+
+
+async def worker(mongo: str) -> dict:
+    if mongo == "memory":
+        # the stand-in's own import is not part of the app's startup
+        from mongomock_motor import AsyncMongoMockClient
+    started = time.perf_counter()
+    if mongo == "memory":
+        from app import database
+        database.AsyncIOMotorClient = lambda *a, **kw: AsyncMongoMockClient()
+    from app.main import app
+    imported = time.perf_counter()
+    async with app.router.lifespan_context(app):
+        serving = time.perf_counter()
+        while not app.state.ready:
+            await asyncio.sleep(0.001)
+        ready = time.perf_counter()
+    return {
+        "import_ms": (imported - started) * 1000,
+        "lifespan_ms": (serving - imported) * 1000,
+        "ready_ms": (ready - started) * 1000,
+    }
+
+
+def ready_sample(mongo: str) -> dict:
+    launched = time.perf_counter()
+    out = subprocess.run([sys.executable, __file__, "--worker", "--mongo", mongo],
+                         cwd=ROOT, capture_output=True, text=True, check=True, env=_env())
+    sample = json.loads(out.stdout.strip().splitlines()[-1])
+    sample["process_ms"] = (time.perf_counter() - launched) * 1000
+    return sample
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--samples", type=int, default=10)
+    parser.add_argument("--top", type=int, default=15, help="slowest modules to list (by cumulative time)")
+    parser.add_argument("--mongo", choices=["memory", "local"], default="memory")
+    parser.add_argument("--worker", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        print(json.dumps(asyncio.run(worker(args.mongo))))
+        return
+
+    profiles = [import_profile() for _ in range(args.samples)]
+    totals = [p["app.main"][1] / 1000 for p in profiles if "app.main" in p]
+    last = profiles[-1]
+    slowest = sorted(last.items(), key=lambda kv: kv[1][1], reverse=True)[1:args.top + 1]
+
+    samples = [ready_sample(args.mongo) for _ in range(args.samples)]
+
+    def median(key):
+        return round(statistics.median(s[key] for s in samples), 2)
+
+    print(json.dumps({
+        "samples": args.samples,
+        "mongo": args.mongo,
+        "importtime_app_main_ms": round(statistics.median(totals), 2),
+        "import_ms": median("import_ms"),
+        "lifespan_to_serving_ms": median("lifespan_ms"),
+        "ready_ms": median("ready_ms"),
+        "process_to_ready_ms": median("process_ms"),
+        "slowest_imports": [
+            {"module": name, "cumulative_ms": round(cum / 1000, 2), "self_ms": round(own / 1000, 2)}
+            for name, (own, cum) in slowest
+        ],
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
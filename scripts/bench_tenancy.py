@@ -0,0 +1,119 @@
+"""Compare the collection-per-org and shared-collection tenancy layouts.
+
+For each tier (10k and 100k tenants by default) and each layout, a fresh database
+is provisioned with that many tenants holding `--docs` small documents each, then:
+
+- provision time (tenants/sec) for the whole tier,
+- point-read latency (p50/p99) of `find_one` by _id for random tenants,
+- `listCollections` time,
+- `dbStats` (collections, indexes, data/storage/index size).
+
+Usage:
+    $ python scripts/bench_tenancy.py --tiers 10000,100000 --docs 5 --reads 2000
+
+Set MONGO_URL to point at a disposable MongoDB. Each run uses its own database
+(bench_tenancy_<layout>_<tier>), dropped when finished unless --keep is given.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from bson import ObjectId  # noqa: E402
+from motor.motor_asyncio import AsyncIOMotorClient  # noqa: E402
+
+from app.services.tenant_store import ensure_tenant_indexes, tenant_store  # noqa: E402
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    idx = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[idx]
+
+
+async def provision(db, mode: str, tenants: int, docs: int, concurrency: int):
+    store = tenant_store(db, mode)
+    await ensure_tenant_indexes(db, mode)
+    sem = asyncio.Semaphore(concurrency)
+    orgs = []
+
+    async def one(i):
+        name = f"t{i}"
+        org = {"_id": ObjectId(), "organization_name": name, "collection_name": store.collection_name(name)}
+        async with sem:
+            await store.provision(name)
+            res = await store.data(org).insert_many([{"n": n, "payload": "x" * 64} for n in range(docs)])
+        orgs.append((org, res.inserted_ids))
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(tenants)))
+    return store, orgs, time.perf_counter() - started
+
+
+async def run(client, mode: str, tenants: int, args) -> dict:
+    name = f"bench_tenancy_{mode}_{tenants}"
+    await client.drop_database(name)
+    db = client[name]
+
+    store, orgs, provision_s = await provision(db, mode, tenants, args.docs, args.concurrency)
+
+    latencies = []
+    for _ in range(args.reads):
+        org, ids = random.choice(orgs)
+        started = time.perf_counter()
+        await store.data(org).find_one({"_id": random.choice(ids)})
+        latencies.append((time.perf_counter() - started) * 1000)
+
+    started = time.perf_counter()
+    await db.list_collection_names()
+    list_ms = (time.perf_counter() - started) * 1000
+
+    stats = await db.command("dbStats")
+    if not args.keep:
+        await client.drop_database(name)
+    return {
+        "layout": mode,
+        "tenants": tenants,
+        "docs_per_tenant": args.docs,
+        "provision_seconds": round(provision_s, 3),
+        "tenants_per_sec": round(tenants / provision_s, 1),
+        "read_p50_ms": round(statistics.median(latencies), 3),
+        "read_p99_ms": round(percentile(latencies, 99), 3),
+        "list_collections_ms": round(list_ms, 3),
+        "collections": stats.get("collections"),
+        "indexes": stats.get("indexes"),
+        "data_size": stats.get("dataSize"),
+        "storage_size": stats.get("storageSize"),
+        "index_size": stats.get("indexSize"),
+    }
+
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--tiers", default="10000,100000")
+    parser.add_argument("--layouts", default="collection,shared")
+    parser.add_argument("--docs", type=int, default=5)
+    parser.add_argument("--reads", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--keep", action="store_true", help="keep the benchmark databases")
+    args = parser.parse_args()
+
+    client = AsyncIOMotorClient(os.getenv("MONGO_URL", "mongodb://localhost:27017"))
+    results = []
+    for tier in [int(t) for t in args.tiers.split(",")]:
+        for mode in args.layouts.split(","):
+            results.append(await run(client, mode, tier, args))
+            print(json.dumps(results[-1]), flush=True)
+
+    print(json.dumps({"results": results}, indent=2))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
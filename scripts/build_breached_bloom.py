@@ -0,0 +1,107 @@
+"""Build the breached-password Bloom filter file used by BREACHED_PASSWORDS_BLOOM.
+
+Streams a newline-delimited list into a memory-mapped filter file, so memory use
+stays flat however large the list is. Input formats:
+
+- `plain` (default): one password per line
+- `sha1`: one hex SHA-1 digest per line, optionally followed by `:count`
+  (the Have I Been Pwned "pwned-passwords-sha1" download)
+
+The filter is sized up front for `--capacity` entries at `--fp-rate`. Without
+`--capacity`, a file input is counted in a first pass; stdin requires it.
+
+Usage:
+    $ python scripts/build_breached_bloom.py --input rockyou.txt --output breached.bloom
+    $ python scripts/build_breached_bloom.py --input pwned-passwords-sha1.txt --format sha1 \\
+          --fp-rate 0.001 --output breached.bloom
+    $ zcat list.txt.gz | python scripts/build_breached_bloom.py --capacity 20000000 --output breached.bloom
+
+Then set BREACHED_PASSWORDS_BLOOM=/path/to/breached.bloom (same file for every worker).
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from app.utils.breached import create_filter_file, finish_filter_file  # noqa: E402
+
+
+def count_lines(path: str) -> int:
+    with open(path, "rb") as f:
+        return sum(1 for line in f if line.strip())
+
+
+def keys(stream, fmt: str):
+    for raw in stream:
+        line = raw.rstrip(b"\r\n")
+        if not line:
+            continue
+        if fmt == "sha1":
+            try:
+                yield bytes.fromhex(line.split(b":", 1)[0].decode("ascii"))
+            except ValueError:
+                continue
+        else:
+            # same key as app.utils.breached.password_key for UTF-8 lines; lines in other
+            # encodings are hashed as-is and only match a password with those exact bytes
+            yield hashlib.sha1(line).digest()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--input", default="-", help="password list (default: stdin)")
+    parser.add_argument("--output", required=True)
+    parser.add_argument("--format", choices=["plain", "sha1"], default="plain")
+    parser.add_argument("--capacity", type=int, help="expected entries (default: count the input)")
+    parser.add_argument("--fp-rate", type=float, default=0.001, help="false positive rate at capacity")
+    args = parser.parse_args()
+
+    capacity = args.capacity
+    if capacity is None:
+        if args.input == "-":
+            raise SystemExit("--capacity is required when reading stdin")
+        capacity = count_lines(args.input)
+
+    started = time.perf_counter()
+    tmp = args.output + ".tmp"
+    bloom, mm = create_filter_file(tmp, capacity, args.fp_rate)
+    try:
+        stream = sys.stdin.buffer if args.input == "-" else open(args.input, "rb")
+        try:
+            for key in keys(stream, args.format):
+                bloom.add(key)
+        finally:
+            if stream is not sys.stdin.buffer:
+                stream.close()
+        size_bytes, num_hashes, added = bloom.size_bytes, bloom.num_hashes, bloom.count
+        finish_filter_file(bloom, mm)
+        # readers only ever see a complete file
+        os.replace(tmp, args.output)
+    except BaseException:
+        if not mm.closed:
+            bloom.bits.release()
+            mm.close()
+        os.remove(tmp)
+        raise
+
+    print(json.dumps({
+        "output": args.output,
+        "entries": added,
+        "capacity": capacity,
+        "fp_rate": args.fp_rate,
+        "size_bytes": size_bytes,
+        "hashes": num_hashes,
+        "elapsed_seconds": round(time.perf_counter() - started, 3),
+    }, indent=2))
+    if added > capacity:
+        print(f"# warning: {added} entries exceed the capacity; the false positive rate is higher than requested",
+              file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""Pick the bcrypt work factor (BCRYPT_ROUNDS) for this machine.
+
+Times `bcrypt.checkpw` at each cost from `--min-rounds` upwards and recommends the
+highest cost whose median verify time stays within `--target-ms`. Verify and hash
+cost the same, so this is also the per-login CPU time; multiply by the expected
+login rate to size HASH_POOL_WORKERS. Stops as soon as a cost exceeds twice the
+target (every extra round doubles the time).
+
+Usage:
+    $ python scripts/calibrate_bcrypt.py --target-ms 250
+    $ python scripts/calibrate_bcrypt.py --target-ms 100 --samples 7
+
+Run it on the production instance type, not a laptop. Prints one JSON document
+with the timings and the recommended `BCRYPT_ROUNDS` on stdout, and a ready-to-paste
+`BCRYPT_ROUNDS=` line on stderr; existing hashes below the chosen cost are upgraded
+on each admin's next successful login.
+"""
+
+import argparse
+import json
+import statistics
+import sys
+import time
+
+import bcrypt
+
+PASSWORD = b"Calibrate1234"
+
+
+def time_verify(rounds: int, samples: int) -> float:
+    """Median bcrypt.checkpw time in milliseconds at `rounds`."""
+    hashed = bcrypt.hashpw(PASSWORD, bcrypt.gensalt(rounds=rounds))
+    timings = []
+    for _ in range(samples):
+        started = time.perf_counter()
+        bcrypt.checkpw(PASSWORD, hashed)
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--target-ms", type=float, default=250, help="verify latency budget per login")
+    parser.add_argument("--min-rounds", type=int, default=10, help="lowest cost considered (OWASP: at least 10)")
+    parser.add_argument("--max-rounds", type=int, default=16)
+    parser.add_argument("--samples", type=int, default=5, help="verifications timed per cost")
+    args = parser.parse_args()
+
+    timings = {}
+    recommended = None
+    for rounds in range(args.min_rounds, args.max_rounds + 1):
+        ms = time_verify(rounds, args.samples)
+        timings[rounds] = round(ms, 2)
+        if ms <= args.target_ms:
+            recommended = rounds
+        elif ms > 2 * args.target_ms:
+            break
+
+    print(json.dumps({
+        "target_ms": args.target_ms,
+        "verify_ms_by_rounds": timings,
+        "recommended_rounds": recommended if recommended is not None else args.min_rounds,
+        "within_target": recommended is not None,
+    }, indent=2))
+    if recommended is None:
+        print(f"# even {args.min_rounds} rounds exceed the target; using the minimum", file=sys.stderr)
+    print(f"BCRYPT_ROUNDS={recommended if recommended is not None else args.min_rounds}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,251 @@
+"""Open-loop load generator for the organization API.
+
+Requests are started at a fixed target rate (`--rps`) regardless of how fast earlier
+ones finish, and latency is measured from each request's scheduled start, so a
+saturated server shows up as growing latency instead of a silently lower request
+rate. At most `--concurrency` requests are outstanding; the rest wait their turn
+(and that wait counts towards their latency).
+
+Targets:
+- default: the ASGI app in-process through httpx's ASGI transport
+- `--url http://host:8000`: a running server
+
+Storage for the in-process app:
+- `--mongo memory` (default): an in-memory Motor stand-in (mongomock-motor), no mongod needed
+- `--mongo local`: the MongoDB at MONGO_URL, database MASTER_DB_NAME (default: loadtest)
+
+The operation mix is given as weights, e.g. `--mix get=70,login=10,create=10,update=5,delete=5`.
+`--seed` organizations are created before the measured run so reads have targets.
+bcrypt-bound routes are subject to admission control; `--no-rate-limits` lifts the
+per-IP/per-email token buckets for in-process runs (everything comes from one IP).
+
+Usage:
+    $ python scripts/loadtest.py --rps 200 --duration 30
+    $ python scripts/loadtest.py --url http://localhost:8000 --rps 50 --mix get=90,login=10
+
+Prints one JSON document with throughput, per-operation latency percentiles
+(p50/p90/p99/max, milliseconds), status counts and error rates.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import statistics
+import sys
+import time
+import uuid
+from collections import Counter, defaultdict
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import httpx  # noqa: E402
+
+PASSWORD = "Load1234"
+OPERATIONS = ("create", "login", "get", "update", "delete")
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    idx = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[idx]
+
+
+def parse_mix(spec: str) -> dict:
+    mix = {}
+    for part in spec.split(","):
+        name, _, weight = part.partition("=")
+        name = name.strip()
+        if name not in OPERATIONS:
+            raise SystemExit(f"unknown operation in --mix: {name!r} (expected one of {', '.join(OPERATIONS)})")
+        mix[name] = float(weight or 1)
+    return mix
+
+
+class Workload:
+    """Issues API calls and keeps the pool of organizations they operate on."""
+
+    def __init__(self, client: httpx.AsyncClient):
+        self.client = client
+        self.run_id = uuid.uuid4().hex[:8]
+        self.counter = 0
+        self.orgs = []  # dicts: organization_name, email, token
+
+    def _pick(self):
+        return random.choice(self.orgs) if self.orgs else None
+
+    async def _token(self, org) -> str:
+        if not org.get("token"):
+            r = await self.client.post("/admin/login", json={"email": org["email"], "password": PASSWORD})
+            if r.status_code == 200:
+                org["token"] = r.json()["access_token"]
+        return org.get("token") or ""
+
+    async def create(self) -> int:
+        self.counter += 1
+        name = f"lt_{self.run_id}_{self.counter}"
+        email = f"{name}@example.com"
+        r = await self.client.post("/org/create", json={"organization_name": name, "email": email, "password": PASSWORD})
+        if r.status_code == 200:
+            self.orgs.append({"organization_name": name, "email": email})
+        return r.status_code
+
+    async def login(self) -> int:
+        org = self._pick()
+        if org is None:
+            return await self.create()
+        r = await self.client.post("/admin/login", json={"email": org["email"], "password": PASSWORD})
+        if r.status_code == 200:
+            org["token"] = r.json()["access_token"]
+        return r.status_code
+
+    async def get(self) -> int:
+        org = self._pick()
+        if org is None:
+            return await self.create()
+        r = await self.client.get("/org/get", params={"organization_name": org["organization_name"]})
+        return r.status_code
+
+    async def update(self) -> int:
+        org = self._pick()
+        if org is None:
+            return await self.create()
+        token = await self._token(org)
+        self.counter += 1
+        email = f"lt_{self.run_id}_{self.counter}@example.com"
+        r = await self.client.put("/org/update", json={"organization_name": org["organization_name"], "email": email},
+                                  headers={"Authorization": f"Bearer {token}"})
+        if r.status_code == 200:
+            org["email"] = email
+            org.pop("token", None)
+        return r.status_code
+
+    async def delete(self) -> int:
+        org = self._pick()
+        if org is None:
+            return await self.create()
+        # take it out of the pool first so no other operation targets it meanwhile
+        self.orgs.remove(org)
+        token = await self._token(org)
+        r = await self.client.delete("/org/delete", params={"organization_name": org["organization_name"]},
+                                     headers={"Authorization": f"Bearer {token}"})
+        return r.status_code
+
+
+async def run_load(workload: Workload, mix: dict, rps: float, duration: float, concurrency: int) -> dict:
+    names = list(mix)
+    weights = [mix[n] for n in names]
+    latencies = defaultdict(list)
+    statuses = defaultdict(Counter)
+    errors = Counter()
+    slots = asyncio.Semaphore(concurrency)
+    tasks = []
+
+    async def one(op: str, scheduled: float):
+        async with slots:
+            try:
+                status = await getattr(workload, op)()
+            except Exception as e:
+                status = type(e).__name__
+        latencies[op].append((time.perf_counter() - scheduled) * 1000)
+        statuses[op][str(status)] += 1
+        if not (isinstance(status, int) and status < 400):
+            errors[op] += 1
+
+    started = time.perf_counter()
+    total = int(rps * duration)
+    for i in range(total):
+        scheduled = started + i / rps
+        delay = scheduled - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        tasks.append(asyncio.create_task(one(random.choices(names, weights)[0], scheduled)))
+    await asyncio.gather(*tasks)
+    elapsed = time.perf_counter() - started
+
+    def summarize(values, count, failed, status_counts=None):
+        out = {
+            "requests": count,
+            "errors": failed,
+            "error_rate": round(failed / count, 4) if count else 0.0,
+        }
+        if values:
+            out.update({
+                "p50_ms": round(statistics.median(values), 3),
+                "p90_ms": round(percentile(values, 90), 3),
+                "p99_ms": round(percentile(values, 99), 3),
+                "max_ms": round(max(values), 3),
+                "mean_ms": round(statistics.fmean(values), 3),
+            })
+        if status_counts is not None:
+            out["status"] = dict(status_counts)
+        return out
+
+    all_latencies = [v for values in latencies.values() for v in values]
+    return {
+        "elapsed_seconds": round(elapsed, 3),
+        "target_rps": rps,
+        "achieved_rps": round(len(all_latencies) / elapsed, 2) if elapsed else 0.0,
+        "overall": summarize(all_latencies, len(all_latencies), sum(errors.values())),
+        "operations": {op: summarize(latencies[op], len(latencies[op]), errors[op], statuses[op]) for op in sorted(latencies)},
+    }
+
+
+async def seed(workload: Workload, count: int, concurrency: int) -> None:
+    slots = asyncio.Semaphore(concurrency)
+
+    async def one():
+        async with slots:
+            await workload.create()
+
+    await asyncio.gather(*(one() for _ in range(count)))
+
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--url", help="target a running server instead of the in-process app")
+    parser.add_argument("--mongo", choices=["memory", "local"], default="memory", help="storage for the in-process app")
+    parser.add_argument("--rps", type=float, default=50)
+    parser.add_argument("--duration", type=float, default=10, help="seconds")
+    parser.add_argument("--concurrency", type=int, default=64, help="max outstanding requests")
+    parser.add_argument("--mix", default="get=70,login=10,create=10,update=5,delete=5")
+    parser.add_argument("--seed", type=int, default=50, help="organizations created before the run")
+    parser.add_argument("--no-rate-limits", action="store_true", help="lift per-IP/per-email hashing limits (in-process)")
+    args = parser.parse_args()
+    mix = parse_mix(args.mix)
+
+    config = vars(args)
+    if args.url:
+        async with httpx.AsyncClient(base_url=args.url, timeout=30,
+                                     limits=httpx.Limits(max_connections=args.concurrency)) as client:
+            workload = Workload(client)
+            await seed(workload, args.seed, args.concurrency)
+            result = await run_load(workload, mix, args.rps, args.duration, args.concurrency)
+    else:
+        # configure the app before it is imported (settings are read at import time)
+        os.environ.setdefault("JOBS_ENABLED", "0")
+        if args.mongo == "memory":
+            os.environ.setdefault("ORG_CACHE_SYNC", "0")  # no change streams in the stand-in
+        else:
+            os.environ.setdefault("MASTER_DB_NAME", "loadtest")  # never the service's own database by default
+        if args.no_rate_limits:
+            for name in ("HASH_IP_RATE", "HASH_IP_BURST", "HASH_EMAIL_RATE", "HASH_EMAIL_BURST"):
+                os.environ[name] = "1000000"
+        from app import database
+        if args.mongo == "memory":
+            from mongomock_motor import AsyncMongoMockClient
+            database.AsyncIOMotorClient = lambda *a, **kw: AsyncMongoMockClient()
+        from app.main import app
+
+        async with app.router.lifespan_context(app):
+            async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://loadtest", timeout=30) as client:
+                workload = Workload(client)
+                await seed(workload, args.seed, args.concurrency)
+                result = await run_load(workload, mix, args.rps, args.duration, args.concurrency)
+
+    print(json.dumps({"config": config, **result}, indent=2))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,70 @@
+"""Move organizations between the collection-per-org and shared-collection layouts.
+
+Each organization's documents are copied in batches into the target layout, its
+`collection_name` is switched, and only then is the old data removed. Re-running
+after an interruption is safe. Pause writes to an organization while it migrates.
+
+Running servers pick up the new `collection_name` through their organizations
+change stream (see app/services/cache_sync.py); on a standalone mongod, where
+there is none, allow ORG_CACHE_FALLBACK_TTL seconds before resuming writes.
+
+Usage:
+    $ python scripts/migrate_tenancy.py --to shared
+    $ python scripts/migrate_tenancy.py --to collection --org acme --org globex
+
+Uses MONGO_URL / MASTER_DB_NAME like the service. Prints one JSON line per
+organization and a summary at the end.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from app.database import get_master_db  # noqa: E402
+from app.services.tenant_store import ensure_tenant_indexes, migrate_tenant, tenant_store, tenant_store_for  # noqa: E402
+
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--to", choices=["collection", "shared"], required=True)
+    parser.add_argument("--org", action="append", help="organization to migrate (repeatable; default: all)")
+    parser.add_argument("--batch-size", type=int, default=1000)
+    args = parser.parse_args()
+
+    db = get_master_db()
+    target = tenant_store(db, args.to)
+    await ensure_tenant_indexes(db, args.to)
+    query = {"organization_name": {"$in": args.org}} if args.org else {}
+
+    migrated = skipped = documents = 0
+    started = time.perf_counter()
+    async for org in db.organizations.find(query, {"organization_name": 1, "collection_name": 1}):
+        if tenant_store_for(db, org).mode == target.mode:
+            skipped += 1
+            continue
+        t0 = time.perf_counter()
+        moved = await migrate_tenant(db, org, target, batch_size=args.batch_size)
+        migrated += 1
+        documents += moved
+        print(json.dumps({
+            "organization_name": org["organization_name"],
+            "documents": moved,
+            "seconds": round(time.perf_counter() - t0, 3),
+        }), flush=True)
+
+    print(json.dumps({
+        "to": args.to,
+        "migrated": migrated,
+        "skipped": skipped,
+        "documents": documents,
+        "seconds": round(time.perf_counter() - started, 3),
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,50 @@
+import asyncio
+import itertools
+import os
+
+import pytest
+
+# Micro-benchmarks (pytest-benchmark). Skipped unless RUN_BENCH=1 so the regular
+# suite stays fast; see "Micro-benchmarks" in the README for saving baselines and
+# comparing against them.
+collect_ignore_glob = [] if os.getenv("RUN_BENCH") == "1" else ["test_*.py"]
+
+PASSWORD = "Bench1234"
+
+
+@pytest.fixture(scope="session")
+def password():
+    return PASSWORD
+
+
+@pytest.fixture(scope="session")
+def hashed(password):
+    """bcrypt hash of `password`, computed once."""
+    from app.utils.security import hash_password
+    return hash_password(password)
+
+
+@pytest.fixture(scope="module")
+def loop():
+    loop = asyncio.new_event_loop()
+    yield loop
+    loop.close()
+
+
+@pytest.fixture
+def run(loop):
+    """Run a coroutine function to completion on the module's event loop."""
+    return lambda fn, *args: loop.run_until_complete(fn(*args))
+
+
+@pytest.fixture
+def names():
+    """Unique organization names for benchmarks that create or rename."""
+    counter = itertools.count()
+    return lambda prefix="bench": f"{prefix}{next(counter)}"
+
+
+@pytest.fixture
+def db():
+    from mongomock_motor import AsyncMongoMockClient
+    return AsyncMongoMockClient()["bench_db"]
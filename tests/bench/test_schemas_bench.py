@@ -0,0 +1,13 @@
+from app.models.schemas import OrgCreate, OrgUpdate
+
+CREATE = {"organization_name": "acme-corp", "email": "admin@acme.example.com", "password": "Bench1234"}
+UPDATE = {"organization_name": "acme-corp", "new_organization_name": "acme-group", "email": "ops@acme.example.com",
+          "password": "Bench5678"}
+
+
+def test_org_create_validation(benchmark):
+    assert benchmark(OrgCreate.model_validate, CREATE).organization_name == "acme-corp"
+
+
+def test_org_update_validation(benchmark):
+    assert benchmark(OrgUpdate.model_validate, UPDATE).new_organization_name == "acme-group"
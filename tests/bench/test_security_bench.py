@@ -0,0 +1,47 @@
+from datetime import timedelta
+
+import pytest
+
+from app.utils.breached import BreachedPasswordFilter, create_filter_file, finish_filter_file, password_key
+from app.utils.security import create_access_token, decode_token, hash_password, verify_password
+from app.utils.validators import validate_password_strength
+
+CLAIMS = {"sub": "64b7f0c2a1e4c3b2a1d0e9f8", "email": "admin@example.com", "organization_name": "acme",
+          "org_id": "64b7f0c2a1e4c3b2a1d0e9f7"}
+
+
+def test_hash_password(benchmark, password):
+    # bcrypt is deliberately slow; a few rounds are enough for a stable mean
+    benchmark.pedantic(hash_password, args=(password,), rounds=5, iterations=1)
+
+
+def test_verify_password(benchmark, password, hashed):
+    assert benchmark.pedantic(verify_password, args=(password, hashed), rounds=5, iterations=1)
+
+
+def test_create_access_token(benchmark):
+    benchmark(create_access_token, CLAIMS, timedelta(minutes=30))
+
+
+def test_decode_token(benchmark):
+    token = create_access_token(CLAIMS, timedelta(minutes=30))
+    assert benchmark(decode_token, token)["email"] == CLAIMS["email"]
+
+
+def test_validate_password_strength(benchmark, password):
+    assert benchmark(validate_password_strength, password)
+
+
+@pytest.fixture(scope="module")
+def breached_filter(tmp_path_factory):
+    path = str(tmp_path_factory.mktemp("breached") / "breached.bloom")
+    bloom, mm = create_filter_file(path, 100_000, 0.001)
+    for i in range(100_000):
+        bloom.add(password_key(f"breached{i}"))
+    finish_filter_file(bloom, mm)
+    return BreachedPasswordFilter(path)
+
+
+def test_breached_password_lookup(benchmark, breached_filter, password):
+    assert "breached42" in breached_filter
+    assert not benchmark(breached_filter.__contains__, password)
@@ -0,0 +1,54 @@
+import pytest
+
+from app.services import org_service
+from app.services.org_service import OrganizationService, org_cache
+
+
+@pytest.fixture
+def svc(db, run, monkeypatch, password, hashed):
+    # measure the service, not bcrypt (covered by test_security_bench)
+    async def fixed_hash(_):
+        return hashed
+
+    monkeypatch.setattr(org_service, "hash_password_async", fixed_hash)
+    service = OrganizationService(db)
+    run(service.create_organization, "acme", "admin@acme.example.com", password)
+    for i in range(100):
+        run(service.create_organization, f"org{i:03d}", f"admin{i:03d}@example.com", password)
+    org_cache.clear()
+    yield service
+    org_cache.clear()
+
+
+def test_create_organization(benchmark, svc, run, names, password):
+    def create():
+        name = names("new")
+        return run(svc.create_organization, name, f"{name}@example.com", password)
+
+    # fixed rounds: every call adds documents, so an open-ended run would drift
+    benchmark.pedantic(create, rounds=200, iterations=1)
+
+
+def test_get_organization_cached(benchmark, svc, run):
+    run(svc.get_organization, "acme")
+    assert benchmark(run, svc.get_organization, "acme")["organization_name"] == "acme"
+
+
+def test_get_organization_uncached(benchmark, svc, run):
+    def get():
+        org_cache.clear()
+        return run(svc.get_organization, "acme")
+
+    assert benchmark(get)["organization_name"] == "acme"
+
+
+def test_list_organizations_page(benchmark, svc, run):
+    page = benchmark(run, svc.list_organizations, "organization_name", None, None, 50)
+    assert len(page["items"]) == 50
+
+
+def test_update_organization_email(benchmark, svc, run, names):
+    def update():
+        return run(svc.update_organization, "acme", None, f"{names('email')}@example.com", None)
+
+    benchmark(update)
@@ -0,0 +1,76 @@
+import os
+import subprocess
+import sys
+import pytest
+import httpx
+import time
+
+from app import main
+from app.utils import breached
+from app.utils.validators import is_breached_password
+
+
+API = os.getenv("API_URL", "http://localhost:8000")
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+# in the filter CI starts the API with (see .github/workflows/ci.yml)
+BREACHED_PASSWORD = "Breached123"
+
+
+def build_filter(path, lines: bytes) -> None:
+    subprocess.run([sys.executable, os.path.join(ROOT, "scripts", "build_breached_bloom.py"),
+                    "--capacity", "100", "--output", str(path)], input=lines, check=True, capture_output=True)
+
+
+@pytest.fixture
+def use_filter(monkeypatch):
+    def configure(path):
+        monkeypatch.setattr(breached, "BREACHED_PASSWORDS_BLOOM", str(path) if path else "")
+        monkeypatch.setattr(main, "BREACHED_PASSWORDS_BLOOM", str(path) if path else "")
+        monkeypatch.setattr(breached, "_filter", None)
+    return configure
+
+
+def test_filter_built_by_script_rejects_listed_passwords(tmp_path, use_filter):
+    path = tmp_path / "breached.bloom"
+    # a non-UTF-8 line must not break the build
+    build_filter(path, b"Breached123\ncaf\xc3\xa9Pass1\nbad\xff\xfe\n")
+    assert not (tmp_path / "breached.bloom.tmp").exists()
+    use_filter(path)
+    assert is_breached_password(BREACHED_PASSWORD)
+    assert is_breached_password("caféPass1")
+    assert not is_breached_password("Unlisted987")
+
+
+def test_unset_filter_disables_the_check(use_filter):
+    use_filter(None)
+    assert breached.get_breached_filter() is None
+    assert not is_breached_password(BREACHED_PASSWORD)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("contents", [None, b"", b"not a filter"])
+async def test_missing_or_invalid_filter_stops_startup(tmp_path, use_filter, contents):
+    path = tmp_path / "breached.bloom"
+    if contents is not None:
+        path.write_bytes(contents)
+    use_filter(path)
+    with pytest.raises(RuntimeError, match="BREACHED_PASSWORDS_BLOOM"):
+        async with main.lifespan(main.app):
+            pass
+
+
+@pytest.mark.asyncio
+async def test_create_rejects_breached_password():
+    if not os.getenv("BREACHED_PASSWORDS_BLOOM"):
+        pytest.skip("the API under test runs without BREACHED_PASSWORDS_BLOOM")
+    async with httpx.AsyncClient(base_url=API, timeout=20) as client:
+        org = f"breached_{int(time.time() * 1000)}"
+        body = {"organization_name": org, "email": f"admin+{org}@example.com", "password": BREACHED_PASSWORD}
+        r = await client.post("/org/create", json=body)
+        assert r.status_code == 400
+        assert "breach" in r.json()["error"]["message"]
+
+        body["password"] = "Unlisted987"
+        r = await client.post("/org/create", json=body)
+        assert r.status_code == 200
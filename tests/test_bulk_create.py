@@ -0,0 +1,40 @@
+import os
+import json
+import pytest
+import httpx
+import time
+
+
+API = os.getenv("API_URL", "http://localhost:8000")
+
+
+@pytest.mark.asyncio
+async def test_bulk_create_reports_per_item_results():
+    async with httpx.AsyncClient(base_url=API, timeout=30) as client:
+        stamp = int(time.time())
+        items = [
+            {"organization_name": f"bulk_{stamp}_{i}", "email": f"admin+bulk_{stamp}_{i}@example.com", "password": "Secret123"}
+            for i in range(3)
+        ]
+        # duplicate name inside the batch and an invalid record
+        items.append({"organization_name": f"bulk_{stamp}_0", "email": f"admin+bulk_{stamp}_dup@example.com", "password": "Secret123"})
+        items.append({"organization_name": f"bulk_{stamp}_bad", "email": "not-an-email", "password": "Secret123"})
+
+        r = await client.post("/org/bulk_create", json=items)
+        assert r.status_code == 200
+        body = r.json()
+        statuses = [res["status"] for res in body["results"]]
+        assert statuses == ["created", "created", "created", "error", "error"]
+        assert body["results"][3]["error"]["code"] == "conflict"
+        assert body["results"][4]["error"]["code"] == "validation_error"
+        assert body["created"] == 3 and body["failed"] == 2
+
+        # NDJSON body, one record per line
+        ndjson = "\n".join(json.dumps({"organization_name": f"bulknd_{stamp}_{i}", "email": f"admin+bulknd_{stamp}_{i}@example.com", "password": "Secret123"}) for i in range(2))
+        r2 = await client.post("/org/bulk_create", content=ndjson, headers={"content-type": "application/x-ndjson"})
+        assert r2.status_code == 200
+        assert r2.json()["created"] == 2
+
+        r3 = await client.get("/org/get", params={"organization_name": f"bulk_{stamp}_1"})
+        assert r3.status_code == 200
+        assert r3.json()["admin_email"] == f"admin+bulk_{stamp}_1@example.com"
@@ -0,0 +1,125 @@
+import pytest
+from mongomock_motor import AsyncMongoMockClient
+
+from app.services.org_service import OrganizationService, org_cache
+from app.utils import cache as cache_module
+from app.utils.cache import TTLCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(cache_module, "time", clock)
+    return clock
+
+
+def test_entries_expire_after_ttl(clock):
+    cache = TTLCache(10, 5)
+    cache.set("a", 1)
+    clock.now += 4.9
+    assert cache.get("a") == 1
+    clock.now += 0.2
+    assert cache.get("a") is None
+    assert cache.stats()["expirations"] == 1
+
+
+def test_per_entry_ttl_only_shortens(clock):
+    cache = TTLCache(10, 5)
+    cache.set("short", 1, ttl=1)
+    cache.set("long", 2, ttl=60)
+    cache.set("expired", 3, ttl=0)
+    clock.now += 2
+    assert cache.get("short") is None
+    assert cache.get("long") == 2
+    assert cache.get("expired") is None
+    clock.now += 4
+    assert cache.get("long") is None
+
+
+def test_least_recently_used_entry_is_evicted(clock):
+    cache = TTLCache(2, 60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+    cache.set("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert cache.stats()["evictions"] == 1
+
+
+def test_tag_invalidation_drops_every_tagged_key(clock):
+    cache = TTLCache(10, 60)
+    cache.set("by-name", 1, tags=("org-1", "admin-1"))
+    cache.set("other", 2, tags=("org-2",))
+    cache.invalidate_tag("admin-1")
+    assert cache.get("by-name") is None
+    assert cache.get("other") == 2
+    # the removed key no longer holds its other tags
+    cache.invalidate_tag("org-1")
+    assert cache.stats()["invalidations"] == 1
+
+
+def test_stale_generation_is_not_stored(clock):
+    cache = TTLCache(10, 60)
+    seen = cache.generation
+    cache.invalidate("a")  # a write lands while the loader's read is in flight
+    cache.set("a", "stale", generation=seen)
+    assert cache.get("a") is None
+    cache.set("a", "fresh", generation=cache.generation)
+    assert cache.get("a") == "fresh"
+
+
+def test_disabled_cache_stores_nothing(clock):
+    for cache in (TTLCache(0, 60), TTLCache(10, 0)):
+        cache.set("a", 1)
+        assert cache.get("a") is None
+        assert len(cache) == 0
+
+
+@pytest.fixture
+def svc():
+    org_cache.clear()
+    yield OrganizationService(AsyncMongoMockClient()["cache_test"])
+    org_cache.clear()
+
+
+@pytest.mark.asyncio
+async def test_rename_invalidates_old_and_new_names(svc):
+    await svc.create_organization("before", "admin+before@example.com", "Secret123")
+    # cache a hit for the old name and a miss for the new one
+    assert (await svc.get_organization("before"))["organization_name"] == "before"
+    assert await svc.get_organization("after") is None
+    assert org_cache.get("before") is not None
+
+    await svc.update_organization("before", "after")
+    assert await svc.get_organization("before") is None
+    assert (await svc.get_organization("after"))["collection_name"] == "org_after"
+
+
+@pytest.mark.asyncio
+async def test_background_rename_invalidates_old_and_new_names(svc):
+    await svc.create_organization("jobbefore", "admin+jobbefore@example.com", "Secret123")
+    assert await svc.get_organization("jobbefore") is not None
+
+    await svc.rename_organization("jobbefore", "jobafter")
+    assert await svc.get_organization("jobbefore") is None
+    assert (await svc.get_organization("jobafter"))["organization_name"] == "jobafter"
+
+
+@pytest.mark.asyncio
+async def test_delete_invalidates_the_name(svc):
+    await svc.create_organization("gone", "admin+gone@example.com", "Secret123")
+    assert await svc.get_organization("gone") is not None
+
+    await svc.delete_organization("gone")
+    assert org_cache.get("gone") is None
+    assert await svc.get_organization("gone") is None
@@ -0,0 +1,134 @@
+import asyncio
+import pytest
+from mongomock_motor import AsyncMongoMockClient
+from pymongo.errors import AutoReconnect, OperationFailure
+
+from app.services import cache_sync
+from app.services.cache_sync import CacheInvalidationWatcher
+from app.utils.cache import TTLCache
+
+
+class FakeStream:
+    """Change stream that replays `events` ((change, resume_token) pairs), then raises
+    `error` or stays open."""
+
+    def __init__(self, events, error=None):
+        self.events = list(events)
+        self.error = error
+        self.alive = True
+        self.resume_token = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def try_next(self):
+        if self.events:
+            change, self.resume_token = self.events.pop(0)
+            return change
+        if self.error is not None:
+            raise self.error
+        await asyncio.sleep(0.01)
+        return None
+
+
+class FakeDB:
+    """Just enough of a Motor database for the watcher: a real (in-memory) state
+    collection and scripted watch() sessions."""
+
+    def __init__(self, *sessions):
+        self.cache_sync_state = AsyncMongoMockClient()["sync_test"].cache_sync_state
+        self.sessions = list(sessions)
+        self.resumed_from = []
+
+    def watch(self, pipeline, resume_after=None, **kwargs):
+        self.resumed_from.append(resume_after)
+        session = self.sessions.pop(0) if self.sessions else FakeStream([])
+        if isinstance(session, Exception):
+            raise session
+        return session
+
+
+def change(op, doc_id=None):
+    event = {"operationType": op}
+    if doc_id is not None:
+        event["documentKey"] = {"_id": doc_id}
+    return event
+
+
+async def run_until(watcher, done, timeout=5.0):
+    watcher.start()
+    try:
+        deadline = asyncio.get_running_loop().time() + timeout
+        while not done():
+            assert asyncio.get_running_loop().time() < deadline, "watcher did not get there in time"
+            await asyncio.sleep(0.01)
+    finally:
+        await watcher.stop()
+
+
+@pytest.fixture(autouse=True)
+def persist_every_token(monkeypatch):
+    monkeypatch.setattr(cache_sync, "RESUME_TOKEN_PERSIST_INTERVAL", 0)
+
+
+@pytest.fixture
+def cache():
+    cache = TTLCache(100, 60)
+    cache.set("org-a", "a", tags=("id-a",))
+    cache.set("org-b", "b", tags=("id-b",))
+    cache.set("org-c", "c", tags=("id-c",))
+    return cache
+
+
+@pytest.mark.asyncio
+async def test_change_events_invalidate_tagged_entries(cache):
+    db = FakeDB(FakeStream([(change("update", "id-a"), "t1"), (change("delete", "id-b"), "t2"),
+                            (change("insert", "id-c"), "t3")]))
+    watcher = CacheInvalidationWatcher(db, cache, replica_id="r1")
+    await run_until(watcher, lambda: watcher.events == 3)
+    assert cache.get("org-a") is None
+    assert cache.get("org-b") is None
+    # inserts can't make a cached entry stale
+    assert cache.get("org-c") == "c"
+
+
+@pytest.mark.asyncio
+async def test_collection_drop_clears_the_cache(cache):
+    watcher = CacheInvalidationWatcher(FakeDB(FakeStream([(change("drop"), "t1")])), cache, replica_id="r1")
+    await run_until(watcher, lambda: watcher.events == 1)
+    assert len(cache) == 0
+
+
+@pytest.mark.asyncio
+async def test_reconnect_resumes_after_last_persisted_token(cache):
+    db = FakeDB(FakeStream([(change("update", "id-a"), "t1")], error=AutoReconnect("primary stepped down")),
+                FakeStream([(change("update", "id-b"), "t2")]))
+    watcher = CacheInvalidationWatcher(db, cache, replica_id="r1")
+    await run_until(watcher, lambda: watcher.events == 2)
+    assert db.resumed_from == [None, "t1"]
+    # resuming means nothing was missed, so unrelated entries survive the reconnect
+    assert cache.get("org-c") == "c"
+    state = await db.cache_sync_state.find_one({"_id": "org_cache:r1"})
+    assert state["resume_token"] == "t2"
+
+
+@pytest.mark.asyncio
+async def test_rejected_resume_token_clears_cache_and_starts_over(cache):
+    db = FakeDB(OperationFailure("resume point lost", code=286), FakeStream([]))
+    await db.cache_sync_state.insert_one({"_id": "org_cache:r1", "resume_token": "gone"})
+    watcher = CacheInvalidationWatcher(db, cache, replica_id="r1")
+    await run_until(watcher, lambda: len(db.resumed_from) == 2)
+    assert db.resumed_from == ["gone", None]
+    assert len(cache) == 0
+
+
+@pytest.mark.asyncio
+async def test_standalone_server_falls_back_to_short_ttl(cache):
+    db = FakeDB(OperationFailure("not a replica set", code=40573))
+    watcher = CacheInvalidationWatcher(db, cache, replica_id="r1", fallback_ttl=5)
+    await run_until(watcher, lambda: watcher.mode == "ttl_fallback")
+    assert cache.ttl == 5
+    assert len(cache) == 0
@@ -0,0 +1,57 @@
+import asyncio
+import threading
+import pytest
+
+from app.errors import ServiceUnavailable
+from app.utils.hashing import HashingExecutor
+
+
+@pytest.mark.asyncio
+async def test_cancelled_caller_keeps_its_slot_until_the_work_finishes():
+    executor = HashingExecutor("thread", max_workers=1, max_queue=1)
+    started, release = threading.Event(), threading.Event()
+
+    def slow_hash():
+        started.set()
+        release.wait(5)
+        return "hash"
+
+    try:
+        caller = asyncio.create_task(executor.run(slow_hash))
+        await asyncio.to_thread(started.wait, 5)
+        caller.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await caller
+
+        # the hash is still running on the pool, so the queue is still full
+        assert executor.stats()["pending"] == 1
+        with pytest.raises(ServiceUnavailable):
+            await executor.run(slow_hash)
+
+        release.set()
+        for _ in range(100):
+            if executor.stats()["pending"] == 0:
+                break
+            await asyncio.sleep(0.01)
+        assert executor.stats()["pending"] == 0
+        assert executor.stats()["calls"] == 1
+        assert await executor.run(lambda: "next") == "next"
+    finally:
+        release.set()
+        executor.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_errors_reach_the_caller_and_free_the_slot():
+    executor = HashingExecutor("thread", max_workers=1, max_queue=1)
+
+    def broken():
+        raise ValueError("bad salt")
+
+    try:
+        with pytest.raises(ValueError):
+            await executor.run(broken)
+        await asyncio.sleep(0)
+        assert executor.stats()["pending"] == 0
+    finally:
+        executor.shutdown()
@@ -0,0 +1,63 @@
+import os
+import asyncio
+import pytest
+import httpx
+import time
+
+
+API = os.getenv("API_URL", "http://localhost:8000")
+
+
+async def wait_for_job(client, status_url, headers, timeout=20):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        r = await client.get(status_url, headers=headers)
+        assert r.status_code == 200
+        job = r.json()
+        if job["status"] in ("succeeded", "failed"):
+            return job
+        await asyncio.sleep(0.5)
+    pytest.fail(f"job did not finish within {timeout}s")
+
+
+@pytest.mark.asyncio
+async def test_async_rename_and_delete_jobs():
+    async with httpx.AsyncClient(base_url=API, timeout=20) as client:
+        org = f"joborg_{int(time.time())}"
+        email = f"admin+{org}@example.com"
+        r = await client.post("/org/create", json={"organization_name": org, "email": email, "password": "Secret123"})
+        assert r.status_code == 200
+
+        r = await client.post("/admin/login", json={"email": email, "password": "Secret123"})
+        assert r.status_code == 200
+        headers = {"Authorization": f"Bearer {r.json()['access_token']}", "Prefer": "respond-async"}
+
+        renamed = f"{org}_renamed"
+        r = await client.put("/org/update", json={"organization_name": org, "new_organization_name": renamed}, headers=headers)
+        assert r.status_code == 202
+        status_url = r.json()["status_url"]
+        job = await wait_for_job(client, status_url, headers)
+        assert job["status"] == "succeeded"
+        assert job["result"]["organization_name"] == renamed
+
+        # jobs are private to the organization's admins
+        assert (await client.get(status_url)).status_code == 401
+        other = f"{org}_other"
+        other_email = f"admin+{other}@example.com"
+        r = await client.post("/org/create", json={"organization_name": other, "email": other_email, "password": "Secret123"})
+        assert r.status_code == 200
+        r = await client.post("/admin/login", json={"email": other_email, "password": "Secret123"})
+        assert r.status_code == 200
+        other_headers = {"Authorization": f"Bearer {r.json()['access_token']}"}
+        assert (await client.get(status_url, headers=other_headers)).status_code == 404
+
+        r = await client.get("/org/get", params={"organization_name": renamed})
+        assert r.status_code == 200
+
+        r = await client.delete(f"/org/delete?organization_name={renamed}", headers=headers)
+        assert r.status_code == 202
+        job = await wait_for_job(client, r.json()["status_url"], headers)
+        assert job["status"] == "succeeded"
+
+        r = await client.get("/jobs/000000000000000000000000", headers=headers)
+        assert r.status_code == 404
@@ -0,0 +1,84 @@
+import os
+import json
+import pytest
+import httpx
+import time
+
+
+API = os.getenv("API_URL", "http://localhost:8000")
+
+
+@pytest.mark.asyncio
+async def test_list_keyset_pagination_and_stream():
+    async with httpx.AsyncClient(base_url=API, timeout=30) as client:
+        stamp = int(time.time())
+        names = [f"list_{stamp}_{i}" for i in range(5)]
+        items = [{"organization_name": n, "email": f"admin+{n}@example.com", "password": "Secret123"} for n in names]
+        r = await client.post("/org/bulk_create", json=items)
+        assert r.status_code == 200
+
+        # walk pages of 2 from just before our prefix until past it
+        seen = []
+        after = None
+        while True:
+            params = {"limit": 2, "fields": "organization_name"}
+            if after:
+                params["after"] = after
+            page = await client.get("/org/list", params=params)
+            assert page.status_code == 200
+            body = page.json()
+            assert len(body["items"]) <= 2
+            seen.extend(item["organization_name"] for item in body["items"])
+            after = body["next_cursor"]
+            if not after:
+                break
+        ours = [n for n in seen if n.startswith(f"list_{stamp}_")]
+        assert ours == sorted(names)
+        assert len(seen) == len(set(seen))
+
+        streamed = await client.get("/org/list", params={"stream": "true", "fields": "organization_name"})
+        assert streamed.status_code == 200
+        assert streamed.headers["content-type"].startswith("application/x-ndjson")
+        rows = [json.loads(line) for line in streamed.text.splitlines() if line]
+        assert set(names) <= {row["organization_name"] for row in rows}
+
+        bad = await client.get("/org/list", params={"after": "not-a-cursor"})
+        assert bad.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_list_admin_email_only_for_own_org():
+    async with httpx.AsyncClient(base_url=API, timeout=30) as client:
+        stamp = int(time.time())
+        names = [f"listmail_{stamp}_{i}" for i in range(2)]
+        items = [{"organization_name": n, "email": f"admin+{n}@example.com", "password": "Secret123"} for n in names]
+        r = await client.post("/org/bulk_create", json=items)
+        assert r.status_code == 200
+
+        r = await client.post("/admin/login", json={"email": f"admin+{names[0]}@example.com", "password": "Secret123"})
+        assert r.status_code == 200
+        headers = {"Authorization": f"Bearer {r.json()['access_token']}"}
+
+        rows = {}
+        after = None
+        while True:
+            params = {"limit": 1000, "fields": "organization_name,admin_email"}
+            if after:
+                params["after"] = after
+            page = await client.get("/org/list", params=params, headers=headers)
+            assert page.status_code == 200
+            rows.update({item["organization_name"]: item for item in page.json()["items"]})
+            after = page.json()["next_cursor"]
+            if not after:
+                break
+        assert rows[names[0]]["admin_email"] == f"admin+{names[0]}@example.com"
+        assert "admin_email" not in rows[names[1]]
+        assert all("admin_email" not in row for name, row in rows.items() if name != names[0])
+
+        streamed = await client.get("/org/list", params={"stream": "true", "fields": "organization_name,admin_email"},
+                                    headers=headers)
+        emails = [json.loads(line).get("admin_email") for line in streamed.text.splitlines() if line]
+        assert [e for e in emails if e] == [f"admin+{names[0]}@example.com"]
+
+        anonymous = await client.get("/org/list", params={"fields": "organization_name,admin_email"})
+        assert anonymous.status_code == 401
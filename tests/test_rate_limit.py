@@ -0,0 +1,24 @@
+import os
+import pytest
+import httpx
+import time
+
+
+API = os.getenv("API_URL", "http://localhost:8000")
+
+
+@pytest.mark.asyncio
+async def test_login_rate_limit_returns_429_with_retry_after():
+    async with httpx.AsyncClient(base_url=API, timeout=20) as client:
+        # the per-email bucket (HASH_EMAIL_BURST, default 5) runs out well within 20 attempts
+        email = f"admin+ratelimit_{int(time.time() * 1000)}@example.com"
+        limited = None
+        for _ in range(20):
+            r = await client.post("/admin/login", json={"email": email, "password": "Wrong1234"})
+            if r.status_code == 429:
+                limited = r
+                break
+            assert r.status_code == 401
+        assert limited is not None, "login was never rate limited"
+        assert int(limited.headers["Retry-After"]) >= 1
+        assert limited.json()["error"]["code"] == "too_many_requests"
@@ -0,0 +1,195 @@
+import asyncio
+import pytest
+from pymongo.errors import AutoReconnect, DuplicateKeyError, NetworkTimeout, ServerSelectionTimeoutError
+
+from app.errors import DeadlineExceeded, ServiceUnavailable
+from app.utils import resilience
+from app.utils.resilience import CircuitBreaker, guarded_call, reset_deadline, set_deadline
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self):
+        return self.now
+
+    def time(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(resilience, "time", clock)
+    return clock
+
+
+def raising(exc):
+    async def fn():
+        raise exc
+    return fn
+
+
+async def ok():
+    return "ok"
+
+
+async def fail(breaker, exc=None, expected=ServiceUnavailable):
+    with pytest.raises(expected):
+        await guarded_call(raising(exc or AutoReconnect("down")), breaker=breaker)
+
+
+def states(breaker):
+    return [(t["from"], t["to"]) for t in breaker.transitions]
+
+
+@pytest.mark.asyncio
+async def test_breaker_opens_then_probes_then_closes(clock):
+    breaker = CircuitBreaker("test", 3, 10)
+    for _ in range(3):
+        await fail(breaker)
+    assert breaker.state == breaker.OPEN
+
+    # open: fail fast without calling the database
+    called = False
+
+    async def tracked():
+        nonlocal called
+        called = True
+
+    with pytest.raises(ServiceUnavailable) as exc:
+        await guarded_call(tracked, breaker=breaker)
+    assert not called
+    assert exc.value.retry_after == 10
+    assert breaker.rejected == 1
+
+    clock.now += 10
+    assert await guarded_call(ok, breaker=breaker) == "ok"
+    assert breaker.state == breaker.CLOSED
+    assert states(breaker) == [("closed", "open"), ("open", "half_open"), ("half_open", "closed")]
+
+
+@pytest.mark.asyncio
+async def test_failed_probe_reopens(clock):
+    breaker = CircuitBreaker("test", 1, 10)
+    await fail(breaker)
+    clock.now += 10
+    await fail(breaker)
+    assert breaker.state == breaker.OPEN
+    assert breaker.retry_after() == 10
+
+
+@pytest.mark.asyncio
+async def test_half_open_admits_a_single_probe(clock):
+    breaker = CircuitBreaker("test", 1, 10)
+    await fail(breaker)
+    clock.now += 10
+    release = asyncio.Event()
+
+    async def slow():
+        await release.wait()
+        return "probe"
+
+    probe = asyncio.create_task(guarded_call(slow, breaker=breaker))
+    await asyncio.sleep(0)
+    assert breaker.state == breaker.HALF_OPEN
+    with pytest.raises(ServiceUnavailable):
+        await guarded_call(ok, breaker=breaker)
+    release.set()
+    assert await probe == "probe"
+    assert breaker.state == breaker.CLOSED
+
+
+@pytest.mark.asyncio
+async def test_cancelled_probe_lets_the_next_one_through(clock):
+    breaker = CircuitBreaker("test", 1, 10)
+    await fail(breaker)
+    clock.now += 10
+    probe = asyncio.create_task(guarded_call(asyncio.Event().wait, breaker=breaker))
+    await asyncio.sleep(0)
+    probe.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await probe
+    assert await guarded_call(ok, breaker=breaker) == "ok"
+    assert breaker.state == breaker.CLOSED
+
+
+@pytest.mark.asyncio
+async def test_server_rejections_do_not_count(clock):
+    breaker = CircuitBreaker("test", 1, 10)
+    await fail(breaker, DuplicateKeyError("dup", 11000), DuplicateKeyError)
+    assert breaker.state == breaker.CLOSED
+    assert breaker.failures == 0
+
+
+@pytest.mark.asyncio
+async def test_timeout_with_spent_budget_does_not_count(clock):
+    breaker = CircuitBreaker("test", 1, 10)
+    token = set_deadline(1.0)
+    try:
+        clock.now += 0.9  # e.g. the request queued behind a burst before reaching the database
+        await fail(breaker, NetworkTimeout("timed out"), DeadlineExceeded)
+        assert breaker.failures == 0
+        assert breaker.state == breaker.CLOSED
+    finally:
+        reset_deadline(token)
+
+
+@pytest.mark.asyncio
+async def test_timeout_with_most_of_the_budget_counts(clock):
+    breaker = CircuitBreaker("test", 1, 10)
+    token = set_deadline(1.0)
+    try:
+        await fail(breaker, NetworkTimeout("timed out"), DeadlineExceeded)
+        assert breaker.state == breaker.OPEN
+    finally:
+        reset_deadline(token)
+
+
+@pytest.mark.asyncio
+async def test_server_selection_timeout_always_counts(clock):
+    breaker = CircuitBreaker("test", 1, 10)
+    token = set_deadline(1.0)
+    try:
+        clock.now += 0.9
+        await fail(breaker, ServerSelectionTimeoutError("no primary"), DeadlineExceeded)
+        assert breaker.state == breaker.OPEN
+    finally:
+        reset_deadline(token)
+
+
+@pytest.mark.asyncio
+async def test_spent_budget_fails_before_calling(clock):
+    breaker = CircuitBreaker("test", 1, 10)
+    token = set_deadline(1.0)
+    try:
+        clock.now += 1.0
+        with pytest.raises(DeadlineExceeded):
+            await guarded_call(ok, breaker=breaker)
+        assert breaker.failures == 0
+    finally:
+        reset_deadline(token)
+
+
+@pytest.mark.asyncio
+async def test_reads_are_retried_writes_are_not(clock, monkeypatch):
+    monkeypatch.setattr(resilience, "MONGO_RETRY_BACKOFF_MS", 0)
+    breaker = CircuitBreaker("test", 5, 10)
+    calls = 0
+
+    async def flaky():
+        nonlocal calls
+        calls += 1
+        if calls < 3:
+            raise AutoReconnect("step-down")
+        return "ok"
+
+    assert await guarded_call(flaky, retry=True, breaker=breaker) == "ok"
+    assert calls == 3
+    assert breaker.failures == 0
+
+    calls = 0
+    with pytest.raises(ServiceUnavailable):
+        await guarded_call(flaky, breaker=breaker)
+    assert calls == 1
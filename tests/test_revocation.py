@@ -0,0 +1,106 @@
+import os
+import pytest
+import httpx
+import time
+
+from app.services.revocation import RevocationList
+from app.utils.security import TokenClaims
+
+
+API = os.getenv("API_URL", "http://localhost:8000")
+
+# any authenticated route will do: an unknown job is 404 for a valid token, 401 for a revoked one
+PROBE = "/jobs/000000000000000000000000"
+
+
+async def create_and_login(client, prefix):
+    org = f"{prefix}_{int(time.time() * 1000)}"
+    email = f"admin+{org}@example.com"
+    r = await client.post("/org/create", json={"organization_name": org, "email": email, "password": "Secret123"})
+    assert r.status_code == 200, r.text
+    return org, email, await login(client, email, "Secret123")
+
+
+async def login(client, email, password):
+    r = await client.post("/admin/login", json={"email": email, "password": password})
+    assert r.status_code == 200, r.text
+    return {"Authorization": f"Bearer {r.json()['access_token']}"}
+
+
+@pytest.mark.asyncio
+async def test_logout_revokes_only_that_token():
+    async with httpx.AsyncClient(base_url=API, timeout=20) as client:
+        _, email, old = await create_and_login(client, "logout")
+        other = await login(client, email, "Secret123")
+        assert (await client.get(PROBE, headers=old)).status_code == 404
+
+        r = await client.post("/admin/logout", headers=old)
+        assert r.status_code == 200
+        assert (await client.get(PROBE, headers=old)).status_code == 401
+        # the admin's other sessions and later logins are unaffected
+        assert (await client.get(PROBE, headers=other)).status_code == 404
+        new = await login(client, email, "Secret123")
+        assert (await client.get(PROBE, headers=new)).status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_revoke_all_rejects_earlier_tokens():
+    async with httpx.AsyncClient(base_url=API, timeout=20) as client:
+        _, email, first = await create_and_login(client, "revokeall")
+        second = await login(client, email, "Secret123")
+
+        r = await client.post("/admin/revoke_all", headers=first)
+        assert r.status_code == 200
+        for headers in (first, second):
+            assert (await client.get(PROBE, headers=headers)).status_code == 401
+        new = await login(client, email, "Secret123")
+        assert (await client.get(PROBE, headers=new)).status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_password_change_revokes_existing_tokens():
+    async with httpx.AsyncClient(base_url=API, timeout=20) as client:
+        org, email, old = await create_and_login(client, "pwchange")
+
+        r = await client.put("/org/update", json={"organization_name": org, "password": "Changed456"}, headers=old)
+        assert r.status_code == 200, r.text
+        assert (await client.get(PROBE, headers=old)).status_code == 401
+        r = await client.post("/admin/login", json={"email": email, "password": "Secret123"})
+        assert r.status_code == 401
+        new = await login(client, email, "Changed456")
+        assert (await client.get(PROBE, headers=new)).status_code == 404
+
+
+def claims(admin_id="a1", jti=None, iat=None):
+    return TokenClaims(admin_id, "a@example.com", "org", "org-id", int(time.time()) + 60, jti, iat)
+
+
+def test_admin_cutoff_compares_fractional_iat():
+    revocations = RevocationList()
+    revocations.add_admin("a1", 1000.5, time.time() + 60)
+    assert revocations.is_revoked(claims(iat=1000.4))
+    assert not revocations.is_revoked(claims(iat=1000.6))
+    # tokens from before iat existed are covered by any cutoff
+    assert revocations.is_revoked(claims(iat=None))
+    assert not revocations.is_revoked(claims(admin_id="a2", iat=1000.4))
+
+
+def test_bloom_false_positive_falls_back_to_exact_set():
+    revocations = RevocationList(capacity=1, fp_rate=0.5)
+    revocations.add_token("revoked", time.time() + 60)
+    assert revocations.is_revoked(claims(jti="revoked"))
+
+    # with a tiny, loose filter some unrevoked ids hit it; the exact set must let them through
+    candidates = [f"jti-{i}" for i in range(200)]
+    assert not any(revocations.is_revoked(claims(jti=jti)) for jti in candidates)
+    assert revocations.false_positives > 0
+
+
+def test_prune_forgets_expired_revocations():
+    revocations = RevocationList()
+    now = time.time()
+    revocations.add_token("old", now - 1)
+    revocations.add_token("live", now + 60)
+    revocations.prune(now + 3600)
+    assert not revocations.is_revoked(claims(jti="old"))
+    assert revocations.stats()["tokens"] == 0
@@ -0,0 +1,85 @@
+import asyncio
+import pytest
+
+from app.utils.singleflight import SingleFlight
+
+
+@pytest.mark.asyncio
+async def test_concurrent_calls_share_one_execution():
+    flight = SingleFlight()
+    calls = 0
+    release = asyncio.Event()
+
+    async def load():
+        nonlocal calls
+        calls += 1
+        await release.wait()
+        return "value"
+
+    waiters = [asyncio.create_task(flight.do("k", load)) for _ in range(5)]
+    await asyncio.sleep(0)
+    release.set()
+    assert await asyncio.gather(*waiters) == ["value"] * 5
+    assert calls == 1
+    assert flight.stats() == {"in_flight": 0, "executed": 1, "coalesced": 4}
+
+
+@pytest.mark.asyncio
+async def test_error_reaches_every_waiter_and_is_not_cached():
+    flight = SingleFlight()
+    release = asyncio.Event()
+
+    async def fail():
+        await release.wait()
+        raise ValueError("boom")
+
+    waiters = [asyncio.create_task(flight.do("k", fail)) for _ in range(3)]
+    await asyncio.sleep(0)
+    release.set()
+    results = await asyncio.gather(*waiters, return_exceptions=True)
+    assert all(isinstance(r, ValueError) for r in results)
+
+    async def ok():
+        return "recovered"
+
+    assert await flight.do("k", ok) == "recovered"
+
+
+@pytest.mark.asyncio
+async def test_cancelled_waiter_does_not_cancel_the_others():
+    flight = SingleFlight()
+    release = asyncio.Event()
+
+    async def load():
+        await release.wait()
+        return "value"
+
+    first = asyncio.create_task(flight.do("k", load))
+    second = asyncio.create_task(flight.do("k", load))
+    await asyncio.sleep(0)
+    first.cancel()
+    release.set()
+    assert await second == "value"
+    with pytest.raises(asyncio.CancelledError):
+        await first
+
+
+@pytest.mark.asyncio
+async def test_forget_starts_a_fresh_call():
+    flight = SingleFlight()
+    release = asyncio.Event()
+    results = iter(["stale", "fresh"])
+
+    async def load():
+        value = next(results)
+        if value == "stale":
+            await release.wait()
+        return value
+
+    pending = asyncio.create_task(flight.do("k", load))
+    await asyncio.sleep(0)
+    flight.forget("k")  # e.g. a write invalidated the key while the read was in flight
+    assert await flight.do("k", load) == "fresh"
+    release.set()
+    assert await pending == "stale"
+    assert flight.stats()["in_flight"] == 0
@@ -0,0 +1,74 @@
+import os
+import pytest
+import httpx
+import time
+from datetime import timedelta
+
+from fastapi import HTTPException
+from jose import ExpiredSignatureError
+
+from app.dependencies import get_current_admin
+from app.services.revocation import revocation_list
+from app.utils import security
+from app.utils.security import create_access_token, decode_token_cached, token_cache
+
+
+API = os.getenv("API_URL", "http://localhost:8000")
+
+
+def make_token(expires_in: timedelta = timedelta(minutes=5)) -> str:
+    return create_access_token({"sub": "cache-test", "email": "a@example.com", "organization_name": "org",
+                                "org_id": "org-id"}, expires_in)
+
+
+def test_expired_token_is_not_served_from_cache():
+    token = make_token(timedelta(seconds=1))
+    claims = decode_token_cached(token)
+    assert token_cache.get(token) == claims
+    time.sleep(2.1)
+    with pytest.raises(ExpiredSignatureError):
+        decode_token_cached(token)
+
+
+@pytest.mark.asyncio
+async def test_revoked_token_is_rejected_while_cached():
+    token = make_token()
+    claims = await get_current_admin(f"Bearer {token}")
+    assert token_cache.get(token) == claims
+
+    revocation_list.add_token(claims.jti, float(claims.exp))
+    with pytest.raises(HTTPException) as e:
+        await get_current_admin(f"Bearer {token}")
+    assert e.value.status_code == 401
+
+
+def test_pwd_context_is_still_exported():
+    # built lazily, but the same object on every access
+    assert security.pwd_context is security.pwd_context
+    assert "bcrypt" in security.pwd_context.schemes()
+
+
+@pytest.mark.asyncio
+async def test_cross_org_token_is_forbidden():
+    async with httpx.AsyncClient(base_url=API, timeout=20) as client:
+        stamp = int(time.time() * 1000)
+        tokens = {}
+        for name in (f"cacheorg_a_{stamp}", f"cacheorg_b_{stamp}"):
+            email = f"admin+{name}@example.com"
+            r = await client.post("/org/create", json={"organization_name": name, "email": email, "password": "Secret123"})
+            assert r.status_code == 200, r.text
+            r = await client.post("/admin/login", json={"email": email, "password": "Secret123"})
+            assert r.status_code == 200, r.text
+            tokens[name] = {"Authorization": f"Bearer {r.json()['access_token']}"}
+        org_a, org_b = tokens
+
+        # twice each, so the second request is served from the token cache
+        for _ in range(2):
+            r = await client.put("/org/update", json={"organization_name": org_b, "email": f"x+{org_b}@example.com"},
+                                 headers=tokens[org_a])
+            assert r.status_code == 403
+            r = await client.delete("/org/delete", params={"organization_name": org_b}, headers=tokens[org_a])
+            assert r.status_code == 403
+        r = await client.get("/org/get", params={"organization_name": org_b})
+        assert r.status_code == 200
+        assert r.json()["admin_email"] == f"admin+{org_b}@example.com"